@@ -1,8 +1,18 @@
 from bgameb.items import Dice, Card, Step
-from bgameb.tools import Shaker, Deck, Steps
+from bgameb.tools import (
+    Shaker,
+    Deck,
+    CompactDeck,
+    Bag,
+    Steps,
+    Board,
+    Map,
+    Resources,
+        )
 from bgameb.players import Player
 from bgameb.game import Game
 from bgameb.base import log_enable, Components
+from bgameb.stores import MemmapCardCodes
 from bgameb._version import __version__
 
 
@@ -3,6 +3,8 @@
 import re
 import string
 import json
+import random
+import numpy as np
 from typing import (
     Optional,
     TypeVar,
@@ -11,14 +13,21 @@ from typing import (
     Union,
     AbstractSet,
     Iterable,
+    Literal,
+    Callable,
+    TYPE_CHECKING,
+    cast,
         )
 from collections.abc import Mapping, KeysView, ValuesView, ItemsView
-from collections import Counter
+from collections import Counter, deque
 from pydantic import BaseModel, Field
 from pydantic.generics import GenericModel
 from bgameb.errors import ComponentNameError, ComponentClassError
+from bgameb.tape import Tape
 from loguru._logger import Logger
 from loguru import logger
+if TYPE_CHECKING:
+    from bgameb.snapshot import Frame
 
 
 logger.disable('bgameb')
@@ -46,9 +55,14 @@ def log_enable(
 
 
 IntStr = Union[int, str]
+Visibility = Literal['public', 'owner', 'revealed', 'hidden']
 AbstractSetIntStr = AbstractSet[IntStr]
 MappingIntStrAny = Mapping[IntStr, Any]
 
+# Generator of stuff out of game. Functions of random module
+# use its global generator, so random.seed() affects such stuff
+_GLOBAL_RANDOM = cast(random.Random, random)
+
 
 # TODO: test me
 class PropertyBaseModel(BaseModel):
@@ -116,12 +130,28 @@ class Base(PropertyBaseModel):
 
             _logger (Logger): loguru logger
 
+            _random (random.Random, optional): random generator of game,
+                                               stuff is bound to. Stuff
+                                               out of game uses global
+                                               random state.
+
+            _np_random (np.random.Generator, optional): numpy generator
+                of game, seeded with random generator of game. Numpy
+                backed generator of game is used directly, so this
+                is None for it.
+
+            _tape (Tape, optional): tape of game, random outcomes are
+                                    recorded to or replayed from.
+
         Counter is a `collection.Counter
         <https://docs.python.org/3/library/collections.html#collections.Counter>`_
     """
     id: str
     _counter: Counter[Any] = Field(default_factory=Counter)
     _logger: Logger = Field(...)
+    _random: Optional[random.Random] = None
+    _np_random: Optional[np.random.Generator] = None
+    _tape: Optional[Tape] = None
 
     def __init__(self, **data):
         super().__init__(**data)
@@ -132,26 +162,326 @@ class Base(PropertyBaseModel):
     class Config:
         underscore_attrs_are_private = True
 
+    def _rng(self) -> random.Random:
+        """Get random generator of stuff
+
+        Returns:
+            random.Random: generator of game or global generator
+        """
+        return self._random or _GLOBAL_RANDOM
+
+    def _np_rng(self) -> np.random.Generator:
+        """Get numpy generator of game. Generator of numpy backed
+        random generator is used directly. Stuff out of game gets
+        new generator, seeded from global random state.
+
+        Returns:
+            np.random.Generator
+        """
+        if self._np_random is not None:
+            return self._np_random
+        rng = self._rng()
+        generator = getattr(rng, 'generator', None)
+        if isinstance(generator, np.random.Generator):
+            return generator
+        return np.random.default_rng(rng.getrandbits(64))
+
+    def _np_outcome(
+        self,
+        draw: Callable[[np.random.Generator], np.ndarray]
+            ) -> np.ndarray:
+        """Get vectorized random outcome. Outcome is recorded
+        to tape or replayed from it.
+
+        Args:
+            draw (Callable[[np.random.Generator], np.ndarray]):
+                function, that draws outcome by numpy generator
+
+        Returns:
+            np.ndarray: array of non-negative integers
+        """
+        tape = self._tape
+        if tape is not None and tape.replaying:
+            return tape.take_array()
+        result = draw(self._np_rng())
+        if tape is not None:
+            tape.put_array(result)
+        return result
+
+    def _bind(self, **attrs: Any) -> None:
+        """Bind private attributes of game, like random generator
+        and tape, to stuff and all nested stuff
+
+        Args:
+            attrs (Any): values of private attributes by names
+        """
+        for name, value in attrs.items():
+            setattr(self, name, value)
+        for value in self.__dict__.values():
+            _bind(value, attrs)
+
+    def _bind_from(self, value: Any) -> None:
+        """Bind random generators and tape of stuff to value,
+        if stuff is bound to game
+
+        Args:
+            value (Any): attribute value
+        """
+        if isinstance(value, Base) and (
+            self._random is not None or self._tape is not None
+                ):
+            value._bind(
+                _random=self._random,
+                _np_random=self._np_random,
+                _tape=self._tape
+                    )
+
+    def _save_state(self) -> Any:
+        """Get private state of stuff, that isn't restored from
+        fields, for snapshot of game. State must be comparable
+        by equality.
+
+        Returns:
+            Any: state or None, if stuff hasn't such state
+        """
+        return None
+
+    def _load_state(self, state: Any) -> None:
+        """Restore private state of stuff from snapshot of game.
+        Is called after fields of stuff are restored, so state,
+        derived from fields, is rebuilt here.
+
+        Args:
+            state (Any): state, got by _save_state
+        """
+
+
+def _numpy(
+    rng: random.Random,
+    seed: Optional[int] = None
+        ) -> Optional[np.random.Generator]:
+    """Get numpy generator for random generator of game
+
+    Args:
+        rng (random.Random): random generator of game
+        seed (int, optional): seed of generator. Default to None -
+                              seed is taken from random generator.
+
+    Returns:
+        np.random.Generator, optional: generator or None, if random
+                                       generator is numpy backed
+    """
+    if isinstance(getattr(rng, 'generator', None), np.random.Generator):
+        return None
+    return np.random.default_rng(
+        rng.getrandbits(64) if seed is None else abs(seed)
+            )
+
+
+def _bind(value: Any, attrs: dict[str, Any]) -> None:
+    """Bind private attributes of game to stuff in value
+
+    Args:
+        value (Any): attribute value
+        attrs (dict[str, Any]): values of private attributes by names
+    """
+    if isinstance(value, Base):
+        value._bind(**attrs)
+    elif isinstance(value, (list, tuple, set, deque)):
+        for item in value:
+            _bind(item, attrs)
+    elif isinstance(value, Mapping):
+        for item in value.values():
+            _bind(item, attrs)
+
 
 class BaseGame(Base):
     """Base class for games
+
+    ..
+        Game owns random generator, that is used by all its players,
+        tools and items, so games are independent and reproducible
+        by seed. Vectorized operations use numpy generator of game,
+        that is seeded and restored with random generator. Random
+        outcomes of game can be recorded to tape and replayed.
+        Without seed generator is seeded from global random state.
+        Any subclass of random.Random can be used as generator,
+        like NumpyRandom or SystemRandom from bgameb.rng.
+
+        Args:
+
+            seed (int, optional): seed of random generator of game.
+                                  Default to None.
+
+            rng (random.Random, optional): random generator of game.
+                                           Default to None - Mersenne
+                                           Twister of random module.
     """
 
-    def __init__(self, **data):
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        rng: Optional[random.Random] = None,
+        **data
+            ):
         super().__init__(**data)
+        if rng is None:
+            self.seed(seed)
+        else:
+            if seed is not None:
+                rng.seed(seed)
+            self.set_random(rng)
 
         self._logger.info('===========NEW GAME============')
         self._logger.info(f'{self.__class__.__name__} created.')
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        self._bind_from(value)
+
+    def seed(self, seed: Optional[int] = None) -> 'BaseGame':
+        """Seed random generators of game. Generators are created and
+        bound to all players, tools and items of game only once,
+        later they are reseeded in place.
+
+        Args:
+            seed (int, optional): seed of generator. Default to None -
+                                  seed is taken from global random
+                                  state.
+
+        Returns:
+            BaseGame
+        """
+        if seed is None:
+            seed = random.getrandbits(64)
+        if self._random is None:
+            rng = random.Random(seed)
+            self._bind(_random=rng, _np_random=_numpy(rng, seed))
+        else:
+            self._random.seed(seed)
+            generator = _numpy(self._random, seed)
+            if generator is not None and self._np_random is not None:
+                self._np_random.bit_generator.state = \
+                    generator.bit_generator.state
+        return self
+
+    def set_random(self, rng: random.Random) -> 'BaseGame':
+        """Bind random generator to game and all its players,
+        tools and items. Numpy generator of game is seeded from it.
+
+        Args:
+            rng (random.Random): random generator
+
+        Returns:
+            BaseGame
+        """
+        self._bind(_random=rng, _np_random=_numpy(rng))
+        return self
+
+    def get_random_state(self) -> tuple[Any, ...]:
+        """Get state of random generators of game
+
+        Returns:
+            tuple[Any, ...]: states of random and numpy generators
+        """
+        generator = self._np_random
+        return (
+            self._rng().getstate(),
+            None if generator is None else generator.bit_generator.state
+                )
+
+    def set_random_state(self, state: tuple[Any, ...]) -> None:
+        """Restore state of random generators of game
+
+        Args:
+            state (tuple[Any, ...]): states of generators,
+                                     got by get_random_state
+        """
+        rng_state, np_state = state
+        self._rng().setstate(rng_state)
+        if np_state is not None and self._np_random is not None:
+            self._np_random.bit_generator.state = np_state
+
+    def record(self, tape: Optional[Tape] = None) -> Tape:
+        """Record random outcomes of dice rolls, deck shuffles,
+        random cards and draws from bags of game to tape
+
+        Args:
+            tape (Tape, optional): tape to continue. Default to None -
+                                   new tape.
+
+        Returns:
+            Tape
+        """
+        if tape is None:
+            tape = Tape()
+        tape.replaying = False
+        self._bind(_tape=tape)
+        return tape
+
+    def replay(self, tape: Tape) -> Tape:
+        """Replay random outcomes of game from the start of tape.
+        Random generator isn't used.
+
+        Args:
+            tape (Tape): recorded tape
+
+        Returns:
+            Tape
+        """
+        tape.rewind().replaying = True
+        self._bind(_tape=tape)
+        return tape
+
+    def stop_tape(self) -> Optional[Tape]:
+        """Stop record or replay
+
+        Returns:
+            Tape, optional: stopped tape
+        """
+        tape = self._tape
+        self._bind(_tape=None)
+        return tape
+
 
 class BasePlayer(Base):
     """Base class for players
     """
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        self._bind_from(value)
+
 
 class BaseItem(Base):
     """Base class for items (like dices or cards)
+
+    ..
+        Attr:
+
+            _frame (Frame, optional): saved fields of item in snapshot
+                                      of game. Is dropped by change
+                                      of any field, so unchanged items
+                                      share frame between snapshots.
     """
+    _frame: Optional['Frame'] = None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if self._frame is not None and name[0] != '_':
+            object.__setattr__(self, '_frame', None)
+
+    def copy(self, **kwargs: Any) -> Any:
+        """Copy item without frame. Frame of snapshot is bound to
+        this item, so the copy with the same frame would be saved
+        as unchanged and restored to fields of this item.
+
+        Returns:
+            Any: a copy of item
+        """
+        item = super().copy(**kwargs)
+        object.__setattr__(item, '_frame', None)
+        return item
 
 
 V = TypeVar('V', bound=BaseItem)
@@ -324,9 +654,28 @@ class Components(GenericModel, Generic[V], Mapping[str, V]):
 
 class BaseTool(Base, GenericModel, Generic[V]):
     """Base class for game tools
+
+    ..
+        Attr:
+
+            current (list[V]): current items of tool
+
+            last (V, optional): last item, removed from current
+
+            visibility (Visibility): who can see current items in
+                                     views of game:
+
+                * public - all players
+                * owner - player, that owns tool, other players see
+                  only revealed items
+                * revealed - all players see only revealed items
+                * hidden - nobody, only count of items is visible
+
+                Default to 'public'.
     """
     current: list[V] = []
     last: Optional[V] = None
+    visibility: Visibility = 'public'
 
     @property
     def current_ids(self) -> list[str]:
@@ -469,8 +818,7 @@ class BaseToolExtended(BaseTool[V], Generic[V]):
             item_id (str): an item id
         """
         ind = self.index(item_id)
-        item = self.current[ind]
-        self.current.remove(item)
+        del self.current[ind]
         self._logger.debug(f'Is removed from current {item_id}')
 
     def reverse(self) -> None:
@@ -0,0 +1,726 @@
+"""Read-only catalog of items in memory-mappable file
+"""
+import csv
+import json
+import mmap
+import importlib
+import numpy as np
+from itertools import islice
+from collections import OrderedDict
+from collections.abc import Sequence, KeysView, ValuesView, ItemsView
+from typing import (
+    Optional,
+    Iterable,
+    Iterator,
+    Union,
+    Any,
+    Generic,
+    Mapping,
+    NamedTuple,
+    Type,
+    overload,
+    cast,
+    TYPE_CHECKING,
+        )
+from bgameb.base import BaseItem, Components, V
+from bgameb.errors import (
+    ComponentNameError, ComponentReadOnlyError, StuffDefineError
+        )
+
+
+MAGIC = b'BGAMEBC1'
+
+
+def _class_path(cls: type) -> str:
+    return f'{cls.__module__}:{cls.__qualname__}'
+
+
+def _align(data: bytearray) -> None:
+    data.extend(b'\0' * (-len(data) % 8))
+
+
+def write_catalog(
+    path: str,
+    items: Union[Iterable[BaseItem], Components[Any]],
+        ) -> int:
+    """Write items to catalog file. Names of items are safe names
+    of its ids or keys of given Components.
+
+    .. code-block::
+        :caption: Example:
+
+            write_catalog('cards.cat', C)
+            C = CatalogComponents[Card]('cards.cat')
+
+    Args:
+        path (str): path to catalog file
+        items (Union[Iterable[BaseItem], Components]): items to write
+
+    Raises:
+        ComponentNameError: name of item isn't unique
+
+    Returns:
+        int: count of written items
+    """
+    comp: Components[Any] = Components()
+    pairs = items.items() if isinstance(items, Components) \
+        else ((item.id, item) for item in items)
+
+    classes: dict[type, int] = {}
+    records: list[tuple[bytes, bytes, int, bytes]] = []
+    names = set()
+    for name, item in pairs:
+        name = comp._make_name(name)
+        if name in names:
+            raise ComponentNameError(name)
+        names.add(name)
+        kind = classes.setdefault(item.__class__, len(classes))
+        records.append((
+            name.encode(),
+            item.id.encode(),
+            kind,
+            item.json(by_alias=True).encode(),
+                ))
+    records.sort(key=lambda record: record[0])
+
+    count = len(records)
+    ids = [record[1] for record in records]
+    blobs = {'names': bytearray(), 'ids': bytearray(), 'data': bytearray()}
+    offsets = {key: np.zeros(count + 1, dtype=np.uint64) for key in blobs}
+    for ind, record in enumerate(records):
+        for key, value in zip(blobs, (record[0], record[1], record[3])):
+            blobs[key].extend(value)
+            offsets[key][ind + 1] = len(blobs[key])
+    arrays: dict[str, np.ndarray] = {
+        'kinds': np.array([record[2] for record in records], np.uint16),
+        'id_order': np.array(
+            sorted(range(count), key=ids.__getitem__),
+            dtype=np.uint32
+                ),
+        **{f'{key}_offsets': value for key, value in offsets.items()},
+            }
+
+    body = bytearray()
+    sections: dict[str, list[Any]] = {}
+    for key, array in arrays.items():
+        sections[key] = [len(body), np.dtype(array.dtype).str, len(array)]
+        body.extend(array.tobytes())
+        _align(body)
+    for key, blob in blobs.items():
+        sections[key] = [len(body), '|u1', len(blob)]
+        body.extend(blob)
+        _align(body)
+
+    header = json.dumps({
+        'count': count,
+        'classes': [_class_path(cls) for cls in classes],
+        'sections': sections,
+            }).encode()
+    head = bytearray(MAGIC)
+    head.extend(np.uint64(len(header)).tobytes())
+    head.extend(header)
+    _align(head)
+
+    with open(path, 'wb') as f:
+        f.write(np.uint64(len(head)).tobytes())
+        f.write(head)
+        f.write(body)
+    return count
+
+
+class RecordError(NamedTuple):
+    """Error of loading of record
+
+    ..
+        Attr:
+
+            line (int): line number of record in file
+
+            id (str, optional): id of record, if given
+
+            message (str): error message
+    """
+    line: int
+    id: Optional[str]
+    message: str
+
+
+def _cell(value: str) -> Any:
+    if value[:1] in ('[', '{'):
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value
+
+
+def read_records(
+    path: str,
+    format: Optional[str] = None,
+        ) -> Iterator[tuple[int, Any]]:
+    """Read records from JSON Lines or CSV file one by one.
+    Empty lines of JSON Lines and empty cells of CSV are skipped,
+    cells with json lists or objects are decoded.
+
+    Args:
+        path (str): path to file
+        format (str, optional): 'jsonl' or 'csv'.
+                                Default to None - is defined by
+                                extension of file.
+
+    Raises:
+        ValueError: unknown format
+
+    Yields:
+        tuple[int, Any]: line number and record
+    """
+    if format is None:
+        format = 'csv' if path.lower().endswith('.csv') else 'jsonl'
+    if format == 'jsonl':
+        with open(path, encoding='utf-8') as f:
+            for line, row in enumerate(f, start=1):
+                if row.strip():
+                    try:
+                        yield line, json.loads(row)
+                    except ValueError as e:
+                        yield line, e
+    elif format == 'csv':
+        with open(path, encoding='utf-8', newline='') as f:
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, {
+                    key: _cell(value) for key, value in record.items()
+                    if key is not None and value
+                        }
+    else:
+        raise ValueError(f'Unknown format of records: {format}')
+
+
+def _build(
+    record: Any,
+    item_class: Union[Type[BaseItem], Mapping[str, Type[BaseItem]]],
+    kind: str,
+        ) -> BaseItem:
+    """Build item from record
+
+    Args:
+        record (Any): record or error of its decoding
+        item_class (Union[Type[BaseItem], Mapping[str, Type[BaseItem]]]):
+            class of items or mapping of record kinds to classes
+        kind (str): key of record kind, used with mapping of classes
+
+    Raises:
+        TypeError: record isn't an object
+        ValueError: record isn't decoded, kind of record is unknown
+                    or record isn't valid
+
+    Returns:
+        BaseItem: item object
+    """
+    if isinstance(record, Exception):
+        raise record
+    if not isinstance(record, dict):
+        raise TypeError('Record must be an object')
+    if isinstance(item_class, Mapping):
+        record = dict(record)
+        try:
+            item_class = item_class[record.pop(kind)]
+        except KeyError as e:
+            raise ValueError(f'Unknown kind of record: {e}')
+    return item_class(**record)
+
+
+def _iter_items(
+    path: str,
+    item_class: Union[Type[BaseItem], Mapping[str, Type[BaseItem]]],
+    format: Optional[str],
+    kind: str,
+    batch_size: int,
+    errors: Optional[list[RecordError]],
+        ) -> Iterator[tuple[int, BaseItem]]:
+    """Build items from file in batches with line numbers of records.
+    Arguments are the same as iter_items() arguments.
+
+    Yields:
+        tuple[int, BaseItem]: line number and item object
+    """
+    records = read_records(path, format)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return
+        items = []
+        for line, record in batch:
+            try:
+                items.append((line, _build(record, item_class, kind)))
+            except (ValueError, TypeError, StuffDefineError) as e:
+                if errors is not None:
+                    id_ = record.get('id') \
+                        if isinstance(record, dict) else None
+                    errors.append(RecordError(line, id_, str(e)))
+        yield from items
+
+
+def iter_items(
+    path: str,
+    item_class: Union[Type[BaseItem], Mapping[str, Type[BaseItem]]],
+    format: Optional[str] = None,
+    kind: str = 'kind',
+    batch_size: int = 1024,
+    errors: Optional[list[RecordError]] = None,
+        ) -> Iterator[BaseItem]:
+    """Build items from JSON Lines or CSV file. Records are read
+    and validated in batches, every item is created only once.
+    Broken records are skipped and reported to errors.
+
+    .. code-block::
+        :caption: Example:
+
+            errors = []
+            items = iter_items(
+                'cards.jsonl', {'card': Card, 'dice': Dice}, errors=errors
+                    )
+            write_catalog('cards.cat', items)
+
+    Args:
+        path (str): path to file
+        item_class (Union[Type[BaseItem], Mapping[str, Type[BaseItem]]]):
+            class of items or mapping of record kinds to classes
+        format (str, optional): 'jsonl' or 'csv'. Default to None.
+        kind (str): key of record kind, used with mapping of classes.
+                    Default to 'kind'.
+        batch_size (int): size of batch. Default to 1024.
+        errors (list[RecordError], optional): list for errors of records.
+                                              Default to None.
+
+    Yields:
+        BaseItem: item object
+    """
+    for _, item in _iter_items(
+        path, item_class, format, kind, batch_size, errors
+            ):
+        yield item
+
+
+def load_components(
+    path: str,
+    item_class: Union[Type[BaseItem], Mapping[str, Type[BaseItem]]],
+    components: Optional[Components[Any]] = None,
+    format: Optional[str] = None,
+    kind: str = 'kind',
+    batch_size: int = 1024,
+        ) -> tuple[Components[Any], list[RecordError]]:
+    """Load items from JSON Lines or CSV file to Components.
+    Items are added to Components without copying. Records with
+    not unique names are reported as errors.
+
+    .. code-block::
+        :caption: Example:
+
+            C, errors = load_components('cards.csv', Card)
+
+    Args:
+        path (str): path to file
+        item_class (Union[Type[BaseItem], Mapping[str, Type[BaseItem]]]):
+            class of items or mapping of record kinds to classes
+        components (Components, optional): components to update.
+                                           Default to None.
+        format (str, optional): 'jsonl' or 'csv'. Default to None.
+        kind (str): key of record kind. Default to 'kind'.
+        batch_size (int): size of batch. Default to 1024.
+
+    Returns:
+        tuple[Components, list[RecordError]]: components
+            and errors of records
+    """
+    if components is None:
+        components = Components()
+    errors: list[RecordError] = []
+    for line, item in _iter_items(
+        path, item_class, format, kind, batch_size, errors
+            ):
+        try:
+            name = components._make_name(item.id)
+            if name in components:
+                raise ComponentNameError(name)
+        except ComponentNameError as e:
+            errors.append(RecordError(line, item.id, e.message))
+            continue
+        components.__dict__[name] = item
+    return components, errors
+
+
+class _Keys(Sequence):
+    """Lazy sequence of keys, stored in catalog blob
+    """
+
+    def __init__(
+        self,
+        blob: memoryview,
+        offsets: np.ndarray,
+        order: Optional[np.ndarray] = None
+            ) -> None:
+        self._blob = blob
+        self._offsets = offsets
+        self._order = order
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def raw(self, ind: int) -> bytes:
+        """Get encoded key by its position in sequence
+
+        Args:
+            ind (int): position of key
+
+        Returns:
+            bytes: encoded key
+        """
+        if self._order is not None:
+            ind = int(self._order[ind])
+        return bytes(
+            self._blob[int(self._offsets[ind]):int(self._offsets[ind + 1])]
+                )
+
+    @overload
+    def __getitem__(self, ind: int) -> str: ...
+
+    @overload
+    def __getitem__(self, ind: slice) -> list[str]: ...
+
+    def __getitem__(self, ind):
+        """Get key or list of keys by position or slice
+
+        Args:
+            ind (Union[int, slice]): position or slice of keys
+
+        Raises:
+            IndexError: position out of range
+
+        Returns:
+            Union[str, list[str]]: key or keys
+        """
+        if isinstance(ind, slice):
+            return [self[i] for i in range(*ind.indices(len(self)))]
+        if ind < 0:
+            ind += len(self)
+        if not 0 <= ind < len(self):
+            raise IndexError('catalog index out of range')
+        return self.raw(ind).decode()
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate keys in order of sequence
+
+        Yields:
+            str: key
+        """
+        for ind in range(len(self)):
+            yield self.raw(ind).decode()
+
+    def find(self, key: str) -> int:
+        """Find position of key by binary search
+
+        Args:
+            key (str): searched key
+
+        Returns:
+            int: position of key or -1
+        """
+        raw = key.encode()
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.raw(mid) < raw:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self) and self.raw(lo) == raw:
+            return lo
+        return -1
+
+    def __contains__(self, key: object) -> bool:
+        """Check key is in sequence by binary search
+
+        Args:
+            key (object): checked key
+
+        Returns:
+            bool: key is found
+        """
+        return isinstance(key, str) and self.find(key) >= 0
+
+
+class Catalog:
+    """Memory-mapped catalog file.
+
+    .. code-block::
+        :caption: Example:
+
+            with Catalog('cards.cat') as catalog:
+                card = catalog.load(catalog.by_id('card'))
+
+    ..
+        Catalog file keeps item definitions as json records, sorted
+        by name, with tables of names, ids and classes. Arrays
+        are views of read-only mapping, so workers, that open
+        the same catalog, share its pages through the OS page cache.
+
+        Attr:
+
+            path (str): path to catalog file
+
+            count (int): count of items
+
+            names (Sequence[str]): names of items, sorted
+
+            ids (Sequence[str]): ids of items, sorted
+
+        Mapping of file is kept open until close() of catalog.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(self._mmap)
+        start = int(np.frombuffer(buf[:8], dtype=np.uint64)[0]) + 8
+        if bytes(buf[8:16]) != MAGIC:
+            raise ValueError(f'{path} is not a catalog file')
+        size = int(np.frombuffer(buf[16:24], dtype=np.uint64)[0])
+        header = json.loads(bytes(buf[24:24 + size]))
+
+        self.count: int = header['count']
+        self._class_paths: list[str] = header['classes']
+        self._classes: dict[int, type] = {}
+        sections: dict[str, Any] = {}
+        for key, (offset, dtype, length) in header['sections'].items():
+            offset += start
+            if dtype == '|u1':
+                sections[key] = buf[offset:offset + length]
+            else:
+                sections[key] = np.frombuffer(
+                    buf, dtype=dtype, count=length, offset=offset
+                        )
+        self._kinds = sections['kinds']
+        self._data = sections['data']
+        self._data_offsets = sections['data_offsets']
+        self.names = _Keys(sections['names'], sections['names_offsets'])
+        self._ids = _Keys(sections['ids'], sections['ids_offsets'])
+        self.ids = _Keys(
+            sections['ids'], sections['ids_offsets'], sections['id_order']
+                )
+        self._id_order = sections['id_order']
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> 'Catalog':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close mapping of catalog file. Arrays and sequences
+        of catalog are dropped, so catalog can't be used after
+        close, and mapping can't be closed while its sequences,
+        like names or ids, are referenced outside of catalog.
+
+        Raises:
+            BufferError: mapping is used by other objects
+        """
+        if self._mmap.closed:
+            return
+        del (
+            self._kinds, self._data, self._data_offsets, self._id_order,
+            self.names, self._ids, self.ids
+                )
+        self._mmap.close()
+
+    def item_class(self, ind: int) -> type:
+        """Get class of item by its position
+
+        Args:
+            ind (int): position of item
+
+        Returns:
+            type: class of item
+        """
+        kind = int(self._kinds[ind])
+        try:
+            return self._classes[kind]
+        except KeyError:
+            module, qualname = self._class_paths[kind].split(':')
+            cls: Any = importlib.import_module(module)
+            for attr in qualname.split('.'):
+                cls = getattr(cls, attr)
+            self._classes[kind] = cls
+            return cast(type, cls)
+
+    def load(self, ind: int) -> BaseItem:
+        """Create item by its position
+
+        Args:
+            ind (int): position of item
+
+        Returns:
+            BaseItem: item object
+        """
+        data = json.loads(bytes(self._data[
+            int(self._data_offsets[ind]):int(self._data_offsets[ind + 1])
+                ]))
+        item: BaseItem = self.item_class(ind)(**data)
+        return item
+
+    def by_id(self, id: str) -> int:
+        """Get position of first item with given id
+
+        Args:
+            id (str): item id
+
+        Returns:
+            int: position of item or -1
+        """
+        ind = self.ids.find(id)
+        return -1 if ind < 0 else int(self._id_order[ind])
+
+    def id_of(self, ind: int) -> str:
+        """Get id of item by its position
+
+        Args:
+            ind (int): position of item
+
+        Returns:
+            str: item id
+        """
+        return self._ids[ind]
+
+
+class CatalogComponents(Components[V], Generic[V]):
+    """Read-only Components, backed by catalog file.
+
+    ..
+        Items are materialized from catalog only by access and
+        the last materialized items are kept in LRU cache
+        of bounded size. Names of components are sorted.
+        Items from catalog are definitions, that are copied
+        by tools by deal, so don't change it.
+
+        Attr:
+
+            catalog (Catalog): catalog file
+
+            maxsize (int): max count of cached items. Default to 1024.
+
+    .. code-block::
+        :caption: Example:
+
+            with CatalogComponents[Card]('cards.cat', maxsize=512) as C:
+                deck.deal(C, ['card1', 'card2'])
+    """
+    __slots__ = ('catalog', 'maxsize', '_cache')
+    if TYPE_CHECKING:
+        catalog: Catalog
+        maxsize: int
+        _cache: OrderedDict[int, V]
+
+    def __init__(self, path: str, maxsize: int = 1024) -> None:
+        object.__setattr__(self, 'catalog', Catalog(path))
+        object.__setattr__(self, 'maxsize', maxsize)
+        object.__setattr__(self, '_cache', OrderedDict())
+
+    def _get(self, ind: int) -> V:
+        """Get materialized item from cache or catalog
+
+        Args:
+            ind (int): position of item
+
+        Returns:
+            BaseItem: item object
+        """
+        cache = self._cache
+        try:
+            cache.move_to_end(ind)
+            return cache[ind]
+        except KeyError:
+            item = cast(V, self.catalog.load(ind))
+            cache[ind] = item
+            if len(cache) > self.maxsize:
+                cache.popitem(last=False)
+            return item
+
+    def __iter__(self) -> Iterator[str]:  # type: ignore[override]
+        return iter(self.catalog.names)
+
+    def __len__(self) -> int:
+        return len(self.catalog)
+
+    def __contains__(self, attr: object) -> bool:
+        return attr in self.catalog.names
+
+    def __getitem__(self, attr: str) -> V:
+        ind = self.catalog.names.find(attr)
+        if ind < 0:
+            raise KeyError(attr)
+        return self._get(ind)
+
+    def __setitem__(self, attr: str, value: V) -> None:
+        raise ComponentReadOnlyError(attr)
+
+    def __delitem__(self, attr: str) -> None:
+        raise ComponentReadOnlyError(attr)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.catalog.path!r})'
+
+    def __enter__(self) -> 'CatalogComponents[V]':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Clear cache of items and close catalog file
+        """
+        self._cache.clear()
+        self.catalog.close()
+
+    def keys(self) -> KeysView[str]:
+        return KeysView(self)
+
+    def values(self) -> ValuesView[V]:
+        return ValuesView(self)
+
+    def items(self) -> ItemsView[str, V]:
+        return ItemsView(self)
+
+    def update(self, stuff: V, name: Optional[str] = None) -> None:
+        raise ComponentReadOnlyError(name or stuff.id)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {name: self[name] for name in self},
+            default=lambda c: c.dict()
+                )
+
+    @property
+    def ids(self) -> Sequence[str]:  # type: ignore[override]
+        """Get ids of all items in catalog. Is a lazy sorted sequence
+        with search by binary search, not a list.
+
+        Returns:
+            Sequence[str]: sequence of stuff ids
+        """
+        return self.catalog.ids
+
+    def by_id(self, id: str) -> Optional[V]:
+        """Get item object by its id
+
+        Args:
+            id (str): item id
+
+        Returns:
+            V, optional: item object
+        """
+        ind = self.catalog.by_id(id)
+        return None if ind < 0 else self._get(ind)
@@ -25,6 +25,23 @@ class ComponentClassError(CustomRuntimeError):
         super().__init__(self.message)
 
 
+class ComponentReadOnlyError(CustomRuntimeError):
+    """Components can't be changed.
+    """
+    def __init__(self, name: str) -> None:
+        self.message = f'Stuff with {name=} cant be changed in ' + \
+                        'read-only Components class instance.'
+        super().__init__(self.message)
+
+
+class TapeError(CustomRuntimeError):
+    """Tape of random outcomes can't be read or doesn't match game.
+    """
+    def __init__(self, message: str) -> None:
+        self.message = message
+        super().__init__(self.message)
+
+
 class StuffDefineError(AttributeError):
     """Bad definition of item.
     """
@@ -1,8 +1,86 @@
 """Main engine to create game
 """
+from typing import Optional, Any
 from bgameb.base import BaseGame
+from bgameb.views import View
+from bgameb.snapshot import Snapshot, Frames, capture, restore
 
 
 class Game(BaseGame):
     """The main game object
+
+    ..
+        Attr:
+
+            _snapshot (Snapshot, optional): the last taken or restored
+                                            snapshot of game
     """
+    _snapshot: Optional[Snapshot] = None
+
+    def view(self, viewer: Optional[str] = None) -> View:
+        """Get read-only view of game for player. Items, hidden
+        for player by visibility of tools, are redacted.
+
+        Args:
+            viewer (str, optional): player id. Default to None -
+                                    view of spectator.
+
+        Returns:
+            View
+        """
+        return View(self, viewer)
+
+    def snapshot(self) -> Snapshot:
+        """Get snapshot of fields of game, its players, tools
+        and items and of state of random generator.
+
+        ..
+            Snapshot shares structure with previous ones: frame
+            of item is kept by item until any its field is changed,
+            and frames of players and tools and copies of its
+            containers are reused, if nothing is changed. So only
+            changed stuff costs memory. Private state of stuff,
+            like counters, histories of rolls and tape, isn't
+            saved. Items are tracked by assignment of fields,
+            in place changes of its mutable fields aren't tracked.
+            State of generator without state, like SystemRandom,
+            isn't saved.
+
+        Returns:
+            Snapshot
+        """
+        last = self._snapshot
+        frames: Frames = {}
+        frame = capture(self, {} if last is None else last.frames, frames)
+        try:
+            state: Optional[tuple[Any, ...]] = self.get_random_state()
+        except NotImplementedError:
+            state = None
+        if last is not None and state == last.random_state:
+            if frame is last.frame:
+                return last
+            state = last.random_state
+        self._snapshot = Snapshot(frame, state, frames)
+        return self._snapshot
+
+    def restore(self, snapshot: Snapshot) -> 'Game':
+        """Restore game from snapshot. Stuff of game is restored
+        in place and only changed stuff is written. Snapshot
+        can be restored many times.
+
+        Args:
+            snapshot (Snapshot): snapshot of this game
+
+        Raises:
+            ValueError: snapshot is taken of other game
+
+        Returns:
+            Game
+        """
+        if snapshot.frame.stuff is not self:
+            raise ValueError('Snapshot is taken of other game')
+        restore(snapshot.frame)
+        if snapshot.random_state is not None:
+            self.set_random_state(snapshot.random_state)
+        self._snapshot = snapshot
+        return self
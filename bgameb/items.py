@@ -1,10 +1,53 @@
 """Game dices, coins, cards and other items
 """
-import random
-from typing import Optional, NoReturn, Any, cast
-from pydantic import PositiveInt, NonNegativeInt, ConstrainedInt
+import numpy as np
+from numpy.typing import ArrayLike
+from typing import (
+    Optional,
+    NoReturn,
+    Any,
+    Iterable,
+    Union,
+    cast,
+    TYPE_CHECKING,
+        )
+from pydantic import (
+    PositiveInt,
+    NonNegativeInt,
+    NonNegativeFloat,
+    ConstrainedInt,
+        )
+from bgameb import odds
 from bgameb.base import BaseItem
 from bgameb.errors import StuffDefineError
+from bgameb.odds import DiceKey
+from bgameb.stores import RollHistory
+if TYPE_CHECKING:
+    from bgameb.stores import CardStates
+
+
+def _alias_table(weights: list[float]) -> tuple[np.ndarray, np.ndarray]:
+    """Build Walker alias table by Vose method
+
+    Args:
+        weights (list[float]): weights of outcomes
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: probabilities of outcomes
+            in its columns and aliases of columns
+    """
+    size = len(weights)
+    prob = np.array(weights, dtype=float) * size / sum(weights)
+    alias = np.arange(size)
+    small = [i for i in range(size) if prob[i] < 1.0]
+    large = [i for i in range(size) if prob[i] >= 1.0]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        alias[less] = more
+        prob[more] -= 1.0 - prob[less]
+        (small if prob[more] < 1.0 else large).append(more)
+    prob[small + large] = 1.0
+    return prob, alias
 
 
 class Step(BaseItem):
@@ -14,8 +57,15 @@ class Step(BaseItem):
         Attr:
 
             priority (NonNegativeInt): priority queue number. Default to 0.
+
+            _seq (int): order of push to steps. Is used to keep
+                        steps with equal priority in FIFO order.
+
+            _pos (int): position of step in heap of steps.
     """
     priority: NonNegativeInt = 0
+    _seq: int = 0
+    _pos: int = -1
 
     def __eq__(self, other: 'Step') -> bool:  # type: ignore[override]
         return self.priority == other.priority
@@ -54,6 +104,7 @@ class Dice(BaseItem):
         :caption: Example:
 
             dice = Dice(id='coin', sides=2, mapping={1: 'this', 2: 'that'})
+            stats = Dice(id='4d6', sides=6, count=4, keep_highest=3)
 
     ..
         Attr:
@@ -66,24 +117,77 @@ class Dice(BaseItem):
                 optional mapping of roll result. Mapping must define
                 values for each side.
 
+            weights (dict[PositiveInt, NonNegativeFloat]):
+                optional weights of sides for loaded dices. Weights
+                must define values for each side.
+
+            reroll (set[PositiveInt]): sides, that are rerolled once.
+
+            explode (PositiveInt, optional): min side, that explodes:
+                one more dice is rolled and added to result of dice.
+
+            explode_limit (PositiveInt): max count of explosions of
+                dice. Default to 10.
+
+            keep_highest (PositiveInt, optional): count of kept highest
+                results, others are dropped.
+
+            keep_lowest (PositiveInt, optional): count of kept lowest
+                results, others are dropped.
+
+            success (PositiveInt, optional): min successful result.
+
+            history_size (NonNegativeInt): count of recent rolls, kept
+                in history with running statistics. Default to 0 -
+                history isn't kept. Chi-square of history of dice
+                with modifiers isn't counted.
+
+            Modifiers are applied to roll, roll_many and mapped rolls
+            in order: reroll, explode, keep. Histograms and exact
+            distributions of dice with modifiers aren't available.
+
             last roll (list[PositiveInt]), optional:
                 last roll values.
 
             last roll mapped (list[Any]), optional:
                 last mapped roll values.
 
+            last histogram (list[NonNegativeInt]), optional:
+                counts of faces of last histogram roll, started
+                from the face 1.
+
             _range (list[PositiveInt]): range of roll, started from 1.
 
+            _alias (tuple, optional): weights and Walker alias table
+                                      of weighted dice.
+
+            _history (RollHistory, optional): history of recent rolls.
+
         Raises:
 
-            StuffDefineError: mapping keys is not equal of roll range.
+            StuffDefineError: mapping or weights keys is not equal
+                              of roll range, weights are zero or
+                              modifiers are out of roll range.
     """
     count: PositiveInt = 1
     sides: Sides = cast(Sides, 2)
     mapping: dict[PositiveInt, Any] = {}
+    weights: dict[PositiveInt, NonNegativeFloat] = {}
+    reroll: set[PositiveInt] = set()
+    explode: Optional[PositiveInt] = None
+    explode_limit: PositiveInt = 10
+    keep_highest: Optional[PositiveInt] = None
+    keep_lowest: Optional[PositiveInt] = None
+    success: Optional[PositiveInt] = None
+    history_size: NonNegativeInt = 0
     last_roll: list[PositiveInt] = []
     last_roll_mapped: list[Any] = []
+    last_histogram: list[NonNegativeInt] = []
     _range: list[PositiveInt] = []
+    _alias: Optional[
+        tuple[tuple[float, ...], np.ndarray, np.ndarray]
+            ] = None
+    _history: Optional[RollHistory] = None
 
     def __init__(self, **data):
         super().__init__(**data)
@@ -94,6 +198,104 @@ class Dice(BaseItem):
                 message='Mapping must define values for each side.',
                 logger=self._logger
                     )
+        if self.weights:
+            if set(self.weights.keys()) ^ set(self._range):
+                raise StuffDefineError(
+                    message='Weights must define values for each side.',
+                    logger=self._logger
+                        )
+            if not sum(self.weights.values()):
+                raise StuffDefineError(
+                    message='Weights must have positive sum.',
+                    logger=self._logger
+                        )
+            self._alias_table()
+        if self.reroll - set(self._range) or (
+            self.explode is not None and self.explode > self.sides
+                ):
+            raise StuffDefineError(
+                message='Modifiers must be in range of sides.',
+                logger=self._logger
+                    )
+        if self.keep_highest is not None and self.keep_lowest is not None:
+            raise StuffDefineError(
+                message='Keep only highest or only lowest results.',
+                logger=self._logger
+                    )
+
+    def _is_modified(self) -> bool:
+        """Is any roll modifier defined
+
+        Returns:
+            bool: dice has modifiers
+        """
+        return bool(
+            self.reroll or self.explode is not None
+            or self.keep_highest is not None or self.keep_lowest is not None
+                )
+
+    def _alias_table(self) -> tuple[np.ndarray, np.ndarray]:
+        """Get Walker alias table of weighted dice. Table is
+        rebuilt only if weights are changed.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: probabilities of sides
+                in its columns and aliases of columns, started from 0
+        """
+        weights = tuple(float(self.weights[side]) for side in self._range)
+        if self._alias is None or self._alias[0] != weights:
+            self._alias = (weights, *_alias_table(list(weights)))
+        return self._alias[1], self._alias[2]
+
+    @property
+    def history(self) -> Optional[dict[str, Any]]:
+        """Get recent rolls and its running statistics: counts
+        of faces, mean, variance and chi-square against expected
+        distribution of faces. Chi-square of dice with modifiers
+        is None.
+
+        Returns:
+            dict[str, Any], optional: history or None, if history
+                                      isn't kept
+        """
+        if self._history is None or not self.history_size:
+            return None
+        return self._history.stats()
+
+    def _expect(self, history: RollHistory) -> RollHistory:
+        """Set expected distribution of faces of history. Results
+        of dice with modifiers have no closed-form distribution.
+
+        Args:
+            history (RollHistory): history of rolls of dice
+
+        Returns:
+            RollHistory
+        """
+        history.modeled = not self._is_modified()
+        history.probs = tuple(self._probs().tolist()) \
+            if self.weights and history.modeled else None
+        return history
+
+    def _record(self, rolls: Union[np.ndarray, list[list[int]]]) -> None:
+        """Add recent rolls to history, if it is kept
+
+        Args:
+            rolls (Union[np.ndarray, list[list[int]]]): results of rolls
+        """
+        if not self.history_size:
+            return
+        history = self._history
+        if history is None or history.size != self.history_size \
+                or history.sides != self.sides:
+            history = self._history = RollHistory(
+                self.history_size, self.sides
+                    )
+        self._expect(history)
+        recent = rolls[-self.history_size:]
+        history.extend(
+            recent.tolist() if isinstance(recent, np.ndarray) else recent
+                )
 
     def __eq__(self, other: 'Dice') -> bool:  # type: ignore[override]
         return self.sides == other.sides
@@ -119,11 +321,44 @@ class Dice(BaseItem):
         Returns:
             list[PositiveInt]: result of roll
         """
-        self.last_roll = [
-            random.choices(self._range, k=1)[0] for _
+        tape = self._tape
+        if tape is not None and tape.replaying:
+            self.last_roll = tape.take(tape.ROLL)
+        else:
+            self.last_roll = self._roll()
+            if tape is not None:
+                tape.put(tape.ROLL, self.last_roll)
+        self._record([self.last_roll])
+        return self.last_roll
+
+    def _roll(self) -> list[PositiveInt]:
+        """Roll by random generator
+
+        Returns:
+            list[PositiveInt]: result of roll
+        """
+        if self._is_modified():
+            np_rng = self._np_rng()
+            modified: list[PositiveInt] = self.modify(
+                self._draw(np_rng, (1, self.count)), np_rng
+                    )[0].tolist()
+            return modified
+        rng = self._rng()
+        if self.weights:
+            prob, alias = (table.tolist() for table in self._alias_table())
+            sides = self.sides
+            rolls = []
+            for _ in range(self.count):
+                col = rng.randrange(sides)
+                rolls.append(
+                    col + 1 if rng.random() < prob[col]
+                    else alias[col] + 1
+                        )
+            return rolls
+        return [
+            rng.choices(self._range, k=1)[0] for _
             in list(range(self.count))
                 ]
-        return self.last_roll
 
     def roll_mapped(self) -> list[Any]:
         """Roll and return mapped result
@@ -137,6 +372,335 @@ class Dice(BaseItem):
                 ]
         return self.last_roll_mapped
 
+    def roll_many(self, n: int) -> np.ndarray:
+        """Roll n times by one vectorized call. The last roll
+        is the result of the final trial.
+
+        Args:
+            n (int): count of trials
+
+        Returns:
+            np.ndarray: array of shape (n, count) with results of rolls
+                        or (n, kept count) if results are kept
+        """
+        def draw(rng: np.random.Generator) -> np.ndarray:
+            rolls = self._draw(rng, (n, self.count))
+            return self.modify(rolls, rng) if self._is_modified() else rolls
+
+        rolls = self._np_outcome(draw)
+        if n > 0:
+            self.last_roll = rolls[-1].tolist()
+            self._record(rolls)
+        return rolls
+
+    def _draw(
+        self,
+        rng: np.random.Generator,
+        size: Union[int, tuple[int, ...]]
+            ) -> np.ndarray:
+        """Draw sides of dice
+
+        Args:
+            rng (np.random.Generator): numpy generator
+            size (Union[int, tuple[int, ...]]): shape of result
+
+        Returns:
+            np.ndarray: array of sides
+        """
+        if self.weights:
+            prob, alias = self._alias_table()
+            cols = rng.integers(0, self.sides, size=size)
+            drawn: np.ndarray = np.where(
+                rng.random(size) < prob[cols], cols, alias[cols]
+                    ) + 1
+            return drawn
+        return rng.integers(1, self.sides + 1, size=size, dtype=np.int64)
+
+    def modify(
+        self,
+        rolls: ArrayLike,
+        rng: Optional[np.random.Generator] = None
+            ) -> np.ndarray:
+        """Apply modifiers of dice to results of rolls
+        by array operations
+
+        Args:
+            rolls (ArrayLike): array of results of shape (n, count)
+            rng (np.random.Generator, optional): numpy generator.
+                                                 Default to None -
+                                                 generator of game
+                                                 is used and results
+                                                 are recorded to tape.
+
+        Returns:
+            np.ndarray: modified results
+        """
+        if rng is None:
+            return self._np_outcome(lambda rng: self.modify(rolls, rng))
+        result = np.array(rolls, dtype=np.int64, ndmin=2)
+        if self.reroll:
+            mask = np.isin(result, list(self.reroll))
+            result[mask] = self._draw(rng, int(mask.sum()))
+        if self.explode is not None:
+            mask = result >= self.explode
+            for _ in range(self.explode_limit):
+                count = int(mask.sum())
+                if not count:
+                    break
+                drawn = self._draw(rng, count)
+                result[mask] += drawn
+                mask[mask] = drawn >= self.explode
+        if self.keep_highest is not None:
+            result = np.sort(result, axis=1)[:, -self.keep_highest:]
+        elif self.keep_lowest is not None:
+            result = np.sort(result, axis=1)[:, :self.keep_lowest]
+        return result
+
+    def count_successes(
+        self,
+        rolls: Optional[ArrayLike] = None,
+        threshold: Optional[int] = None
+            ) -> Any:
+        """Count results greater or equal to threshold
+
+        Args:
+            rolls (ArrayLike, optional): results of rolls. Default to
+                                         None - the last roll is used.
+            threshold (int, optional): min successful result. Default
+                                       to None - success of dice
+                                       is used.
+
+        Returns:
+            int or np.ndarray: count of successes by rolls
+        """
+        threshold = threshold if threshold is not None else self.success
+        if threshold is None:
+            raise ValueError('Threshold of success is not defined')
+        result = (
+            np.asarray(self.last_roll if rolls is None else rolls)
+            >= threshold
+                ).sum(axis=-1)
+        return int(result) if result.ndim == 0 else result
+
+    def _table(self) -> np.ndarray:
+        """Get lookup table of mapping, indexed by roll result
+
+        Returns:
+            np.ndarray: object array of mapped values
+        """
+        table = np.empty(self.sides + 1, dtype=object)
+        for side, value in self.mapping.items():
+            table[side] = value
+        return table
+
+    def _lookup(self, rolls: np.ndarray) -> np.ndarray:
+        """Map results by lookup table. Results out of sides,
+        made by explosions, are mapped to None.
+
+        Args:
+            rolls (np.ndarray): results of rolls
+
+        Returns:
+            np.ndarray: object array of mapped values
+        """
+        table = self._table()
+        mapped: np.ndarray = table[np.minimum(rolls, self.sides)]
+        if self.explode is not None:
+            mapped[rolls > self.sides] = None
+        return mapped
+
+    def roll_mapped_many(self, n: int) -> np.ndarray:
+        """Roll n times and return mapped results, taken from
+        lookup table. The last mapped roll is the result
+        of the final trial. If dice is unmapped, result is empty.
+
+        Args:
+            n (int): count of trials
+
+        Returns:
+            np.ndarray: object array of shape (n, count)
+                        or (n, 0) for unmapped dice
+        """
+        rolls = self.roll_many(n)
+        if not self.mapping:
+            if n > 0:
+                self.last_roll_mapped = []
+            return np.empty((n, 0), dtype=object)
+        mapped = self._lookup(rolls)
+        if n > 0:
+            self.last_roll_mapped = [
+                value for value in mapped[-1].tolist() if value
+                    ]
+        return mapped
+
+    def _probs(self) -> np.ndarray:
+        """Get probabilities of faces. Probabilities of results
+        of modified dices aren't modeled.
+
+        Raises:
+            StuffDefineError: dice has modifiers
+
+        Returns:
+            np.ndarray: probabilities, started from the face 1
+        """
+        if self._is_modified():
+            raise StuffDefineError(
+                message='Faces of dice with modifiers are not modeled.',
+                logger=self._logger
+                    )
+        if self.weights:
+            probs = np.array(
+                [self.weights[side] for side in self._range], dtype=float
+                    )
+            result: np.ndarray = probs / probs.sum()
+            return result
+        return np.full(self.sides, 1 / self.sides)
+
+    def roll_histogram(self) -> np.ndarray:
+        """Roll all dices and return only counts of faces. Counts are
+        sampled from multinomial distribution, so cost of roll
+        depends on sides, but not on count of dices.
+
+        Raises:
+            StuffDefineError: dice has modifiers
+
+        Returns:
+            np.ndarray: counts of faces, started from the face 1
+        """
+        probs = self._probs()
+        histogram = self._np_outcome(
+            lambda rng: rng.multinomial(self.count, probs)
+                )
+        self.last_histogram = histogram.tolist()
+        return histogram
+
+    def roll_histogram_many(self, n: int) -> np.ndarray:
+        """Roll all dices n times and return counts of faces.
+        The last histogram is the result of the final trial.
+
+        Args:
+            n (int): count of trials
+
+        Raises:
+            StuffDefineError: dice has modifiers
+
+        Returns:
+            np.ndarray: array of shape (n, sides) with counts of faces
+        """
+        probs = self._probs()
+        histograms = self._np_outcome(
+            lambda rng: rng.multinomial(self.count, probs, size=n)
+                )
+        if n > 0:
+            self.last_histogram = histograms[-1].tolist()
+        return histograms
+
+    def successes(
+        self,
+        threshold: int,
+        histogram: Optional[ArrayLike] = None
+            ) -> Any:
+        """Count dices with result greater or equal to threshold
+
+        Args:
+            threshold (int): min successful face
+            histogram (ArrayLike, optional): counts of faces or array
+                of histograms of shape (n, sides). Default to None -
+                the last histogram is used.
+
+        Returns:
+            int or np.ndarray: count of successes by histograms
+        """
+        counts = np.asarray(
+            self.last_histogram if histogram is None else histogram
+                )
+        result = counts[..., max(threshold, 1) - 1:].sum(axis=-1)
+        return int(result) if result.ndim == 0 else result
+
+    def _key(self) -> DiceKey:
+        """Get key of dices for distributions
+
+        Returns:
+            DiceKey: probabilities of faces and count of dices
+        """
+        return tuple(self._probs().tolist()), self.count
+
+    def _mapped_key(self, value: Any) -> DiceKey:
+        """Get key of dices, that show or not show mapped value
+
+        Args:
+            value (Any): mapped value
+
+        Returns:
+            DiceKey: probabilities of miss and hit and count of dices
+        """
+        probs = self._probs()
+        p = float(sum(
+            probs[side - 1] for side, mapped in self.mapping.items()
+            if mapped == value
+                ))
+        return (1.0 - p, p), self.count
+
+    def sum_distribution(self) -> np.ndarray:
+        """Get exact distribution of sum of results of all dices.
+        Result is memoized.
+
+        Raises:
+            StuffDefineError: dice has modifiers
+
+        Returns:
+            np.ndarray: read-only array of probabilities, indexed by sum
+        """
+        return odds.sum_distribution(odds.pool_key([self._key()]))
+
+    def max_distribution(self) -> np.ndarray:
+        """Get exact distribution of max result of all dices.
+        Result is memoized.
+
+        Raises:
+            StuffDefineError: dice has modifiers
+
+        Returns:
+            np.ndarray: read-only array of probabilities, indexed by face
+        """
+        return odds.max_distribution(odds.pool_key([self._key()]))
+
+    def count_distribution(self, faces: Iterable[int]) -> np.ndarray:
+        """Get exact distribution of count of dices, that show any
+        of given faces. Result is memoized.
+
+        Args:
+            faces (Iterable[int]): faces, started from 1
+
+        Raises:
+            StuffDefineError: dice has modifiers
+
+        Returns:
+            np.ndarray: read-only array of probabilities,
+                        indexed by count
+        """
+        return odds.count_distribution(
+            odds.pool_key([self._key()]), frozenset(faces)
+                )
+
+    def mapped_distribution(self, value: Any) -> np.ndarray:
+        """Get exact distribution of count of dices, that show given
+        mapped value. Result is memoized.
+
+        Args:
+            value (Any): mapped value
+
+        Raises:
+            StuffDefineError: dice has modifiers
+
+        Returns:
+            np.ndarray: read-only array of probabilities,
+                        indexed by count
+        """
+        return odds.count_distribution(
+            odds.pool_key([self._mapped_key(value)]), frozenset([2])
+                )
+
 
 class Card(BaseItem):
     """Card objects
@@ -152,6 +716,11 @@ class Card(BaseItem):
 
             side (str, optional): the side of tap. Default to None.
 
+            _states (CardStates, optional): store of flags of deck,
+                                            that holds this card.
+
+            _slot (int): slot of card in store. Default to -1.
+
     .. code-block::
         :caption: Example:
 
@@ -162,6 +731,25 @@ class Card(BaseItem):
     is_revealed: bool = False
     is_active: bool = True
     side: Optional[str] = None
+    _states: Optional['CardStates'] = None
+    _slot: int = -1
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if self._states is not None and name in self._states.fields:
+            self._states.set(self._slot, name, value)
+
+    def _load_state(self, state: Any) -> None:
+        """Write restored flags of card to states of deck. Fields of
+        item are restored in its __dict__, past __setattr__, so
+        shared states of deck are rebuilt from fields of card.
+
+        Args:
+            state (Any): ignored, items are restored with None
+        """
+        if self._states is not None:
+            for name in self._states.fields:
+                self._states.set(self._slot, name, self.__dict__[name])
 
     def flip(self) -> 'Card':
         """Face up or face down the card regardles of it condition
@@ -0,0 +1,350 @@
+"""Exact distributions of results of dices and draws of cards
+"""
+import numpy as np
+from math import comb
+from functools import lru_cache
+from collections import Counter
+from typing import Iterable, Mapping, Optional
+
+
+# Dices of pool are defined by probabilities of faces, started
+# from the face 1, and count of dices
+DiceKey = tuple[tuple[float, ...], int]
+PoolKey = tuple[DiceKey, ...]
+
+
+def pool_key(keys: Iterable[DiceKey]) -> PoolKey:
+    """Get key of pool of dices. Order of dices isn't matter.
+
+    Args:
+        keys (Iterable[DiceKey]): keys of dices
+
+    Returns:
+        PoolKey: key of pool
+    """
+    return tuple(sorted(keys))
+
+
+def _frozen(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+def _convolve(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Convolve distributions. Big distributions are convolved
+    by fast Fourier transform.
+
+    Args:
+        a (np.ndarray): distribution
+        b (np.ndarray): distribution
+
+    Returns:
+        np.ndarray: distribution of sum
+    """
+    if len(a) * len(b) <= 1 << 20:
+        return np.convolve(a, b)
+    size = len(a) + len(b) - 1
+    result = np.fft.irfft(np.fft.rfft(a, size) * np.fft.rfft(b, size), size)
+    return np.clip(result, 0, None)
+
+
+def _power(pmf: np.ndarray, count: int) -> np.ndarray:
+    """Get distribution of sum of count independent values
+    by exponentiation by squaring.
+
+    Args:
+        pmf (np.ndarray): distribution of value
+        count (int): count of values
+
+    Returns:
+        np.ndarray: distribution of sum
+    """
+    result = np.ones(1)
+    while count:
+        if count & 1:
+            result = _convolve(result, pmf)
+        count >>= 1
+        if count:
+            pmf = _convolve(pmf, pmf)
+    return result
+
+
+@lru_cache(maxsize=1024)
+def sum_distribution(pool: PoolKey) -> np.ndarray:
+    """Get distribution of sum of results of pool
+
+    Args:
+        pool (PoolKey): key of pool
+
+    Returns:
+        np.ndarray: read-only array of probabilities, indexed by sum
+    """
+    result = np.ones(1)
+    for probs, count in pool:
+        result = _convolve(
+            result, _power(np.concatenate([[0.0], probs]), count)
+                )
+    return _frozen(result)
+
+
+@lru_cache(maxsize=1024)
+def max_distribution(pool: PoolKey) -> np.ndarray:
+    """Get distribution of max result of pool
+
+    Args:
+        pool (PoolKey): key of pool
+
+    Returns:
+        np.ndarray: read-only array of probabilities, indexed by face
+    """
+    size = max((len(probs) for probs, _ in pool), default=0) + 1
+    cdf = np.ones(size)
+    for probs, count in pool:
+        dice = np.ones(size)
+        dice[:len(probs) + 1] = np.cumsum(np.concatenate([[0.0], probs]))
+        cdf *= np.minimum(dice, 1.0) ** count
+    if not pool:
+        return _frozen(np.ones(1))
+    return _frozen(np.diff(cdf, prepend=0.0))
+
+
+@lru_cache(maxsize=1024)
+def count_distribution(
+    pool: PoolKey,
+    faces: frozenset[int]
+        ) -> np.ndarray:
+    """Get distribution of count of dices of pool, that show
+    any of given faces
+
+    Args:
+        pool (PoolKey): key of pool
+        faces (frozenset[int]): faces, started from 1
+
+    Returns:
+        np.ndarray: read-only array of probabilities, indexed by count
+    """
+    result = np.ones(1)
+    for probs, count in pool:
+        p = sum(probs[face - 1] for face in faces if 0 < face <= len(probs))
+        result = _convolve(result, _power(np.array([1.0 - p, p]), count))
+    return _frozen(result)
+
+
+def at_least(distribution: np.ndarray, value: int) -> float:
+    """Get probability of result greater or equal to value
+
+    Args:
+        distribution (np.ndarray): distribution of result
+        value (int): min result
+
+    Returns:
+        float: probability
+    """
+    return float(distribution[max(value, 0):].sum())
+
+
+def at_most(distribution: np.ndarray, value: int) -> float:
+    """Get probability of result less or equal to value
+
+    Args:
+        distribution (np.ndarray): distribution of result
+        value (int): max result
+
+    Returns:
+        float: probability
+    """
+    if value < 0:
+        return 0.0
+    return float(distribution[:value + 1].sum())
+
+
+@lru_cache(maxsize=1024)
+def binomials(n: int) -> tuple[int, ...]:
+    """Get row of binomial coefficients
+
+    Args:
+        n (int): size of set
+
+    Returns:
+        tuple[int, ...]: counts of combinations of k from n,
+                         indexed by k
+    """
+    row = [1]
+    for k in range(max(n, 0)):
+        row.append(row[-1] * (n - k) // (k + 1))
+    return tuple(row)
+
+
+@lru_cache(maxsize=4096)
+def hypergeometric(population: int, successes: int, draws: int) -> np.ndarray:
+    """Get distribution of count of successes in draws
+    without replacement
+
+    Args:
+        population (int): count of cards
+        successes (int): count of searched cards
+        draws (int): count of drawn cards
+
+    Returns:
+        np.ndarray: read-only array of probabilities, indexed by count
+    """
+    draws = min(draws, population)
+    found = binomials(successes)
+    others = binomials(population - successes)
+    total = comb(population, draws)
+    return _frozen(np.array([
+        found[k] * others[draws - k] / total
+        if draws - k < len(others) else 0.0
+        for k in range(min(draws, successes) + 1)
+            ]))
+
+
+@lru_cache(maxsize=4096)
+def _at_least_all(
+    population: int,
+    wanted: tuple[tuple[int, int], ...],
+    draws: int
+        ) -> float:
+    """Get probability of multivariate hypergeometric draw of
+    at least wanted count of each searched card
+
+    Args:
+        population (int): count of cards
+        wanted (tuple[tuple[int, int], ...]): count of cards and
+                                              wanted count by
+                                              searched cards
+        draws (int): count of drawn cards
+
+    Returns:
+        float: probability
+    """
+    draws = min(draws, population)
+    ways = list(binomials(population - sum(c for c, _ in wanted)))[:draws + 1]
+    for count, need in wanted:
+        row = binomials(count)
+        result = [0] * (draws + 1)
+        for k in range(need, min(count, draws) + 1):
+            for j, w in enumerate(ways[:draws + 1 - k]):
+                result[j + k] += row[k] * w
+        ways = result
+    if len(ways) <= draws:
+        return 0.0
+    return ways[draws] / comb(population, draws)
+
+
+class CardCounter:
+    """Counter of cards, remaining in deck, with exact draw odds
+
+    .. code-block::
+        :caption: Example:
+
+            deck.remaining.at_least('dragon', draws=5)
+            counter = CardCounter(deck.remaining.counts)
+            counter.seen('dragon')
+            counter.expected('dragon', draws=5)
+
+    ..
+        Draws are without replacement from remaining cards in random
+        order, so count of drawn copies is hypergeometric. Queries
+        are answered from cached binomial tables, counts are updated
+        by seen and add without recount of deck. Deck keeps its own
+        counter up to date, so copy it to count seen cards.
+
+        Attr:
+
+            counts (Counter[str]): remaining cards by ids
+    """
+
+    def __init__(self, counts: Mapping[str, int]) -> None:
+        self.counts: Counter[str] = Counter(
+            {id: count for id, count in counts.items() if count > 0}
+                )
+        self._total = sum(self.counts.values())
+
+    def __len__(self) -> int:
+        return self._total
+
+    def seen(self, id: str, count: int = 1) -> None:
+        """Remove seen cards from remaining
+
+        Args:
+            id (str): card id
+            count (int, optional): count of cards. Default to 1.
+
+        Raises:
+            ValueError: count is greater than remaining cards
+        """
+        if count > self.counts[id]:
+            raise ValueError(f'Only {self.counts[id]} cards {id} remain')
+        self.counts[id] -= count
+        if not self.counts[id]:
+            del self.counts[id]
+        self._total -= count
+
+    def add(self, id: str, count: int = 1) -> None:
+        """Add cards to remaining
+
+        Args:
+            id (str): card id
+            count (int, optional): count of cards. Default to 1.
+        """
+        self.counts[id] += count
+        self._total += count
+
+    def distribution(self, id: str, draws: int) -> np.ndarray:
+        """Get distribution of count of drawn cards
+
+        Args:
+            id (str): card id
+            draws (int): count of drawn cards
+
+        Returns:
+            np.ndarray: read-only array of probabilities, indexed
+                        by count
+        """
+        return hypergeometric(self._total, self.counts[id], draws)
+
+    def at_least(self, id: str, draws: int, count: int = 1) -> float:
+        """Get probability to draw at least count of cards
+
+        Args:
+            id (str): card id
+            draws (int): count of drawn cards
+            count (int, optional): min count of cards. Default to 1.
+
+        Returns:
+            float: probability
+        """
+        return at_least(self.distribution(id, draws), count)
+
+    def at_least_all(self, wanted: Mapping[str, int], draws: int) -> float:
+        """Get probability to draw at least wanted count
+        of each card
+
+        Args:
+            wanted (Mapping[str, int]): min counts by card ids
+            draws (int): count of drawn cards
+
+        Returns:
+            float: probability
+        """
+        key = tuple(sorted(
+            (self.counts[id], need) for id, need in wanted.items()
+            if need > 0
+                ))
+        return _at_least_all(self._total, key, draws)
+
+    def expected(self, id: str, draws: Optional[int] = None) -> float:
+        """Get expected count of cards in drawn cards
+
+        Args:
+            id (str): card id
+            draws (int, optional): count of drawn cards. Default to
+                                   None - all remaining cards.
+
+        Returns:
+            float: expected count
+        """
+        if draws is None or draws >= self._total:
+            return float(self.counts[id])
+        return draws * self.counts[id] / self._total
@@ -0,0 +1,151 @@
+"""Random generators, that can be used by games
+"""
+import random
+import hashlib
+import numpy as np
+from random import SystemRandom
+from typing import Any, Union
+
+
+__all__ = ['NumpyRandom', 'SystemRandom']
+
+
+Seed = Union[None, int, float, str, bytes, bytearray, np.random.SeedSequence]
+
+
+class NumpyRandom(random.Random):
+    """Python random generator, backed by numpy bit generator
+
+    .. code-block::
+        :caption: Example:
+
+            game = Game(id='game', rng=NumpyRandom(42))
+            bots = NumpyRandom(42, bit_generator=np.random.Philox).spawn(8)
+
+    ..
+        All methods of random.Random, like shuffle, choices and
+        randrange, are available and use numpy generator. Numbers are
+        generated by blocks, so cost of one number is low. Independent
+        substreams are spawned by seed sequence without generation
+        of numbers. For secure shuffles use SystemRandom, that takes
+        random bytes from os.
+
+        Attr:
+
+            generator (np.random.Generator): numpy generator
+
+            block (int): count of numbers, generated at once.
+                         Default to 1024.
+    """
+    block = 1024
+
+    def __init__(
+        self,
+        x: Seed = None,
+        bit_generator: type = np.random.PCG64
+            ) -> None:
+        self._bit_generator = bit_generator
+        super().__init__(x)
+
+    def seed(self, a: Seed = None, version: int = 2) -> None:  # type: ignore
+        """Seed generator
+
+        Args:
+            a (Seed, optional): seed. Default to None - seed is taken
+                                from os entropy.
+            version (int): isn't used. Default to 2.
+        """
+        if isinstance(a, np.random.SeedSequence):
+            sequence = a
+        elif a is None or isinstance(a, int):
+            sequence = np.random.SeedSequence(None if a is None else abs(a))
+        else:
+            if isinstance(a, str):
+                a = a.encode()
+            elif isinstance(a, float):
+                a = repr(a).encode()
+            sequence = np.random.SeedSequence(
+                int.from_bytes(hashlib.sha512(a).digest(), 'big')
+                    )
+        self._sequence = sequence
+        self.generator = np.random.Generator(self._bit_generator(sequence))
+        self._floats: list[float] = []
+        self._words: list[int] = []
+        self.gauss_next = None
+
+    def random(self) -> float:
+        """Get random float in [0.0, 1.0)
+
+        Returns:
+            float
+        """
+        if not self._floats:
+            self._floats = self.generator.random(self.block).tolist()
+            self._floats.reverse()
+        return self._floats.pop()
+
+    def _word(self) -> int:
+        if not self._words:
+            self._words = self.generator.integers(
+                0, 1 << 32, size=self.block, dtype=np.uint32
+                    ).tolist()
+        return self._words.pop()
+
+    def getrandbits(self, k: int) -> int:
+        """Get integer with k random bits
+
+        Args:
+            k (int): count of bits
+
+        Returns:
+            int
+        """
+        if k < 0:
+            raise ValueError('number of bits must be non-negative')
+        if k <= 32:
+            return self._word() >> (32 - k) if k else 0
+        result = 0
+        for _ in range((k + 31) // 32):
+            result = (result << 32) | self._word()
+        return result >> (-k % 32)
+
+    def getstate(self) -> tuple[Any, ...]:
+        """Get state of generator
+
+        Returns:
+            tuple[Any, ...]: state
+        """
+        return (
+            self.generator.bit_generator.state,
+            tuple(self._floats),
+            tuple(self._words),
+            self.gauss_next,
+                )
+
+    def setstate(self, state: tuple[Any, ...]) -> None:
+        """Restore state of generator
+
+        Args:
+            state (tuple[Any, ...]): state, got by getstate
+        """
+        bit_state, floats, words, self.gauss_next = state
+        self.generator.bit_generator.state = bit_state
+        self._floats = list(floats)
+        self._words = list(words)
+
+    def spawn(self, n: int) -> list['NumpyRandom']:
+        """Get independent substreams of generator
+
+        Args:
+            n (int): count of substreams
+
+        Returns:
+            list[NumpyRandom]: generators
+        """
+        return [
+            self.__class__(sequence, self._bit_generator)
+            for sequence in self._sequence.spawn(n)
+                ]
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return self.__class__, (0, self._bit_generator), self.getstate()
@@ -0,0 +1,492 @@
+"""Snapshots of game with structural sharing
+"""
+import operator
+import numpy as np
+from collections import deque
+from typing import Any, NamedTuple, Optional, Iterable
+from bgameb.base import Base, BaseItem
+from bgameb.stores import CardCodes, RollBuffer
+
+
+class Frame:
+    """Saved fields of stuff
+
+    ..
+        Frames are equal only if it is the same frame, so tuples
+        of frames are compared by identity of frames.
+
+        Attr:
+
+            stuff (Base): saved stuff
+
+            values (dict[str, Any]): saved values of fields. Nested
+                                     stuff is saved as Frame, mutable
+                                     containers as Copy.
+
+            state (Any): private state of stuff, got by _save_state.
+                         States are compared by equality.
+                         Default to None.
+    """
+    __slots__ = ('stuff', 'values', 'state')
+
+    def __init__(
+        self,
+        stuff: Base,
+        values: dict[str, Any],
+        state: Any = None
+            ) -> None:
+        self.stuff = stuff
+        self.values = values
+        self.state = state
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.stuff.__class__.__name__}' \
+            + f'(id={self.stuff.id!r}))'
+
+
+class Copy:
+    """Saved content of mutable container
+
+    ..
+        Attr:
+
+            container (Any): saved container. Content is restored
+                             to it in place.
+
+            kind (int): kind of container
+
+            content (Any): saved content: tuple of saved values
+                           for lists and deques, dict of saved values
+                           for dicts, frozenset for sets, array
+                           for arrays, card codes and roll buffers
+                           and file for memory-mapped card codes
+
+            items (bool): content is a tuple of frames of items.
+                          Default to False.
+    """
+    __slots__ = ('container', 'kind', 'content', 'items')
+
+    def __init__(
+        self,
+        container: Any,
+        kind: int,
+        content: Any,
+        items: bool = False
+            ) -> None:
+        self.container = container
+        self.kind = kind
+        self.content = content
+        self.items = items
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}' \
+            + f'({self.container.__class__.__name__})'
+
+
+Frames = dict[int, Frame]
+
+
+class Snapshot(NamedTuple):
+    """Snapshot of game
+
+    ..
+        Attr:
+
+            frame (Frame): saved fields of game
+
+            random_state (tuple[Any, ...], optional): state of random
+                                                      generator of game
+
+            frames (Frames): frames of stuff, that isn't item,
+                             by ids of stuff
+    """
+    frame: Frame
+    random_state: Optional[tuple[Any, ...]]
+    frames: Frames
+
+
+# Values of these types are immutable and are saved as is
+_VALUES = frozenset({int, float, bool, str, bytes, type(None)})
+
+# Kinds of values by types. Types are checked once,
+# because isinstance check of pydantic models is slow.
+ITEM, STUFF, SEQUENCE, MAPPING, SET, ARRAY, CODES, BUFFER, VALUE = range(9)
+_BASES: tuple[tuple[int, type], ...] = (
+    (ITEM, BaseItem),
+    (STUFF, Base),
+    (SEQUENCE, list),
+    (SEQUENCE, deque),
+    (MAPPING, dict),
+    (SET, set),
+    (ARRAY, np.ndarray),
+    (CODES, CardCodes),
+    (BUFFER, RollBuffer),
+        )
+_kinds: dict[type, int] = {}
+
+
+def _kind(cls: type) -> int:
+    """Get kind of values of type
+
+    Args:
+        cls (type): type of value
+
+    Returns:
+        int: kind
+    """
+    try:
+        return _kinds[cls]
+    except KeyError:
+        kind = next(
+            (kind for kind, base in _BASES if issubclass(cls, base)), VALUE
+                )
+        _kinds[cls] = kind
+        return kind
+
+
+def _item_frame(item: BaseItem) -> Frame:
+    """Get frame of item. Frame is kept by item and reused
+    until any field of item is changed.
+
+    Args:
+        item (BaseItem): an item object
+
+    Returns:
+        Frame
+    """
+    frame = item._frame
+    if frame is None:
+        frame = Frame(item, item.__dict__.copy())
+        object.__setattr__(item, '_frame', frame)
+    return frame
+
+
+def _capture_all(
+    values: Iterable[Any],
+    previous: Frames,
+    frames: Frames
+        ) -> tuple[tuple[Any, ...], bool]:
+    """Save values of container
+
+    Args:
+        values (Iterable[Any]): values of container
+        previous (Frames): frames of previous snapshot by ids of stuff
+        frames (Frames): frames of this snapshot by ids of stuff
+
+    Returns:
+        tuple[tuple[Any, ...], bool]: saved values and are all
+                                      values items
+    """
+    first = next(iter(values), None)
+    if first is not None and _kind(type(first)) == ITEM:
+        try:
+            return tuple([
+                item._frame or _item_frame(item) for item in values
+                    ]), True
+        except AttributeError:
+            pass
+    return tuple([
+        capture(value, previous, frames) for value in values
+            ]), False
+
+
+def capture(value: Any, previous: Frames, frames: Frames) -> Any:
+    """Save value. Items are saved as its kept frames, other stuff
+    is saved as new frame, that is replaced by frame of previous
+    snapshot, if nothing is changed. Mutable containers are copied,
+    other values are saved as is.
+
+    Args:
+        value (Any): value
+        previous (Frames): frames of previous snapshot by ids of stuff
+        frames (Frames): frames of this snapshot by ids of stuff
+
+    Returns:
+        Any: saved value
+    """
+    cls = type(value)
+    if cls in _VALUES:
+        return value
+    kind = _kind(cls)
+    if kind == ITEM:
+        return _item_frame(value)
+    if kind == STUFF:
+        return _capture_stuff(value, previous, frames)
+    if kind == SEQUENCE:
+        return Copy(value, kind, *_capture_all(value, previous, frames))
+    if kind == MAPPING:
+        content, items = _capture_all(value.values(), previous, frames)
+        return Copy(value, kind, dict(zip(value, content)), items)
+    if kind == SET:
+        return Copy(value, kind, frozenset(value))
+    if kind == ARRAY:
+        return Copy(value, kind, value.copy())
+    if kind == CODES:
+        return Copy(value, kind, value.save())
+    if kind == BUFFER:
+        return Copy(value, kind, value.data.copy())
+    return value
+
+
+def _capture_stuff(stuff: Base, previous: Frames, frames: Frames) -> Frame:
+    """Save fields of stuff. Frame of previous snapshot is reused,
+    if nothing is changed.
+
+    Args:
+        stuff (Base): stuff
+        previous (Frames): frames of previous snapshot by ids of stuff
+        frames (Frames): frames of this snapshot by ids of stuff
+
+    Returns:
+        Frame
+    """
+    values = {
+        name: capture(value, previous, frames)
+        for name, value in stuff.__dict__.items()
+            }
+    state = stuff._save_state()
+    frame = previous.get(id(stuff))
+    if frame is None or frame.stuff is not stuff \
+            or state != frame.state \
+            or not _same_values(values, frame.values):
+        frame = Frame(stuff, values, state)
+    frames[id(stuff)] = frame
+    return frame
+
+
+def _same_values(values: dict[str, Any], old: dict[str, Any]) -> bool:
+    """Check that saved values are equal to previous ones.
+    Equal copies of containers are replaced by previous ones,
+    so its content is shared.
+
+    Args:
+        values (dict[str, Any]): saved values
+        old (dict[str, Any]): previous saved values
+
+    Returns:
+        bool: values are equal
+    """
+    if values.keys() != old.keys():
+        return False
+    same = True
+    for name, value in values.items():
+        prev = old[name]
+        if value is prev:
+            continue
+        if _same(value, prev):
+            values[name] = prev
+        else:
+            same = False
+    return same
+
+
+def _same(value: Any, old: Any) -> bool:
+    """Check that saved value is equal to previous one
+
+    Args:
+        value (Any): saved value
+        old (Any): previous saved value
+
+    Returns:
+        bool: values are equal
+    """
+    if value is old:
+        return True
+    if not isinstance(value, Copy) or not isinstance(old, Copy) \
+            or value.container is not old.container \
+            or value.items != old.items:
+        return False
+    content, prev = value.content, old.content
+    if content is prev:
+        return True
+    if value.kind in (ARRAY, CODES, BUFFER):
+        if not isinstance(content, np.ndarray):
+            return False
+        return bool(
+            content.dtype == prev.dtype and np.array_equal(content, prev)
+                )
+    if value.kind == SET or value.items:
+        return bool(content == prev)
+    if len(content) != len(prev):
+        return False
+    if value.kind == MAPPING:
+        return content.keys() == prev.keys() \
+            and all(_same(content[key], prev[key]) for key in content)
+    return all(map(_same, content, prev))
+
+
+def _kept(items: Iterable[Any], frames: tuple[Frame, ...]) -> bool:
+    """Check that items are the same and aren't changed
+    since frames are saved
+
+    Args:
+        items (Iterable[Any]): items
+        frames (tuple[Frame, ...]): frames of items
+
+    Returns:
+        bool: items are kept
+    """
+    try:
+        return tuple([item._frame for item in items]) == frames
+    except AttributeError:
+        return False
+
+
+def _restore_items(frames: Iterable[Frame]) -> list[Any]:
+    """Restore items from its frames. Only changed items
+    are restored.
+
+    Args:
+        frames (Iterable[Frame]): frames of items
+
+    Returns:
+        list[Any]: items
+    """
+    return [
+        frame.stuff if frame.stuff._frame is frame  # type: ignore
+        else _restore_item(frame) for frame in frames
+            ]
+
+
+def _restore_item(frame: Frame) -> BaseItem:
+    """Restore fields of item from frame
+
+    Args:
+        frame (Frame): frame of item
+
+    Returns:
+        BaseItem: an item object
+    """
+    item: BaseItem = frame.stuff  # type: ignore[assignment]
+    item.__dict__.update(frame.values)
+    object.__setattr__(item, '_frame', frame)
+    item._load_state(None)
+    return item
+
+
+def restore(saved: Any) -> tuple[Any, bool]:
+    """Restore value. Stuff is restored from its frame and containers
+    are restored in place, only changed values are written.
+
+    Args:
+        saved (Any): saved value
+
+    Returns:
+        tuple[Any, bool]: value and is it changed by restore
+    """
+    if isinstance(saved, Frame):
+        stuff = saved.stuff
+        if _kind(type(stuff)) != ITEM:
+            return stuff, _restore_stuff(saved)
+        if stuff._frame is saved:  # type: ignore[attr-defined]
+            return stuff, False
+        return _restore_item(saved), True
+    if isinstance(saved, Copy):
+        return saved.container, _restore_copy(saved)
+    return saved, False
+
+
+def _restore_stuff(frame: Frame) -> bool:
+    """Restore fields of stuff from frame. Private state
+    of stuff is restored, if any field is changed.
+
+    Args:
+        frame (Frame): frame of stuff
+
+    Returns:
+        bool: is stuff changed by restore
+    """
+    stuff = frame.stuff
+    fields = stuff.__dict__
+    changed = False
+    for name, saved in frame.values.items():
+        value, written = restore(saved)
+        if fields.get(name) is not value:
+            fields[name] = value
+            written = True
+        changed |= written
+    if changed or frame.state is not None:
+        stuff._load_state(frame.state)
+    return changed
+
+
+def _restore_copy(saved: Copy) -> bool:
+    """Restore content of container in place
+
+    Args:
+        saved (Copy): saved container
+
+    Returns:
+        bool: is container changed by restore
+    """
+    container, content = saved.container, saved.content
+    if saved.kind == SEQUENCE:
+        return _restore_sequence(saved)
+    if saved.kind == MAPPING:
+        return _restore_mapping(saved)
+    if saved.kind == SET:
+        if container == content:
+            return False
+        container.clear()
+        container.update(content)
+    elif saved.kind == CODES:
+        return bool(container.load(content))
+    elif saved.kind == BUFFER:
+        container.data[:] = content
+    elif np.array_equal(container, content):
+        return False
+    else:
+        container[...] = content
+    return True
+
+
+def _restore_sequence(saved: Copy) -> bool:
+    """Restore content of list or deque in place
+
+    Args:
+        saved (Copy): saved list or deque
+
+    Returns:
+        bool: is container changed by restore
+    """
+    container, content = saved.container, saved.content
+    if saved.items:
+        if _kept(container, content):
+            return False
+        values = _restore_items(content)
+    else:
+        values = [restore(value)[0] for value in content]
+    if len(container) == len(values) \
+            and all(map(operator.is_, container, values)):
+        return False
+    container.clear()
+    container.extend(values)
+    return True
+
+
+def _restore_mapping(saved: Copy) -> bool:
+    """Restore content of dict in place
+
+    Args:
+        saved (Copy): saved dict
+
+    Returns:
+        bool: is dict changed by restore
+    """
+    container, content = saved.container, saved.content
+    if saved.items:
+        if container.keys() == content.keys() \
+                and _kept(container.values(), tuple(content.values())):
+            return False
+        values = dict(zip(content, _restore_items(content.values())))
+    else:
+        values = {
+            key: restore(value)[0] for key, value in content.items()
+                }
+    if container.keys() == values.keys() and all(
+        container[key] is value for key, value in values.items()
+            ):
+        return False
+    container.clear()
+    container.update(values)
+    return True
@@ -0,0 +1,267 @@
+"""Optimal reroll decisions for dices of shaker
+"""
+import json
+from math import factorial, prod
+from collections import Counter
+from itertools import combinations_with_replacement, product
+from typing import Callable, Optional, Iterator
+from bgameb.items import Dice
+from bgameb.tools import Shaker
+
+
+# State of shaker is a sorted tuple of results for each dice of shaker
+State = tuple[tuple[int, ...], ...]
+Score = Callable[[dict[str, tuple[int, ...]]], float]
+
+
+class RerollSolver:
+    """Solver of optimal keep decisions for dices of shaker
+
+    .. code-block::
+        :caption: Example:
+
+            solver = RerollSolver(shaker, lambda rolls: sum(rolls['dice']))
+            keep, ev = solver.best(shaker.roll(), rerolls=2)
+            solver.save('yahtzee.json')
+
+    ..
+        Expected value of state is found by dynamic programming over
+        canonical states: results of each dice of shaker are sorted,
+        so permutations of results are the same state. Values and
+        keep decisions are memoized in table, so after first
+        solution decision is a lookup. Table can be saved to json
+        file and reloaded for the same shaker and score function.
+        Results of dices with modifiers aren't modeled, so the
+        StuffDefineError is raised for shaker with such dices.
+
+        Attr:
+
+            ids (list[str]): ids of dices of shaker
+
+            score (Callable): score function, that gets sorted results
+                              by dice ids
+
+            table (dict): memoized expected values and keep decisions
+                          by state and count of rerolls
+    """
+
+    def __init__(
+        self,
+        shaker: Shaker,
+        score: Score,
+        path: Optional[str] = None,
+            ) -> None:
+        dices: list[Dice] = shaker.current  # type: ignore
+        self.ids = [item.id for item in dices]
+        self.score = score
+        self._dices = [
+            (item.count, tuple(item._probs().tolist())) for item in dices
+                ]
+        self._outcomes: dict[tuple[int, int], list[tuple[tuple, float]]] = {}
+        self._expected: dict[tuple[State, int], float] = {}
+        self.table: dict[tuple[State, int], tuple[float, State]] = {}
+        if path is not None:
+            self.load(path)
+
+    def _state(self, rolls: dict[str, list[int]]) -> State:
+        """Get canonical state from results of roll
+
+        Args:
+            rolls (dict[str, list[int]]): results by dice ids
+
+        Returns:
+            State: sorted results of dices
+        """
+        state = tuple(tuple(sorted(rolls[id])) for id in self.ids)
+        for values, (count, _) in zip(state, self._dices):
+            if len(values) != count:
+                raise ValueError('Results must be given for all dices')
+        return state
+
+    def _rolls(self, state: State) -> dict[str, tuple[int, ...]]:
+        """Get results of state by dice ids
+
+        Args:
+            state (State): sorted results of dices
+
+        Returns:
+            dict[str, tuple[int, ...]]: sorted results by dice ids
+        """
+        return dict(zip(self.ids, state))
+
+    def _dice_outcomes(
+        self,
+        ind: int,
+        count: int
+            ) -> list[tuple[tuple, float]]:
+        """Get sorted results of count of dices and its probabilities
+
+        Args:
+            ind (int): index of dice
+            count (int): count of rolled dices
+
+        Returns:
+            list[tuple[tuple, float]]: results and probabilities
+        """
+        key = ind, count
+        if key not in self._outcomes:
+            probs = self._dices[ind][1]
+            outcomes = []
+            for values in combinations_with_replacement(
+                range(1, len(probs) + 1), count
+                    ):
+                counts = Counter(values).values()
+                p = factorial(count) / prod(factorial(c) for c in counts) \
+                    * prod(probs[v - 1] for v in values)
+                if p > 0:
+                    outcomes.append((values, p))
+            self._outcomes[key] = outcomes
+        return self._outcomes[key]
+
+    @staticmethod
+    def _keeps(values: tuple[int, ...]) -> Iterator[tuple[int, ...]]:
+        """Get distinct sorted subsets of results
+
+        Args:
+            values (tuple[int, ...]): sorted results
+
+        Yields:
+            tuple[int, ...]: kept results
+        """
+        counts = sorted(Counter(values).items())
+        for taken in product(*(range(c + 1) for _, c in counts)):
+            yield tuple(
+                v for (v, _), t in zip(counts, taken) for _ in range(t)
+                    )
+
+    def _expect(self, kept: State, rerolls: int) -> float:
+        """Get expected value of kept results, when other dices
+        are rerolled
+
+        Args:
+            kept (State): kept results
+            rerolls (int): count of rerolls left after this roll
+
+        Returns:
+            float: expected value
+        """
+        key = kept, rerolls
+        if key not in self._expected:
+            outcomes = [
+                self._dice_outcomes(ind, count - len(values))
+                for ind, (values, (count, _))
+                in enumerate(zip(kept, self._dices))
+                    ]
+            ev = 0.0
+            for combo in product(*outcomes):
+                p = prod(pr for _, pr in combo)
+                state = tuple(
+                    tuple(sorted(values + rolled))
+                    for values, (rolled, _) in zip(kept, combo)
+                        )
+                ev += p * self._value(state, rerolls)[0]
+            self._expected[key] = ev
+        return self._expected[key]
+
+    def _value(self, state: State, rerolls: int) -> tuple[float, State]:
+        """Get expected value of state and best kept results
+
+        Args:
+            state (State): sorted results of dices
+            rerolls (int): count of rerolls left
+
+        Returns:
+            tuple[float, State]: expected value and kept results
+        """
+        key = state, rerolls
+        if key not in self.table:
+            if rerolls <= 0:
+                self.table[key] = \
+                    float(self.score(self._rolls(state))), state
+            else:
+                best = None
+                for kept in product(*(self._keeps(v) for v in state)):
+                    ev = self._expect(kept, rerolls - 1) \
+                        if kept != state else self._value(state, 0)[0]
+                    if best is None or ev > best[0]:
+                        best = ev, kept
+                self.table[key] = best  # type: ignore[assignment]
+        return self.table[key]
+
+    def best(
+        self,
+        rolls: dict[str, list[int]],
+        rerolls: int
+            ) -> tuple[dict[str, tuple[int, ...]], float]:
+        """Get optimal kept results and expected value
+
+        Args:
+            rolls (dict[str, list[int]]): results of roll by dice ids,
+                                          like Shaker.last_roll
+            rerolls (int): count of rerolls left
+
+        Returns:
+            tuple[dict[str, tuple[int, ...]], float]: kept results
+                by dice ids and expected value
+        """
+        ev, kept = self._value(self._state(rolls), rerolls)
+        return self._rolls(kept), ev
+
+    def value(self, rolls: dict[str, list[int]], rerolls: int) -> float:
+        """Get expected value of results with optimal play
+
+        Args:
+            rolls (dict[str, list[int]]): results of roll by dice ids
+            rerolls (int): count of rerolls left
+
+        Returns:
+            float: expected value
+        """
+        return self._value(self._state(rolls), rerolls)[0]
+
+    def expected(self, rerolls: int) -> float:
+        """Get expected value of the first roll of all dices
+        with optimal play. All states are solved.
+
+        Args:
+            rerolls (int): count of rerolls after the first roll
+
+        Returns:
+            float: expected value
+        """
+        return self._expect(tuple(() for _ in self._dices), rerolls)
+
+    def save(self, path: str) -> None:
+        """Save memoized table to json file
+
+        Args:
+            path (str): path to file
+        """
+        with open(path, 'w') as f:
+            json.dump({
+                'dices': self._dices,
+                'table': [
+                    [state, rerolls, ev, kept] for (state, rerolls), (ev, kept)
+                    in self.table.items()
+                        ],
+                    }, f)
+
+    def load(self, path: str) -> None:
+        """Load memoized table from json file, saved for the same
+        dices and score function
+
+        Args:
+            path (str): path to file
+
+        Raises:
+            ValueError: table is saved for other dices
+        """
+        with open(path) as f:
+            data = json.load(f)
+        if [(count, tuple(probs)) for count, probs in data['dices']] \
+                != self._dices:
+            raise ValueError('Table is saved for other dices')
+        for state, rerolls, ev, kept in data['table']:
+            self.table[
+                tuple(tuple(v) for v in state), rerolls
+                    ] = ev, tuple(tuple(v) for v in kept)
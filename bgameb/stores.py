@@ -0,0 +1,1221 @@
+"""Compact array-backed stores, used by tools for batch operations
+"""
+import os
+import mmap
+import tempfile
+import weakref
+import numpy as np
+from copy import deepcopy
+from collections import Counter, deque
+from collections.abc import Mapping
+from typing import (
+    Optional,
+    Any,
+    Iterable,
+    Iterator,
+    Union,
+    Callable,
+    Generator,
+    TypeVar,
+    TYPE_CHECKING,
+        )
+from pydantic import BaseModel
+from bgameb.odds import CardCounter
+if TYPE_CHECKING:
+    from bgameb.items import Card, Dice
+
+
+class CardStates:
+    """Slot-indexed store of card flags.
+
+    ..
+        Every card bound to store gets a slot. Flags of cards are kept
+        in numpy arrays, so batch operations over many cards are
+        vectorized. Only cards with really changed flags are written
+        back, that keeps per-card reads consistent with the store.
+
+        Attr:
+
+            fields (tuple[str]): card fields, mirrored by store
+
+            revealed (np.ndarray): is_revealed flags by slot
+
+            active (np.ndarray): is_active flags by slot
+
+            side (np.ndarray): codes of sides by slot. Code 0 is None.
+
+            used (np.ndarray): is slot bound to a card
+
+            hidden (CardCounter): counts of bound not revealed cards
+                                  by ids. Is updated by binding,
+                                  release and change of is_revealed.
+    """
+    fields = ('is_revealed', 'is_active', 'side')
+
+    def __init__(self) -> None:
+        self.revealed = np.zeros(0, dtype=np.bool_)
+        self.active = np.zeros(0, dtype=np.bool_)
+        self.side = np.zeros(0, dtype=np.int16)
+        self.used = np.zeros(0, dtype=np.bool_)
+        self.cards: list[Optional['Card']] = []
+        self.sides: list[Optional[str]] = [None]
+        self._codes: dict[Optional[str], int] = {None: 0}
+        self._free: list[int] = []
+        self.hidden = CardCounter({})
+
+    def __len__(self) -> int:
+        return len(self.cards) - len(self._free)
+
+    def code(self, side: Optional[str]) -> int:
+        """Get integer code of side
+
+        Args:
+            side (str, optional): side of tap
+
+        Returns:
+            int: code of side
+        """
+        try:
+            return self._codes[side]
+        except KeyError:
+            code = len(self.sides)
+            self.sides.append(side)
+            self._codes[side] = code
+            return code
+
+    def _grow(self) -> None:
+        """Double capacity of arrays
+        """
+        size = max(8, 2 * len(self.used))
+        for name in ('revealed', 'active', 'side', 'used'):
+            arr = getattr(self, name)
+            new = np.zeros(size, dtype=arr.dtype)
+            new[:len(arr)] = arr
+            setattr(self, name, new)
+
+    def bind(self, card: 'Card') -> int:
+        """Bind card to free slot of store
+
+        Args:
+            card (Card): a card object
+
+        Returns:
+            int: slot of card
+        """
+        if self._free:
+            slot = self._free.pop()
+            self.cards[slot] = card
+        else:
+            slot = len(self.cards)
+            if slot == len(self.used):
+                self._grow()
+            self.cards.append(card)
+        self.revealed[slot] = card.is_revealed
+        self.active[slot] = card.is_active
+        self.side[slot] = self.code(card.side)
+        self.used[slot] = True
+        if not card.is_revealed:
+            self.hidden.add(card.id)
+        card._states = self
+        card._slot = slot
+        return slot
+
+    def release(self, card: 'Card') -> None:
+        """Release slot of card
+
+        Args:
+            card (Card): a card object
+        """
+        if card._states is not self:
+            return
+        slot = card._slot
+        if not self.revealed[slot]:
+            self.hidden.seen(card.id)
+        self.cards[slot] = None
+        self.used[slot] = False
+        self._free.append(slot)
+        card._states = None
+        card._slot = -1
+
+    def clear(self) -> None:
+        """Release all slots
+        """
+        for card in self.cards:
+            if card is not None:
+                card._states = None
+                card._slot = -1
+        self.__init__()  # type: ignore[misc]
+
+    def set(self, slot: int, name: str, value: Any) -> None:
+        """Set value of single card field
+
+        Args:
+            slot (int): slot of card
+            name (str): field name
+            value (Any): field value
+        """
+        if name == 'is_revealed':
+            if value != self.revealed[slot]:
+                card = self.cards[slot]
+                if card is not None:
+                    if value:
+                        self.hidden.seen(card.id)
+                    else:
+                        self.hidden.add(card.id)
+            self.revealed[slot] = value
+        elif name == 'is_active':
+            self.active[slot] = value
+        elif name == 'side':
+            self.side[slot] = self.code(value)
+
+    def slots(self, cards: Iterable['Card'], count: int = -1) -> np.ndarray:
+        """Get slots of cards. Unbound cards are bound.
+
+        Args:
+            cards (Iterable[Card]): card objects
+            count (int): count of cards, if known. Default to -1.
+
+        Returns:
+            np.ndarray: slots of cards
+        """
+        return np.fromiter(
+            (
+                card._slot if card._states is self else self.bind(card)
+                for card in cards
+                    ),
+            dtype=np.intp,
+            count=count
+                )
+
+    def sync(self, cards: Iterable['Card']) -> None:
+        """Bind cards and release slots of all other cards.
+        Is used after cards are replaced without release.
+
+        Args:
+            cards (Iterable[Card]): card objects
+        """
+        current = list(cards)
+        kept = [card._slot for card in current if card._states is self]
+        if len(kept) != len(self):
+            stale: np.ndarray = self.used.copy()
+            stale[kept] = False
+            for slot in np.flatnonzero(stale).tolist():
+                card = self.cards[slot]
+                if card is not None and not self.revealed[slot]:
+                    self.hidden.seen(card.id)
+                if card is not None and card._states is self \
+                        and card._slot == slot:
+                    card._states = None
+                    card._slot = -1
+                self.cards[slot] = None
+                self.used[slot] = False
+                self._free.append(slot)
+        if len(kept) != len(current):
+            for card in current:
+                if card._states is not self:
+                    self.bind(card)
+
+    def all(self) -> np.ndarray:
+        """Get all used slots
+
+        Returns:
+            np.ndarray: slots
+        """
+        return np.flatnonzero(self.used)
+
+    def _write(self, slots: np.ndarray, name: str, value: Any) -> None:
+        """Write value of field to cards of given slots, bypassing
+        validation on assignment.
+
+        Args:
+            slots (np.ndarray): slots of cards
+            name (str): field name
+            value (Any): field value
+        """
+        cards = self.cards
+        for slot in slots.tolist():
+            card = cards[slot]
+            card.__dict__[name] = value
+            card.__fields_set__.add(name)
+            object.__setattr__(card, '_frame', None)
+
+    def reveal(self, slots: np.ndarray, value: bool = True) -> int:
+        """Set is_revealed flag of cards
+
+        Args:
+            slots (np.ndarray): slots of cards
+            value (bool): flag value. Default to True.
+
+        Returns:
+            int: count of changed cards
+        """
+        changed = slots[self.revealed[slots] != value]
+        self.revealed[changed] = value
+        self._count(changed, value)
+        self._write(changed, 'is_revealed', value)
+        return len(changed)
+
+    def _count(self, slots: np.ndarray, revealed: bool) -> None:
+        """Update counts of not revealed cards by change
+        of is_revealed flag
+
+        Args:
+            slots (np.ndarray): slots of changed cards
+            revealed (bool): new flag value
+        """
+        cards, hidden = self.cards, self.hidden
+        for slot in slots.tolist():
+            card = cards[slot]
+            if revealed:
+                hidden.seen(card.id)
+            else:
+                hidden.add(card.id)
+
+    def flip(self, slots: np.ndarray) -> int:
+        """Invert is_revealed flag of cards
+
+        Args:
+            slots (np.ndarray): slots of cards
+
+        Returns:
+            int: count of changed cards
+        """
+        slots = np.unique(slots)
+        opened = self.revealed[slots]
+        self.revealed[slots] = ~opened
+        self._count(slots[opened], False)
+        self._count(slots[~opened], True)
+        self._write(slots[opened], 'is_revealed', False)
+        self._write(slots[~opened], 'is_revealed', True)
+        return len(slots)
+
+    def tap(
+        self,
+        slots: np.ndarray,
+        side: Optional[str] = 'right',
+        is_active: bool = False
+            ) -> int:
+        """Set is_active flag and side of cards
+
+        Args:
+            slots (np.ndarray): slots of cards
+            side (str, optional): side of tap. Default to 'right'.
+            is_active (bool): flag value. Default to False.
+
+        Returns:
+            int: count of changed cards
+        """
+        code = self.code(side)
+        changed = slots[
+            (self.active[slots] != is_active) | (self.side[slots] != code)
+                ]
+        self.active[changed] = is_active
+        self.side[changed] = code
+        self._write(changed, 'is_active', is_active)
+        self._write(changed, 'side', side)
+        return len(changed)
+
+
+M = TypeVar('M', bound=BaseModel)
+
+
+def materialize(proto: M) -> M:
+    """Get independent copy of prototype item without validation
+
+    Args:
+        proto (BaseItem): prototype item
+
+    Returns:
+        BaseItem: copy of item
+    """
+    item = proto.copy()
+    object.__setattr__(item, '__dict__', deepcopy(proto.__dict__))
+    item._counter = Counter()  # type: ignore[attr-defined]
+    return item
+
+
+class CardCodes:
+    """Compact deque-like sequence of cards.
+
+    ..
+        Each type of card is interned to integer code. Sequence is
+        stored as numpy array of codes with free space on both sides,
+        so it costs 2 bytes per card. Card objects are materialized
+        from prototypes only by access. Cards with equal fields
+        are the same type, so state of card is kept only if it
+        differs from others.
+
+        Attr:
+
+            types (list[Card]): prototypes of cards by code
+
+            codes (np.ndarray): codes of cards, ordered from left
+                                side to right
+
+            chunk (int): count of codes, processed at once by
+                         iteration, search and count
+    """
+    dtype = np.uint16
+    chunk = 1 << 20
+
+    def __init__(self, cards: Iterable['Card'] = ()) -> None:
+        self.types: list['Card'] = []
+        self._keys: dict[tuple[type, str], int] = {}
+        self._buf: np.ndarray = self._allocate(16)
+        self._head = self._tail = 8
+        self.extend(cards)
+
+    @classmethod
+    def __get_validators__(cls) -> Generator[Callable, None, None]:
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value: Any) -> 'CardCodes':
+        if isinstance(value, cls):
+            return value
+        return cls(value)
+
+    @property
+    def codes(self) -> np.ndarray:
+        return self._buf[self._head:self._tail]
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    def __iter__(self) -> Iterator['Card']:
+        types = self.types
+        for _, codes in self._chunks():
+            for code in codes.tolist():
+                yield materialize(types[code])
+
+    def __getitem__(
+        self,
+        ind: Union[int, slice]
+            ) -> Union['Card', list['Card']]:
+        if isinstance(ind, slice):
+            return [materialize(self.types[code])
+                    for code in self.codes[ind].tolist()]
+        return materialize(self.types[int(self.codes[ind])])
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(len={len(self)})'
+
+    def _allocate(self, size: int) -> np.ndarray:
+        """Get new buffer for codes
+
+        Args:
+            size (int): size of buffer
+
+        Returns:
+            np.ndarray: buffer
+        """
+        return np.zeros(size, dtype=self.dtype)
+
+    def _chunks(self) -> Iterator[tuple[int, np.ndarray]]:
+        """Iterate over codes by chunks
+
+        Yields:
+            tuple[int, np.ndarray]: position of chunk and its codes
+        """
+        for start in range(0, len(self), self.chunk):
+            yield start, self.codes[start:start + self.chunk]
+
+    def _widen(self) -> None:
+        """Change dtype of codes to uint32
+        """
+        self.dtype = np.uint32
+        self._buf = self._buf.astype(self.dtype)
+
+    def intern(self, card: 'Card') -> int:
+        """Get code of type of card. New type is added
+        to types of sequence.
+
+        Args:
+            card (Card): a card object
+
+        Returns:
+            int: code of card type
+        """
+        key = (card.__class__, repr(card.dict()))
+        try:
+            return self._keys[key]
+        except KeyError:
+            code = len(self.types)
+            if code > np.iinfo(self.dtype).max:
+                self._widen()
+            self.types.append(card)
+            self._keys[key] = code
+            return code
+
+    def codes_of(self, id: str) -> np.ndarray:
+        """Get all codes of card types with given id
+
+        Args:
+            id (str): card id
+
+        Returns:
+            np.ndarray: codes
+        """
+        return np.array(
+            [code for code, card in enumerate(self.types) if card.id == id],
+            dtype=self.dtype
+                )
+
+    def ids(self) -> list[str]:
+        """Get ids of cards
+
+        Returns:
+            list[str]: ids, ordered from left side to right
+        """
+        ids = [card.id for card in self.types]
+        return [
+            ids[code] for _, codes in self._chunks()
+            for code in codes.tolist()
+                ]
+
+    def count(self, id: str) -> int:
+        """Count cards with given id
+
+        Args:
+            id (str): card id
+
+        Returns:
+            int: count of cards
+        """
+        searched = self.codes_of(id)
+        return sum(
+            int(np.isin(codes, searched).sum())
+            for _, codes in self._chunks()
+                )
+
+    def find(self, id: str, limit: Optional[int] = None) -> np.ndarray:
+        """Find positions of cards with given id
+
+        Args:
+            id (str): card id
+            limit (int, optional): max count of positions.
+                                   Default to None.
+
+        Returns:
+            np.ndarray: positions, ordered from left side to right
+        """
+        searched = self.codes_of(id)
+        found = []
+        size = 0
+        for start, codes in self._chunks():
+            if limit is not None and size >= limit:
+                break
+            positions = np.flatnonzero(np.isin(codes, searched)) + start
+            found.append(positions)
+            size += len(positions)
+        if not found:
+            return np.zeros(0, dtype=np.intp)
+        return np.concatenate(found)[:limit]
+
+    def _reserve(self, left: int = 0, right: int = 0) -> None:
+        """Reserve free space on sides of buffer
+
+        Args:
+            left (int): space on the left side. Default to 0.
+            right (int): space on the right side. Default to 0.
+        """
+        if self._head >= left and len(self._buf) - self._tail >= right:
+            return
+        size = len(self)
+        pad = max(size // 2, 8)
+        buf = self._allocate(left + size + right + 2 * pad)
+        head = pad + left
+        buf[head:head + size] = self.codes
+        self._buf, self._head, self._tail = buf, head, head + size
+
+    def set_codes(self, codes: np.ndarray) -> None:
+        """Replace codes of sequence
+
+        Args:
+            codes (np.ndarray): new codes
+        """
+        self._head = self._tail = 0
+        self._reserve(0, len(codes))
+        self._buf[self._head:self._head + len(codes)] = codes
+        self._tail = self._head + len(codes)
+
+    def save(self) -> Any:
+        """Get saved codes for snapshot
+
+        Returns:
+            Any: copy of codes
+        """
+        return self.codes.copy()
+
+    def load(self, saved: Any) -> bool:
+        """Restore codes from snapshot
+
+        Args:
+            saved (Any): saved codes, got by save
+
+        Returns:
+            bool: is sequence changed
+        """
+        if np.array_equal(self.codes, saved):
+            return False
+        self.set_codes(saved)
+        return True
+
+    def append(self, card: 'Card') -> None:
+        self._reserve(right=1)
+        self._buf[self._tail] = self.intern(card)
+        self._tail += 1
+
+    def appendleft(self, card: 'Card') -> None:
+        self._reserve(left=1)
+        self._head -= 1
+        self._buf[self._head] = self.intern(card)
+
+    def extend(self, cards: Iterable['Card']) -> None:
+        codes = [self.intern(card) for card in cards]
+        self._reserve(right=len(codes))
+        self._buf[self._tail:self._tail + len(codes)] = codes
+        self._tail += len(codes)
+
+    def extendleft(self, cards: Iterable['Card']) -> None:
+        codes = [self.intern(card) for card in cards]
+        codes.reverse()
+        self._reserve(left=len(codes))
+        self._head -= len(codes)
+        self._buf[self._head:self._head + len(codes)] = codes
+
+    def fill(self, card: 'Card', count: int) -> None:
+        """Append count copies of card to the right side
+
+        Args:
+            card (Card): a card object
+            count (int): count of copies
+        """
+        code = self.intern(card)
+        self._reserve(right=count)
+        for start in range(self._tail, self._tail + count, self.chunk):
+            stop = min(start + self.chunk, self._tail + count)
+            self._buf[start:stop] = code
+        self._tail += count
+
+    def pop(self) -> 'Card':
+        if not len(self):
+            raise IndexError('pop from an empty deque')
+        self._tail -= 1
+        return materialize(self.types[int(self._buf[self._tail])])
+
+    def popleft(self) -> 'Card':
+        if not len(self):
+            raise IndexError('pop from an empty deque')
+        self._head += 1
+        return materialize(self.types[int(self._buf[self._head - 1])])
+
+    def clear(self) -> None:
+        self._head = self._tail = len(self._buf) // 2
+
+    def rotate(self, n: int) -> None:
+        codes = self.codes
+        codes[:] = np.roll(codes, n)
+
+    def reverse(self) -> None:
+        codes = self.codes
+        codes[:] = codes[::-1].copy()
+
+    def shuffle(self, rng: np.random.Generator) -> None:
+        """Random shuffle codes
+
+        Args:
+            rng (np.random.Generator): random generator
+        """
+        rng.shuffle(self.codes)
+
+    def delete(self, positions: np.ndarray) -> None:
+        """Remove cards from given positions
+
+        Args:
+            positions (np.ndarray): positions of cards
+        """
+        self.set_codes(np.delete(self.codes, positions))
+
+    def take(self, positions: np.ndarray, remove: bool) -> list['Card']:
+        """Get cards from given positions
+
+        Args:
+            positions (np.ndarray): positions of cards
+            remove (bool): if True - remove cards from sequence
+
+        Returns:
+            list[Card]: cards
+        """
+        codes = self.codes[positions].tolist()
+        if remove:
+            self.delete(positions)
+        return [materialize(self.types[code]) for code in codes]
+
+
+class MemmapCardCodes(CardCodes):
+    """Card codes, stored in memory-mapped file.
+
+    ..
+        Is used as current of CompactDeck for piles, that cannot
+        live in memory. Codes are processed by chunks: shuffle
+        is external (codes are scattered to random buckets
+        in temporary files and each bucket is shuffled in memory),
+        rotate is done by chunked reversals and removing of cards
+        moves codes chunk by chunk. After each chunk pages
+        of mapping are released, so peak RSS is bounded by chunk
+        size regardless of deck size. File is used only as storage
+        of current deck: existed content is overwritten. Codes are
+        saved for snapshot to file near it by chunks, and unchanged
+        codes share the last saved file.
+
+    .. code-block::
+        :caption: Example:
+
+            deck = CompactDeck(
+                id='pile',
+                current=MemmapCardCodes(path='pile.codes')
+                    )
+
+        Attr:
+
+            path (str): path to file with codes. If not given -
+                        temporary file is used and removed with object.
+    """
+
+    def __init__(
+        self,
+        cards: Iterable['Card'] = (),
+        path: Optional[str] = None,
+        chunk: int = 1 << 20,
+            ) -> None:
+        self.chunk = chunk
+        if path is None:
+            fd, path = tempfile.mkstemp(suffix='.codes')
+            os.close(fd)
+            weakref.finalize(self, _remove_file, path)
+        self.path = path
+        self._saved: Optional[weakref.ref[SavedCodes]] = None
+        open(path, 'wb').close()
+        super().__init__(cards)
+
+    def _map(self, size: int) -> np.ndarray:
+        """Resize file and map it
+
+        Args:
+            size (int): count of codes in file
+
+        Returns:
+            np.ndarray: memory-mapped codes
+        """
+        with open(self.path, 'r+b') as f:
+            f.truncate(size * np.dtype(self.dtype).itemsize)
+        return np.memmap(self.path, dtype=self.dtype, mode='r+', shape=size)
+
+    def _allocate(self, size: int) -> np.ndarray:
+        return self._map(size)
+
+    def _release(self) -> None:
+        """Write changed pages to file and release
+        resident pages of mapping
+        """
+        self._buf.flush()  # type: ignore[attr-defined]
+        mm = getattr(self._buf, '_mmap', None)
+        if mm is not None and hasattr(mmap, 'MADV_DONTNEED'):
+            mm.madvise(mmap.MADV_DONTNEED)
+
+    def _chunks(self) -> Iterator[tuple[int, np.ndarray]]:
+        for start, codes in super()._chunks():
+            yield start, codes
+            self._release()
+
+    def _move(self, src: int, dst: int, count: int) -> None:
+        """Move codes inside buffer by chunks
+
+        Args:
+            src (int): source position in buffer
+            dst (int): destination position in buffer
+            count (int): count of codes
+        """
+        if src == dst or not count:
+            return
+        starts = range(0, count, self.chunk)
+        for start in starts if dst < src else reversed(starts):
+            size = min(self.chunk, count - start)
+            self._buf[dst + start:dst + start + size] = \
+                self._buf[src + start:src + start + size].copy()
+            self._release()
+
+    def _reserve(self, left: int = 0, right: int = 0) -> None:
+        if self._head >= left and len(self._buf) - self._tail >= right:
+            return
+        size = len(self)
+        pad = max(size // 2, 8)
+        head = max(self._head, pad + left)
+        capacity = max(len(self._buf), head + size + right + pad)
+        del self._buf
+        self._buf = self._map(capacity)
+        self._move(self._head, head, size)
+        self._head, self._tail = head, head + size
+
+    def _widen(self) -> None:
+        old = self._buf
+        self.path, path = self.path + '.tmp', self.path
+        self.dtype = np.uint32
+        open(self.path, 'wb').close()
+        buf = self._map(len(old))
+        for start in range(0, len(old), self.chunk):
+            buf[start:start + self.chunk] = old[start:start + self.chunk]
+        buf.flush()  # type: ignore[attr-defined]
+        del old, buf, self._buf
+        os.replace(self.path, path)
+        self.path = path
+        self._buf = self._map(
+            os.path.getsize(path) // np.dtype(self.dtype).itemsize
+                )
+
+    def _equal(self, saved: 'SavedCodes') -> bool:
+        """Compare codes with saved codes by chunks
+
+        Args:
+            saved (SavedCodes): saved codes
+
+        Returns:
+            bool: codes are equal
+        """
+        if saved.size != len(self):
+            return False
+        return all(
+            np.array_equal(codes, other)
+            for (_, codes), other in zip(
+                self._chunks(), saved.chunks(self.chunk)
+                    )
+                )
+
+    def save(self) -> 'SavedCodes':
+        saved = None if self._saved is None else self._saved()
+        if saved is None or not self._equal(saved):
+            saved = SavedCodes(self)
+            self._saved = weakref.ref(saved)
+        return saved
+
+    def load(self, saved: Any) -> bool:
+        if self._equal(saved):
+            return False
+        self._head = self._tail = 0
+        self._reserve(0, saved.size)
+        position = self._head
+        for codes in saved.chunks(self.chunk):
+            self._buf[position:position + len(codes)] = codes
+            position += len(codes)
+            self._release()
+        self._tail = position
+        self._saved = weakref.ref(saved)
+        return True
+
+    def rotate(self, n: int) -> None:
+        size = len(self)
+        if not size:
+            return
+        n %= size
+        self._reverse(self._head, self._tail)
+        self._reverse(self._head, self._head + n)
+        self._reverse(self._head + n, self._tail)
+
+    def reverse(self) -> None:
+        self._reverse(self._head, self._tail)
+
+    def _reverse(self, low: int, high: int) -> None:
+        """Reverse codes in buffer by chunks
+
+        Args:
+            low (int): first position in buffer
+            high (int): position after last
+        """
+        buf = self._buf
+        while True:
+            size = min(self.chunk, (high - low) // 2)
+            if not size:
+                break
+            left = np.array(buf[low:low + size][::-1])
+            buf[low:low + size] = buf[high - size:high][::-1]
+            buf[high - size:high] = left
+            low += size
+            high -= size
+            self._release()
+
+    def shuffle(self, rng: np.random.Generator) -> None:
+        size = len(self)
+        if size <= self.chunk:
+            super().shuffle(rng)
+            self._release()
+            return
+        buckets = -(-size // self.chunk)
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, str(n)) for n in range(buckets)]
+            files = [open(path, 'wb') for path in paths]
+            try:
+                for _, codes in self._chunks():
+                    scatter = rng.integers(0, buckets, size=len(codes))
+                    order = np.argsort(scatter, kind='stable')
+                    bounds = np.searchsorted(
+                        scatter[order], np.arange(buckets + 1)
+                            )
+                    codes = codes[order]
+                    for n, f in enumerate(files):
+                        codes[bounds[n]:bounds[n + 1]].tofile(f)
+            finally:
+                for f in files:
+                    f.close()
+            position = self._head
+            for path in paths:
+                codes = np.fromfile(path, dtype=self.dtype)
+                rng.shuffle(codes)
+                self._buf[position:position + len(codes)] = codes
+                position += len(codes)
+                self._release()
+
+    def delete(self, positions: np.ndarray) -> None:
+        positions = np.unique(positions) + self._head
+        write = int(positions[0]) if len(positions) else self._tail
+        bounds = positions.tolist() + [self._tail]
+        for ind, position in enumerate(bounds[:-1]):
+            count = bounds[ind + 1] - position - 1
+            self._move(position + 1, write, count)
+            write += count
+        self._tail = write
+
+
+class SavedCodes:
+    """Codes of memory-mapped sequence, saved to file for snapshot.
+    File is removed with object.
+
+    ..
+        Attr:
+
+            path (str): path to file with saved codes
+
+            size (int): count of codes
+
+            dtype (type): dtype of codes
+    """
+    __slots__ = ('path', 'size', 'dtype', '__weakref__')
+
+    def __init__(self, codes: MemmapCardCodes) -> None:
+        fd, self.path = tempfile.mkstemp(
+            suffix='.saved', dir=os.path.dirname(codes.path) or None
+                )
+        self.size = len(codes)
+        self.dtype = codes.dtype
+        weakref.finalize(self, _remove_file, self.path)
+        with os.fdopen(fd, 'wb') as f:
+            for _, chunk in codes._chunks():
+                chunk.tofile(f)
+
+    def chunks(self, chunk: int) -> Iterator[np.ndarray]:
+        """Read saved codes by chunks
+
+        Args:
+            chunk (int): count of codes in chunk
+
+        Yields:
+            np.ndarray: codes
+        """
+        with open(self.path, 'rb') as f:
+            for _ in range(0, self.size, chunk):
+                yield np.fromfile(f, dtype=self.dtype, count=chunk)
+
+
+def _remove_file(path: str) -> None:
+    """Remove file if exists
+
+    Args:
+        path (str): path to file
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class RollBuffer(Mapping):
+    """Preallocated buffer of results of roll of dices.
+
+    ..
+        Results of all dices are stored in one contiguous numpy array,
+        laid out by dice ids. Buffer is allocated once for dices and
+        is filled in place by every roll. Plain dices are rolled
+        without allocation of new arrays. Lists of results are made
+        only by access, so buffer is a lazy dict-like view of roll.
+
+        Attr:
+
+            data (np.ndarray): results of dices, laid out by dice ids
+
+            slices (dict[str, slice]): slices of data by dice ids
+    """
+
+    def __init__(self, dices: Iterable['Dice']) -> None:
+        dices = list(dices)
+        self.slices: dict[str, slice] = {}
+        self._key = self.key(dices)
+        self._special: list[tuple['Dice', slice]] = []
+        sides: list[int] = []
+        for item in dices:
+            start = len(sides)
+            special = bool(item.weights) or item._is_modified()
+            size = item.count
+            if item.keep_highest is not None:
+                size = min(size, item.keep_highest)
+            elif item.keep_lowest is not None:
+                size = min(size, item.keep_lowest)
+            sides.extend([item.sides if not special else 1] * size)
+            self.slices[item.id] = slice(start, len(sides))
+            if special:
+                self._special.append((item, self.slices[item.id]))
+        self._sides = np.array(sides, dtype=np.float64)
+        self._uniform = np.zeros(len(sides), dtype=np.float64)
+        self.data = np.zeros(len(sides), dtype=np.int64)
+
+    @staticmethod
+    def key(dices: Iterable['Dice']) -> tuple:
+        """Get key of layout of dices
+
+        Args:
+            dices (Iterable[Dice]): dices
+
+        Returns:
+            tuple: key of layout
+        """
+        return tuple(
+            (
+                item.id, item.count, item.sides, item.keep_highest,
+                item.keep_lowest, bool(item.weights) or item._is_modified()
+                    ) for item in dices
+                )
+
+    def fits(self, dices: Iterable['Dice']) -> bool:
+        """Check that buffer is laid out for dices
+
+        Args:
+            dices (Iterable[Dice]): dices
+
+        Returns:
+            bool: buffer fits dices
+        """
+        return self.key(dices) == self._key
+
+    def fill(self, rng: np.random.Generator) -> None:
+        """Roll dices and write results to buffer in place
+
+        Args:
+            rng (np.random.Generator): numpy generator
+        """
+        uniform = self._uniform
+        rng.random(out=uniform)
+        np.multiply(uniform, self._sides, out=uniform)
+        np.floor(uniform, out=uniform)
+        self.data[:] = uniform
+        self.data += 1
+        for item, part in self._special:
+            drawn = item._draw(rng, (1, item.count))
+            if item._is_modified():
+                drawn = item.modify(drawn, rng)
+            self.data[part] = drawn[0]
+
+    def array(self, id: str) -> np.ndarray:
+        """Get results of dice as view of buffer. View is
+        overwritten by the next roll.
+
+        Args:
+            id (str): dice id
+
+        Returns:
+            np.ndarray: results of dice
+        """
+        return self.data[self.slices[id]]
+
+    def __getitem__(self, id: str) -> list[int]:
+        result: list[int] = self.data[self.slices[id]].tolist()
+        return result
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.slices)
+
+    def __len__(self) -> int:
+        return len(self.slices)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.to_dict()})'
+
+    def to_dict(self) -> dict[str, list[int]]:
+        """Get results of roll as dict
+
+        Returns:
+            dict[str, list[int]]: results by dice ids
+        """
+        return {id: self[id] for id in self.slices}
+
+
+class RollHistory:
+    """Ring buffer of recent rolls of dice with running statistics.
+
+    ..
+        Only the last size rolls are kept: the oldest roll is dropped,
+        when new roll is added, so memory is bounded. Statistics are
+        updated by adding and dropping of values, so update costs
+        constant time per value and statistics are read without
+        iteration over rolls. Chi-square is counted against expected
+        distribution of faces from 1 to sides.
+
+        Attr:
+
+            size (int): max count of kept rolls
+
+            sides (int): sides of dice
+
+            probs (tuple[float, ...], optional): expected probabilities
+                of faces, started from the face 1. Default to None -
+                distribution of faces is uniform.
+
+            modeled (bool): expected distribution of faces is known.
+                            If False, chi-square isn't counted.
+                            Default to True.
+
+            rolls (deque[tuple[int, ...]]): recent rolls
+
+            counts (Counter[int]): counts of faces in recent rolls
+    """
+
+    def __init__(
+        self,
+        size: int,
+        sides: int,
+        probs: Optional[tuple[float, ...]] = None,
+        modeled: bool = True
+            ) -> None:
+        self.size = size
+        self.sides = sides
+        self.probs = probs
+        self.modeled = modeled
+        self.rolls: deque[tuple[int, ...]] = deque(maxlen=size)
+        self.counts: Counter[int] = Counter()
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self.rolls)
+
+    def _count(self, value: int, step: int) -> None:
+        """Add value to statistics or drop it
+
+        Args:
+            value (int): result of dice
+            step (int): 1 to add, -1 to drop
+        """
+        count = self.counts[value]
+        if 0 < value <= self.sides:
+            self._faces += step
+            self._face_squares += 2 * count * step + 1
+        if count + step:
+            self.counts[value] = count + step
+        else:
+            del self.counts[value]
+        self._values += step
+        self._sum += step * value
+        self._squares += step * value * value
+
+    def append(self, roll: Iterable[int]) -> None:
+        """Add roll to history. The oldest roll is dropped,
+        if history is full.
+
+        Args:
+            roll (Iterable[int]): results of roll
+        """
+        roll = tuple(roll)
+        if len(self.rolls) == self.size:
+            for value in self.rolls[0]:
+                self._count(value, -1)
+        self.rolls.append(roll)
+        for value in roll:
+            self._count(value, 1)
+
+    def extend(self, rolls: Iterable[Iterable[int]]) -> None:
+        """Add rolls to history
+
+        Args:
+            rolls (Iterable[Iterable[int]]): results of rolls
+        """
+        for roll in rolls:
+            self.append(roll)
+
+    def clear(self) -> None:
+        """Clear history and statistics
+        """
+        self.rolls.clear()
+        self.counts.clear()
+        self._values = 0
+        self._sum = 0
+        self._squares = 0
+        self._faces = 0
+        self._face_squares = 0
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Get mean of values of recent rolls
+
+        Returns:
+            float, optional: mean or None for empty history
+        """
+        if not self._values:
+            return None
+        return self._sum / self._values
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Get population variance of values of recent rolls
+
+        Returns:
+            float, optional: variance or None for empty history
+        """
+        if not self._values:
+            return None
+        n = self._values
+        return (n * self._squares - self._sum * self._sum) / (n * n)
+
+    @property
+    def chi_square(self) -> Optional[float]:
+        """Get chi-square statistic of counts of faces against
+        expected distribution. Uniform distribution is counted
+        from running sums, other distributions - by faces.
+
+        Returns:
+            float, optional: statistic or None for empty history
+                             or unknown distribution
+        """
+        if not self._faces or not self.modeled:
+            return None
+        if self.probs is None:
+            return self.sides * self._face_squares / self._faces \
+                - self._faces
+        total = 0.0
+        for face, prob in enumerate(self.probs, 1):
+            count = self.counts[face]
+            if count:
+                total += count * count / prob if prob else float('inf')
+        return total / self._faces - self._faces
+
+    def stats(self) -> dict[str, Any]:
+        """Export history and statistics
+
+        Returns:
+            dict[str, Any]: rolls, counts of faces, mean, variance
+                            and chi-square
+        """
+        return {
+            'size': self.size,
+            'rolls': [list(roll) for roll in self.rolls],
+            'counts': dict(sorted(self.counts.items())),
+            'mean': self.mean,
+            'variance': self.variance,
+            'chi_square': self.chi_square,
+                }
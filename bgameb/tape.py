@@ -0,0 +1,225 @@
+"""Record and replay of random outcomes of game
+"""
+import sys
+import numpy as np
+from array import array
+from typing import Iterable
+from bgameb.errors import TapeError
+
+
+class Tape:
+    """Compact binary tape of random outcomes
+
+    .. code-block::
+        :caption: Example:
+
+            tape = game.record()
+            ...  # play game
+            tape.save('game.tape')
+
+            game.replay(Tape.load('game.tape'))
+
+    ..
+        Tape keeps outcomes, not calls of random generator: results
+        of dice rolls, orders of shuffled cards, positions of random
+        cards and drawn items and arrays of vectorized rolls. So replay
+        doesn't depend on how random generator is used and doesn't
+        compute random numbers. Only shuffle of compact deck, that
+        can be too large to keep its order, is kept as seed of numpy
+        generator. Each outcome is stored as kind, length and values
+        in array of unsigned 32-bit integers, so tape is saved
+        as little-endian bytes.
+
+        Attr:
+
+            values (array): kinds, lengths and values of outcomes
+
+            position (int): position of the next outcome by replay
+
+            replaying (bool): tape is replayed, not recorded
+    """
+    ROLL = 1
+    SHUFFLE = 2
+    SAMPLE = 3
+    ARRAY = 4
+    DRAW = 5
+    SEED = 6
+    names = {
+        ROLL: 'roll',
+        SHUFFLE: 'shuffle',
+        SAMPLE: 'sample',
+        ARRAY: 'array',
+        DRAW: 'draw',
+        SEED: 'seed',
+            }
+    header = b'BGTAPE1\n'
+
+    def __init__(self, values: Iterable[int] = ()) -> None:
+        self.values = array('I', values)
+        self.position = 0
+        self.replaying = False
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def put(self, kind: int, values: Iterable[int]) -> None:
+        """Record outcome
+
+        Args:
+            kind (int): kind of outcome
+            values (Iterable[int]): values of outcome
+
+        Raises:
+            TapeError: values aren't unsigned 32-bit integers
+        """
+        try:
+            outcome = array('I', values)
+        except OverflowError:
+            raise TapeError(
+                f'Values of {self.names[kind]} must be in range [0, 2**32)'
+                    )
+        self.values.extend((kind, len(outcome)))
+        self.values.extend(outcome)
+
+    def take(self, kind: int) -> list[int]:
+        """Replay the next outcome
+
+        Args:
+            kind (int): expected kind of outcome
+
+        Raises:
+            TapeError: tape is ended or outcome is other kind
+
+        Returns:
+            list[int]: values of outcome
+        """
+        position = self.position
+        if position >= len(self.values):
+            raise TapeError(
+                f'Tape is ended, expected {self.names[kind]}'
+                    )
+        if self.values[position] != kind:
+            raise TapeError(
+                f'Expected {self.names[kind]} at {position=}, got ' +
+                self.names.get(self.values[position], 'unknown')
+                    )
+        end = position + 2 + self.values[position + 1]
+        self.position = end
+        return self.values[position + 2:end].tolist()
+
+    def put_array(self, values: np.ndarray) -> None:
+        """Record vectorized outcome with its shape
+
+        Args:
+            values (np.ndarray): array of non-negative integers
+
+        Raises:
+            TapeError: values aren't unsigned 32-bit integers
+        """
+        if values.size and (values.min() < 0 or values.max() >= 2**32):
+            raise TapeError('Values of array must be in range [0, 2**32)')
+        self.put(
+            self.ARRAY, [values.ndim, *values.shape, *values.ravel().tolist()]
+                )
+
+    def take_array(self) -> np.ndarray:
+        """Replay the next vectorized outcome
+
+        Raises:
+            TapeError: tape is ended or outcome isn't array
+
+        Returns:
+            np.ndarray: array of integers
+        """
+        values = self.take(self.ARRAY)
+        ndim = values[0]
+        return np.array(values[ndim + 1:], dtype=np.int64).reshape(
+            values[1:ndim + 1]
+                )
+
+    def put_seed(self, seed: int) -> None:
+        """Record 64-bit seed of generator
+
+        Args:
+            seed (int): seed
+        """
+        self.put(self.SEED, [seed & 0xFFFFFFFF, seed >> 32])
+
+    def take_seed(self) -> int:
+        """Replay the next seed of generator
+
+        Raises:
+            TapeError: tape is ended or outcome isn't seed
+
+        Returns:
+            int: seed
+        """
+        low, high = self.take(self.SEED)
+        return low | high << 32
+
+    def rewind(self) -> 'Tape':
+        """Move to the first outcome
+
+        Returns:
+            Tape
+        """
+        self.position = 0
+        return self
+
+    def to_bytes(self) -> bytes:
+        """Get binary representation of tape
+
+        Returns:
+            bytes
+        """
+        values = self.values
+        if sys.byteorder == 'big':
+            values = array('I', values)
+            values.byteswap()
+        return self.header + values.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Tape':
+        """Make tape from binary representation
+
+        Args:
+            data (bytes): binary representation
+
+        Raises:
+            TapeError: data isn't tape
+
+        Returns:
+            Tape
+        """
+        if not data.startswith(cls.header):
+            raise TapeError('Data is not a tape')
+        tape = cls()
+        try:
+            tape.values.frombytes(data[len(cls.header):])
+        except ValueError:
+            raise TapeError('Tape is truncated')
+        if sys.byteorder == 'big':
+            tape.values.byteswap()
+        return tape
+
+    def save(self, path: str) -> None:
+        """Save tape to file
+
+        Args:
+            path (str): path to file
+        """
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'Tape':
+        """Load tape from file
+
+        Args:
+            path (str): path to file
+
+        Returns:
+            Tape
+        """
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
@@ -1,14 +1,24 @@
 """Game tools classes
 """
-import random
-from pydantic import Field, PositiveInt
-from collections import deque
+import numpy as np
+from pydantic import Field, PositiveInt, NonNegativeInt, validator
+from collections import deque, Counter, OrderedDict
 from collections.abc import KeysView
-from heapq import heappop, heappush
-from typing import Optional, Iterable, Union, Any
-from bgameb.base import BaseTool, BaseToolExtended, Components
+from bisect import bisect_right
+from typing import Optional, Iterable, Union, Any, Mapping
+from numpy.typing import ArrayLike
+from bgameb.base import (
+    Base,
+    BaseTool,
+    BaseToolExtended,
+    BaseItem,
+    Components,
+    Visibility,
+        )
 from bgameb.items import Card, Dice, Step
-from bgameb.errors import ArrangeIndexError
+from bgameb.stores import CardStates, CardCodes, RollBuffer, RollHistory
+from bgameb import odds
+from bgameb.errors import ArrangeIndexError, TapeError
 
 
 class Shaker(BaseToolExtended[Dice]):
@@ -27,9 +37,36 @@ class Shaker(BaseToolExtended[Dice]):
 
             last_roll_mapped (dict[str, list[Any]]), optional:
                 last mapped roll result.
+
+            last_histogram (dict[str, list[NonNegativeInt]]), optional:
+                last histogram roll result.
+
+            buffered (bool): roll to preallocated buffer. Results of
+                             roll are kept in one numpy array, reused
+                             by every roll, and last_roll is a lazy
+                             dict-like RollBuffer. Last roll of dices
+                             isn't updated. Default to False.
+
+            history_size (NonNegativeInt): count of recent rolls of
+                shaker, kept in history of each dice id with running
+                statistics. Default to 0 - history isn't kept.
+                Chi-square of history of dices with modifiers
+                isn't counted.
+
+            _buffer (RollBuffer, optional): buffer of results
+
+            _history (dict[str, RollHistory]): histories by dice ids
     """
     last_roll: dict[str, list[PositiveInt]] = {}
     last_roll_mapped: dict[str, list[Any]] = {}
+    last_histogram: dict[str, list[NonNegativeInt]] = {}
+    buffered: bool = False
+    history_size: NonNegativeInt = 0
+    _buffer: Optional[RollBuffer] = None
+    _history: dict[str, RollHistory] = {}
+
+    class Config:
+        json_encoders = {RollBuffer: lambda rolls: rolls.to_dict()}
 
     def deal(
         self,
@@ -62,11 +99,28 @@ class Shaker(BaseToolExtended[Dice]):
         self._logger.debug(f'Is deal current: {self.current_ids}')
         return self
 
-    def roll(self) -> dict[str, list[int]]:
-        """Roll all stuff in shaker and return results
+    def _dices(self) -> list[Dice]:
+        """Get dices of current, bound to random generators
+        and tape of shaker
+
+        Returns:
+            list[Dice]: dices of current
+        """
+        dices: list[Dice] = self.current  # type: ignore
+        rng, np_rng, tape = self._random, self._np_random, self._tape
+        for item in dices:
+            if item._random is not rng or item._np_random is not np_rng \
+                    or item._tape is not tape:
+                item._random, item._np_random, item._tape = \
+                    rng, np_rng, tape
+        return dices
+
+    def roll(self) -> Mapping[str, list[int]]:
+        """Roll all stuff in shaker and return results.
+        In buffered mode RollBuffer is returned.
 
         Return:
-            dict[str, list[int]]: result of roll
+            Mapping[str, list[int]]: result of roll
 
         .. code-block::
             :caption: Example:
@@ -76,15 +130,87 @@ class Shaker(BaseToolExtended[Dice]):
                     "twenty_dice": [2, 12, 4],
                 }
         """
+        if self.buffered:
+            return self._roll_buffer()
+
         self.last_roll = {}
 
-        for item in self.current:
-            self.last_roll[item.id] = item.roll()  # type: ignore
+        for item in self._dices():
+            self.last_roll[item.id] = item.roll()
+        self._record({id: [roll] for id, roll in self.last_roll.items()})
 
         self._logger.debug(f'Result of roll: {self.last_roll}')
 
         return self.last_roll
 
+    def _roll_buffer(self) -> RollBuffer:
+        """Roll all stuff in shaker to preallocated buffer. Buffer
+        is allocated again only if dices of shaker are changed.
+
+        Returns:
+            RollBuffer: buffer of results
+        """
+        dices = self._dices()
+        buffer = self._buffer
+        if buffer is None or not buffer.fits(dices):
+            buffer = self._buffer = RollBuffer(dices)
+            self._logger.debug(f'Is allocated roll buffer: {buffer.slices}')
+        tape = self._tape
+        if tape is not None and tape.replaying:
+            for item in dices:
+                buffer.data[buffer.slices[item.id]] = tape.take(tape.ROLL)
+        else:
+            buffer.fill(self._np_rng())
+            if tape is not None:
+                for item in dices:
+                    tape.put(tape.ROLL, buffer.array(item.id).tolist())
+        self.last_roll = buffer  # type: ignore[assignment]
+        if self.history_size:
+            self._record({id: [roll] for id, roll in buffer.items()})
+        return buffer
+
+    @property
+    def history(self) -> Optional[dict[str, dict[str, Any]]]:
+        """Get recent rolls of shaker and its running statistics
+        by dice ids
+
+        Returns:
+            dict[str, dict[str, Any]], optional: histories by dice ids
+                                                 or None, if history
+                                                 isn't kept
+        """
+        if not self.history_size:
+            return None
+        return {id: history.stats() for id, history in self._history.items()}
+
+    def _record(
+        self,
+        rolls: Mapping[str, Union[np.ndarray, list[list[int]]]]
+            ) -> None:
+        """Add recent rolls of dices to histories, if it is kept
+
+        Args:
+            rolls (Mapping[str, Union[np.ndarray, list[list[int]]]]):
+                results of rolls by dice ids
+        """
+        if not self.history_size:
+            return
+        dices: list[Dice] = self.current  # type: ignore
+        for item in dices:
+            if item.id not in rolls:
+                continue
+            history = self._history.get(item.id)
+            if history is None or history.size != self.history_size \
+                    or history.sides != item.sides:
+                history = self._history[item.id] = RollHistory(
+                    self.history_size, item.sides
+                        )
+            item._expect(history)
+            recent = rolls[item.id][-self.history_size:]
+            history.extend(
+                recent.tolist() if isinstance(recent, np.ndarray) else recent
+                    )
+
     def roll_mapped(self) -> dict[str, list[Any]]:
         """Roll all stuff in shaker and return mapped results.
         If any stuff unmaped - empty list returned for this item.
@@ -94,13 +220,184 @@ class Shaker(BaseToolExtended[Dice]):
         """
         self.last_roll_mapped = {}
 
-        for item in self.current:
-            self.last_roll_mapped[item.id] = item.roll_mapped()  # type: ignore
+        for item in self._dices():
+            self.last_roll_mapped[item.id] = item.roll_mapped()
 
         self._logger.debug(f'Result of roll: {self.last_roll_mapped}')
 
         return self.last_roll_mapped
 
+    def roll_many(self, n: int) -> dict[str, np.ndarray]:
+        """Roll all stuff in shaker n times. The last roll
+        is the result of the final trial.
+
+        Args:
+            n (int): count of trials
+
+        Returns:
+            dict[str, np.ndarray]: arrays of shape (n, count)
+                                   by dice ids
+        """
+        dices = self._dices()
+        result = {item.id: item.roll_many(n) for item in dices}
+        if n > 0:
+            self.last_roll = {item.id: item.last_roll for item in dices}
+            self._record(result)
+        self._logger.debug(f'Is rolled {n} times')
+        return result
+
+    def roll_mapped_many(self, n: int) -> dict[str, np.ndarray]:
+        """Roll all stuff in shaker n times and return mapped
+        results. The last roll is the result of the final trial.
+
+        Args:
+            n (int): count of trials
+
+        Returns:
+            dict[str, np.ndarray]: arrays of shape (n, count)
+                                   by dice ids, (n, 0) for unmapped
+                                   dices
+        """
+        dices = self._dices()
+        result = {item.id: item.roll_mapped_many(n) for item in dices}
+        if n > 0:
+            self.last_roll = {item.id: item.last_roll for item in dices}
+            self._record({
+                item.id: [item.last_roll] for item in dices
+                    })
+            self.last_roll_mapped = {
+                item.id: item.last_roll_mapped for item in dices
+                    }
+        self._logger.debug(f'Is rolled mapped {n} times')
+        return result
+
+    def roll_histogram(self) -> dict[str, np.ndarray]:
+        """Roll all stuff in shaker and return counts of faces.
+        Cost of roll doesn't depend on count of dices.
+
+        Returns:
+            dict[str, np.ndarray]: counts of faces, started from
+                                   the face 1, by dice ids
+        """
+        dices = self._dices()
+        result = {item.id: item.roll_histogram() for item in dices}
+        self.last_histogram = {
+            item.id: item.last_histogram for item in dices
+                }
+        self._logger.debug(f'Result of roll: {self.last_histogram}')
+        return result
+
+    def successes(self, threshold: int) -> dict[str, int]:
+        """Count dices of last histogram roll with result greater
+        or equal to threshold
+
+        Args:
+            threshold (int): min successful face
+
+        Returns:
+            dict[str, int]: count of successes by dice ids
+        """
+        dices: list[Dice] = self.current  # type: ignore
+        return {
+            item.id: item.successes(threshold, self.last_histogram[item.id])
+            for item in dices if item.id in self.last_histogram
+                }
+
+    def count_successes(
+        self,
+        threshold: Optional[int] = None
+            ) -> dict[str, int]:
+        """Count results of last roll greater or equal to threshold.
+        Dices without threshold are ignored.
+
+        Args:
+            threshold (int, optional): min successful result. Default
+                                       to None - success of each dice
+                                       is used.
+
+        Returns:
+            dict[str, int]: count of successes by dice ids
+        """
+        dices: list[Dice] = self.current  # type: ignore
+        return {
+            item.id: item.count_successes(self.last_roll[item.id], threshold)
+            for item in dices
+            if item.id in self.last_roll
+            and (threshold is not None or item.success is not None)
+                }
+
+    def _pool(self) -> odds.PoolKey:
+        """Get key of composition of shaker
+
+        Returns:
+            PoolKey: key of pool of dices
+        """
+        dices: list[Dice] = self.current  # type: ignore
+        return odds.pool_key(item._key() for item in dices)
+
+    def sum_distribution(self) -> np.ndarray:
+        """Get exact distribution of sum of results of all dices
+        in shaker. Result is memoized by composition of shaker.
+
+        .. code-block::
+            :caption: Example:
+
+                odds.at_least(shaker.sum_distribution(), 15)
+
+        Returns:
+            np.ndarray: read-only array of probabilities, indexed by sum
+        """
+        return odds.sum_distribution(self._pool())
+
+    def max_distribution(self) -> np.ndarray:
+        """Get exact distribution of max result of all dices
+        in shaker. Result is memoized by composition of shaker.
+
+        Returns:
+            np.ndarray: read-only array of probabilities, indexed by face
+        """
+        return odds.max_distribution(self._pool())
+
+    def count_distribution(self, faces: Iterable[int]) -> np.ndarray:
+        """Get exact distribution of count of dices in shaker, that
+        show any of given faces. Result is memoized by composition
+        of shaker.
+
+        Args:
+            faces (Iterable[int]): faces, started from 1
+
+        Returns:
+            np.ndarray: read-only array of probabilities,
+                        indexed by count
+        """
+        return odds.count_distribution(self._pool(), frozenset(faces))
+
+    def mapped_distribution(self, value: Any) -> np.ndarray:
+        """Get exact distribution of count of dices in shaker, that
+        show given mapped value. Unmapped dices are ignored.
+        Result is memoized by composition of shaker.
+
+        Args:
+            value (Any): mapped value
+
+        Returns:
+            np.ndarray: read-only array of probabilities,
+                        indexed by count
+        """
+        dices: list[Dice] = self.current  # type: ignore
+        pool = odds.pool_key(
+            item._mapped_key(value) for item in dices if item.mapping
+                )
+        return odds.count_distribution(pool, frozenset([2]))
+
+    def dict(self, **kwargs) -> dict[str, Any]:
+        """Export shaker with last roll of buffer as dict
+        """
+        result = super().dict(**kwargs)
+        if isinstance(result.get('last_roll'), RollBuffer):
+            result['last_roll'] = result['last_roll'].to_dict()
+        return result
+
 
 class Deck(BaseToolExtended[Card]):
     """Deck object
@@ -118,11 +415,29 @@ class Deck(BaseToolExtended[Card]):
                                    This making from Component items.
 
             last (Card), optional: last card, removed from current.
+
+            visibility (Visibility): visibility of cards in views.
+                                     Default to 'owner'.
+
+            _states (CardStates): compact store of flags of cards
+                                  in current. Is used for batch
+                                  open, hide, flip, tap and untap
+                                  and keeps counts of remaining cards.
     """
     current: deque[Card] = Field(default_factory=deque)  # type: ignore
+    visibility: Visibility = 'owner'
+    _states: CardStates = CardStates()
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        self._states = CardStates()
+        self._states.slots(self.current)
+
+    def _load_state(self, state: Any) -> None:
+        self._states.sync(self.current)
 
     def _item_replace(self, item: Card) -> Card:
-        """Get replaced copy of card
+        """Get replaced copy of card, bound to states of deck
 
         Args:
             item (Card): a card object
@@ -132,8 +447,37 @@ class Deck(BaseToolExtended[Card]):
         """
         item = super()._item_replace(item)
         item.count = 1
+        self._states.bind(item)
         return item
 
+    def clear(self) -> None:
+        """Clear the current and last
+        """
+        super().clear()
+        self._states.clear()
+
+    def pop(self) -> Card:
+        """Remove and return a card from the right side of the current deck.
+        If no cards are present, raises an IndexError.
+
+        Returns:
+            Card
+        """
+        card = super().pop()
+        self._states.release(card)
+        return card
+
+    def remove(self, item_id: str) -> None:
+        """Remove the first occurrence of card from current.
+        If not found, raises a ValueError.
+
+        Args:
+            item_id (str): a card id
+        """
+        card = self.current[self.index(item_id)]
+        super().remove(item_id)
+        self._states.release(card)
+
     def deal(
         self,
         components: Components[Card],
@@ -172,7 +516,24 @@ class Deck(BaseToolExtended[Card]):
         Returns:
             Deck
         """
-        random.shuffle(self.current)
+        tape = self._tape
+        if tape is None:
+            self._rng().shuffle(self.current)
+        else:
+            if tape.replaying:
+                order = tape.take(tape.SHUFFLE)
+                if len(order) != len(self.current):
+                    raise TapeError(
+                        f'Shuffle of {len(order)} cards is recorded, ' +
+                        f'deck has {len(self.current)} cards'
+                            )
+            else:
+                order = list(range(len(self.current)))
+                self._rng().shuffle(order)
+                tape.put(tape.SHUFFLE, order)
+            cards = list(self.current)
+            self.current.clear()
+            self.current.extend(cards[ind] for ind in order)
         self._logger.debug(f'Is shuffled: {self.current_ids}')
         return self
 
@@ -209,6 +570,7 @@ class Deck(BaseToolExtended[Card]):
             Card
         """
         self.last = self.current.popleft()  # type: ignore
+        self._states.release(self.last)  # type: ignore[arg-type]
         self._logger.debug(
             f'{self.last.id if self.last else None} '
             'is poped from left of current'
@@ -402,7 +764,9 @@ class Deck(BaseToolExtended[Card]):
                 if card.id in query.keys() and query[card.id] > 0:
                     result.append(card)
                     query[card.id] -= 1
-                    if not remove:
+                    if remove:
+                        self._states.release(card)
+                    else:
                         for_deque.append(card)
                 else:
                     for_deque.append(card)
@@ -433,87 +797,2101 @@ class Deck(BaseToolExtended[Card]):
                 'Is empty current deck. Random cards not choosed.'
                     )
             return []
+        positions = self._random_positions(count, remove)
         if not remove:
-            result = random.choices(self.current, k=count)
+            result = [self.current[ind] for ind in positions]
             self._logger.debug(
                 f'Random choised cards without remove: {result}'
                     )
             return result
         else:
             result = []
-            for _ in range(count):
-                if self.current:
-                    choice = random.choice(self.current)
-                    result.append(choice)
-                    self.current.remove(choice)
-                else:
-                    break
+            for ind in positions:
+                choice = self.current[ind]
+                del self.current[ind]
+                self._states.release(choice)
+                result.append(choice)
             self._logger.debug(
                 f'Random choised cards with remove: {result}'
                     )
             return result
 
+    def _random_positions(self, count: int, remove: bool) -> list[int]:
+        """Get positions of random cards. Positions of removed
+        cards are given for current without previous cards.
 
-class Steps(BaseTool[Step]):
-    """Game steps order object
+        Args:
+            count (int): count of random cards
+            remove (bool): cards are removed
+
+        Returns:
+            list[int]: positions of cards
+        """
+        tape = self._tape
+        if tape is not None and tape.replaying:
+            return tape.take(tape.SAMPLE)
+        rng = self._rng()
+        size = len(self.current)
+        if not remove:
+            positions = rng.choices(range(size), k=count)
+        else:
+            positions = [
+                rng.randrange(size - ind) for ind in range(min(count, size))
+                    ]
+        if tape is not None:
+            tape.put(tape.SAMPLE, positions)
+        return positions
+
+    def _slots(self, mask: Optional[ArrayLike] = None) -> np.ndarray:
+        """Get slots of cards in states of deck
+
+        Args:
+            mask (ArrayLike, optional): bool mask or positions of
+                                        cards in current. If None -
+                                        all cards of current.
+                                        Default to None.
+
+        Returns:
+            np.ndarray: slots of cards
+        """
+        if mask is None:
+            self._states.sync(self.current)
+            return self._states.all()
+        slots = self._states.slots(self.current, len(self.current))
+        return slots[np.asarray(mask)]
+
+    def open(self, mask: Optional[ArrayLike] = None) -> 'Deck':
+        """Face up the cards of current
+
+        Args:
+            mask (ArrayLike, optional): bool mask or positions of
+                                        cards in current. If None -
+                                        all cards are opened.
+                                        Default to None.
+
+        Returns:
+            Deck
+        """
+        count = self._states.reveal(self._slots(mask), True)
+        self._logger.debug(f'Face up {count} cards.')
+        return self
+
+    def hide(self, mask: Optional[ArrayLike] = None) -> 'Deck':
+        """Face down the cards of current
+
+        Args:
+            mask (ArrayLike, optional): bool mask or positions of
+                                        cards in current. If None -
+                                        all cards are hidden.
+                                        Default to None.
+
+        Returns:
+            Deck
+        """
+        count = self._states.reveal(self._slots(mask), False)
+        self._logger.debug(f'Face down {count} cards.')
+        return self
+
+    def flip(self, mask: Optional[ArrayLike] = None) -> 'Deck':
+        """Face up or face down the cards of current regardles
+        of it condition
+
+        Args:
+            mask (ArrayLike, optional): bool mask or positions of
+                                        cards in current. If None -
+                                        all cards are flipped.
+                                        Default to None.
+
+        Returns:
+            Deck
+        """
+        count = self._states.flip(self._slots(mask))
+        self._logger.debug(f'Flipped {count} cards.')
+        return self
+
+    def tap(
+        self,
+        mask: Optional[ArrayLike] = None,
+        side: str = 'right'
+            ) -> 'Deck':
+        """Tap the cards of current to the given side
+
+        Args:
+            mask (ArrayLike, optional): bool mask or positions of
+                                        cards in current. If None -
+                                        all cards are tapped.
+                                        Default to None.
+            side (str, optional): side to tap. Defaults to 'right'.
+
+        Returns:
+            Deck
+        """
+        count = self._states.tap(self._slots(mask), side, False)
+        self._logger.debug(f'Taped {count} cards to side {side}.')
+        return self
+
+    def untap(self, mask: Optional[ArrayLike] = None) -> 'Deck':
+        """Untap the cards of current
+
+        Args:
+            mask (ArrayLike, optional): bool mask or positions of
+                                        cards in current. If None -
+                                        all cards are untapped.
+                                        Default to None.
+
+        Returns:
+            Deck
+        """
+        count = self._states.tap(self._slots(mask), None, True)
+        self._logger.debug(f'Untaped {count} cards. Side set to None.')
+        return self
+
+    def untap_all(self) -> 'Deck':
+        """Untap all cards of current
+
+        Returns:
+            Deck
+        """
+        return self.untap()
+
+    def revealed_mask(self) -> np.ndarray:
+        """Get is_revealed flags of current cards
+
+        Returns:
+            np.ndarray: bool mask, ordered as current
+        """
+        return self._states.revealed[
+            self._states.slots(self.current, len(self.current))
+                ]
+
+    def active_mask(self) -> np.ndarray:
+        """Get is_active flags of current cards
+
+        Returns:
+            np.ndarray: bool mask, ordered as current
+        """
+        return self._states.active[
+            self._states.slots(self.current, len(self.current))
+                ]
+
+    @property
+    def remaining(self) -> odds.CardCounter:
+        """Get counter of remaining cards for exact draw odds.
+        Revealed cards are known, so it isn't counted. Counter
+        is kept by deck and is updated by adding, removing, opening
+        and hiding of cards, so it must not be changed directly.
+        Cards, put to current or removed from it directly,
+        are counted after the next batch operation on all cards.
+
+        Returns:
+            CardCounter: counts of not revealed cards by ids
+        """
+        return self._states.hidden
+
+
+class CompactDeck(BaseTool[Card]):
+    """Compact deck object
 
     ..
+        Compact deck has deque-like interface of Deck, but current
+        is a CardCodes object: each type of card is interned to
+        integer code and deck is stored as numpy array of codes.
+        Shuffle, draw, search and count operate on codes. Card
+        objects are created only when is returned from deck.
+        Cards in compact deck keeps no individual state: all copies
+        of card, added to deck, are the same. For huge piles use
+        MemmapCardCodes as current: codes are stored in
+        memory-mapped file and processed by chunks.
+
         Attr:
 
-            current (list[Step]]):
-                Current representation of order in steps.
-                This making from Component items.
+            current (CardCodes): Current cards representation of deck.
+                                 This making from Component items.
 
-            last (Step), optional: last poped from current step.
+            last (Card), optional: last card, removed from current.
+
+            visibility (Visibility): visibility of cards in views.
+                                     Default to 'owner'.
     """
-    current: list[Step] = []
-    last: Optional[Step] = None
+    current: CardCodes = Field(default_factory=CardCodes)  # type: ignore
+    last: Optional[Card] = None
+    visibility: Visibility = 'owner'
+
+    class Config:
+        json_encoders = {
+            CardCodes: lambda codes: [card.dict() for card in codes]
+                }
+
+    @property
+    def current_ids(self) -> list[str]:
+        """Get ids of current cards
+
+        Returns:
+            list[str]: list ids of current
+        """
+        return self.current.ids()
+
+    def by_id(self, id: str) -> list[Card]:
+        """Get cards from current by its id
+
+        Args:
+            id (str): card id
+
+        Returns:
+            list[Card]: cards
+        """
+        return self.current.take(self.current.find(id), remove=False)
+
+    def count(self, item_id: str) -> int:
+        """Count the number of current cards with given id.
+
+        Args:
+            item_id (str): a card id
+
+        Returns:
+            int: count of cards
+        """
+        return self.current.count(item_id)
 
     def deal(
         self,
-        components: Components[Step],
+        components: Components[Card],
         items: Optional[list[str]] = None
-            ) -> 'Steps':
-        """Clear current order and create new current order
+            ) -> 'CompactDeck':
+        """Deal new deck current. Curent is cleared
+        before deal.
 
         Args:
             components (Components): game components
-            items (Optional[list[str]]): list of stuff ids
+            items (Optional[list[str]]): list of cards ids
 
         Returns:
-            Steps
+            CompactDeck
         """
         self.clear()
 
         if not items:
             for stuff in components.values():
-                if issubclass(stuff.__class__, Step):
-                    self.push(stuff)
+                if issubclass(stuff.__class__, Card):
+                    self.current.fill(
+                        self._item_replace(stuff), stuff.count
+                            )
         else:
             for id in items:
                 if id in components.ids:
                     comp = components.by_id(id)
-                    if issubclass(comp.__class__, Step):
-                        self.push(comp)
+                    if issubclass(comp.__class__, Card):
+                        self.current.fill(self._item_replace(comp), 1)
 
-        self._logger.debug(f'Is deal current: {self.current_ids}')
+        self._logger.debug(f'Is deal current of len {len(self.current)}')
         return self
 
-    def push(self, item: Step) -> None:
-        """Push Step object to current
+    def _item_replace(self, item: Card) -> Card:
+        """Get replaced copy of card
 
         Args:
-            item (Step): Step class instance
+            item (Card): a card object
+
+        Returns:
+            Card
         """
-        replaced = self._item_replace(item)
-        heappush(self.current, replaced)
+        item = super()._item_replace(item)
+        item.count = 1
+        return item
 
-    def pops(self) -> Step:
-        """Pop Step object from current with smallest priority
+    def shuffle(self) -> 'CompactDeck':
+        """Random shuffle current deck.
 
         Returns:
-            Step
+            CompactDeck
         """
-        self.last = heappop(self.current)
-        self._logger.debug(f'{self.last.id} is poped from current')
-        return self.last
+        tape = self._tape
+        if tape is None:
+            rng = self._np_rng()
+        else:
+            if tape.replaying:
+                seed = tape.take_seed()
+            else:
+                seed = int(self._np_rng().integers(
+                    1 << 64, dtype=np.uint64
+                        ))
+                tape.put_seed(seed)
+            rng = np.random.default_rng(seed)
+        self.current.shuffle(rng)
+        self._logger.debug('Is shuffled')
+        return self
+
+    def append(self, item: Card) -> None:
+        """Add card to the right side of the current deck.
+
+        Args:
+            item (Card): a card object
+        """
+        self.current.append(self._item_replace(item))
+        self._logger.debug(f'To current is appended card: {item.id}')
+
+    def appendleft(self, item: Card) -> None:
+        """Add card to the left side of the current deck.
+
+        Args:
+            item (Card): a card object
+        """
+        self.current.appendleft(self._item_replace(item))
+        self._logger.debug(f'To left of current is appended card: {item.id}')
+
+    def extend(self, items: Iterable[Card]) -> None:
+        """Extend the right side of the current deck by cards
+
+        Args:
+            items (Iterable[Card]): iterable with cards
+        """
+        self.current.extend(self._item_replace(item) for item in items)
+        self._logger.debug('Current are extended from right')
+
+    def extendleft(self, items: Iterable[Card]) -> None:
+        """Extend the left side of the current deck by appending
+        cards started from the right side of iterable.
+
+        Args:
+            items (Iterable[Card]): iterable with cards
+        """
+        self.current.extendleft(self._item_replace(item) for item in items)
+        self._logger.debug('Current are extended from left')
+
+    def popleft(self) -> Card:
+        """Remove and return a card from the left side of the current deck.
+        If no cards are present, raises an IndexError.
+
+        Returns:
+            Card
+        """
+        self.last = self.current.popleft()
+        self._logger.debug(f'{self.last.id} is poped from left of current')
+        return self.last
+
+    def rotate(self, n: int) -> None:
+        """Rotate the current deck n steps to the right.
+        If n is negative, rotate to the left.
+
+        Args:
+            n (int): steps to rotation
+        """
+        self.current.rotate(n)
+        self._logger.debug(f'Current is rotate by {n}')
+
+    def reverse(self) -> None:
+        """Reverse the cards in the current.
+        """
+        self.current.reverse()
+        self._logger.debug('Current is reversed')
+
+    def search(
+        self,
+        query: dict[str, int],
+        remove: bool = True
+            ) -> list[Card]:
+        """Search for cards in current by its id.
+
+        Args:
+            query (dict[str, int]): dict with id of searched
+                                    cards and count of searching
+            remove (bool): if True - remove searched cards from
+                           current deck. Default to True.
+
+        Return:
+            List[Card]: list of find cards, ordered as current
+        """
+        found = [
+            self.current.find(id, count)
+            for id, count in query.items() if count > 0
+                ]
+        positions = np.sort(np.concatenate(found)) if found \
+            else np.zeros(0, dtype=np.intp)
+        result = self.current.take(positions, remove)
+        self._logger.debug(f'Search result: {result}')
+        return result
+
+    def get_random(
+        self,
+        count: int = 1,
+        remove: bool = True
+            ) -> list[Card]:
+        """Get random cards from current deck
+
+        Args:
+            count (int, optional): count of random cards. Defaults to 1.
+            remove (bool, optional): if True - remove random cards from
+                                     current deck. Default to True.
+
+        Returns:
+            list[Card]: list of random cards
+        """
+        size = len(self.current)
+        if not size or count < 1:
+            self._logger.debug(
+                'Is empty current deck. Random cards not choosed.'
+                    )
+            return []
+        if remove:
+            positions = self._np_outcome(lambda rng: rng.choice(
+                size, size=min(count, size), replace=False
+                    ))
+        else:
+            positions = self._np_outcome(
+                lambda rng: rng.integers(0, size, size=count)
+                    )
+        result = self.current.take(positions, remove)
+        self._logger.debug(f'Random choised cards, {remove=}: {result}')
+        return result
+
+    def dict(self, **kwargs) -> dict[str, Any]:
+        """Export deck with materialized cards of current
+        """
+        result = super().dict(**kwargs)
+        if 'current' in result:
+            result['current'] = [card.dict() for card in self.current]
+        return result
+
+
+class Bag(BaseTool[BaseItem]):
+    """Bag object
+
+    ..
+        You can add any items to bag and draw it randomly. The current
+        of bag is unordered, so random draw removes item by swapping
+        it with the last one. Draw, return and count of items by id
+        cost O(1).
+
+        Attr:
+
+            current (list[BaseItem]): Current items representation
+                                      of bag. This making from
+                                      Components items.
+
+            last (BaseItem), optional: last item, drawn from current.
+
+            visibility (Visibility): visibility of items in views.
+                                     Default to 'owner'.
+
+            _counts (Counter): counts of current items by id.
+    """
+    current: list[BaseItem] = []
+    last: Optional[BaseItem] = None
+    visibility: Visibility = 'owner'
+    _counts: Counter[str] = Counter()
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        self._counts = Counter(item.id for item in self.current)
+
+    def _load_state(self, state: Any) -> None:
+        self._counts = Counter(item.id for item in self.current)
+
+    def _item_replace(self, item: BaseItem) -> BaseItem:
+        """Get replaced copy of item. If item has count,
+        count of copy is 1.
+
+        Args:
+            item (BaseItem): an item object
+
+        Returns:
+            BaseItem
+        """
+        item = super()._item_replace(item)
+        if hasattr(item, 'count'):
+            item.count = 1
+        return item
+
+    def deal(
+        self,
+        components: Components[BaseItem],
+        items: Optional[list[str]] = None
+            ) -> 'Bag':
+        """Deal new bag current. Current is cleared before deal.
+        If item has count, is dealt count copies of item.
+
+        Args:
+            components (Components): game components
+            items (Optional[list[str]]): list of items ids
+
+        Returns:
+            Bag
+        """
+        self.clear()
+
+        if not items:
+            for stuff in components.values():
+                for _ in range(getattr(stuff, 'count', 1)):
+                    self.append(stuff)
+        else:
+            for id in items:
+                comp = components.by_id(id)
+                if comp is not None:
+                    self.append(comp)
+
+        self._logger.debug(f'Is deal current: {self.current_ids}')
+        return self
+
+    def clear(self) -> None:
+        """Clear the current and last
+        """
+        super().clear()
+        self._counts.clear()
+
+    def count(self, item_id: str) -> int:
+        """Count the number of current items with given id.
+
+        Args:
+            item_id (str): an item id
+
+        Returns:
+            int: count of items
+        """
+        return self._counts[item_id]
+
+    def counts(self) -> dict[str, int]:
+        """Get counts of current items by id
+
+        Returns:
+            dict[str, int]: counts of items
+        """
+        return +self._counts
+
+    def append(self, item: BaseItem) -> None:
+        """Append copy of item to current
+
+        Args:
+            item (BaseItem): appended item
+        """
+        self.put(self._item_replace(item))
+
+    def extend(self, items: Iterable[BaseItem]) -> None:
+        """Extend the current by copies of items
+
+        Args:
+            items (Iterable[BaseItem]): iterable with items
+        """
+        for item in items:
+            self.put(self._item_replace(item))
+
+    def put(self, item: BaseItem) -> None:
+        """Return item to bag without copying, for example item,
+        drawn before.
+
+        Args:
+            item (BaseItem): an item object
+        """
+        self.current.append(item)
+        self._counts[item.id] += 1
+        self._logger.debug(f'To bag is put item: {item.id}')
+
+    def pop(self) -> BaseItem:
+        """Remove and return the last item from the current.
+        If no items are present, raises an IndexError.
+
+        Returns:
+            BaseItem: an item object
+        """
+        item = super().pop()
+        self._counts[item.id] -= 1
+        return item
+
+    def _take(self, ind: int) -> BaseItem:
+        """Remove item from current by swapping it with the last one
+
+        Args:
+            ind (int): index of item
+
+        Returns:
+            BaseItem: an item object
+        """
+        current = self.current
+        item = current[ind]
+        current[ind] = current[-1]
+        current.pop()
+        self._counts[item.id] -= 1
+        return item
+
+    def _random_positions(self, count: int, remove: bool) -> list[int]:
+        """Get positions of random items. Positions are recorded
+        to tape or replayed from it.
+
+        Args:
+            count (int): count of random items
+            remove (bool): if True - positions are unique
+
+        Returns:
+            list[int]: positions of items
+        """
+        tape = self._tape
+        if tape is not None and tape.replaying:
+            return tape.take(tape.DRAW)
+        rng = self._np_rng()
+        size = len(self.current)
+        if count == 1:
+            positions = [int(rng.integers(size))]
+        elif not remove:
+            positions = rng.integers(0, size, size=count).tolist()
+        else:
+            positions = rng.choice(
+                size, size=min(count, size), replace=False
+                    ).tolist()
+        if tape is not None:
+            tape.put(tape.DRAW, positions)
+        return positions
+
+    def draw(
+        self,
+        count: int = 1,
+        remove: bool = True
+            ) -> list[BaseItem]:
+        """Draw random items from bag. Many items are choosen
+        by one vectorized call.
+
+        Args:
+            count (int, optional): count of items. Defaults to 1.
+            remove (bool, optional): if True - remove drawn items from
+                                     bag, else draw with replacement.
+                                     Default to True.
+
+        Returns:
+            list[BaseItem]: list of drawn items
+        """
+        size = len(self.current)
+        if not size or count < 1:
+            self._logger.debug('Is empty bag. Items not drawn.')
+            return []
+
+        inds = self._random_positions(count, remove)
+        result = [self.current[ind] for ind in inds]
+        if remove:
+            for ind in sorted(inds, reverse=True):
+                self._take(ind)
+
+        self.last = result[-1]
+        self._logger.debug(
+            f'Drawn from bag {[item.id for item in result]}, {remove=}'
+                )
+        return result
+
+
+class Steps(BaseTool[Step]):
+    """Game steps order object
+
+    ..
+        Steps is an indexed priority queue. Steps with equal priority
+        are poped in order of push. Priority of any step can be
+        changed and any step can be removed without redeal.
+
+        Attr:
+
+            current (list[Step]]):
+                Current representation of order in steps.
+                This making from Component items.
+
+            last (Step), optional: last poped from current step.
+
+            round (NonNegativeInt): count of completed rounds of
+                                    cycle by next(). Default to 0.
+
+            _by_id (dict[str, list[Step]]): current steps by id,
+                                            in order of push.
+
+            _seq (int): counter of pushed steps.
+
+            _order (list[Step]): precomputed turn order of cycle.
+
+            _turn (int): position of next turn in order.
+
+            _skipped (set[str]): ids of skipped steps.
+
+            _stale (bool): is order must be recomputed.
+
+    .. code-block::
+        :caption: Example:
+
+            steps.deal(components)
+            for _ in range(100):
+                step = steps.next()
+    """
+    current: list[Step] = []
+    last: Optional[Step] = None
+    round: NonNegativeInt = 0
+    _by_id: dict[str, list[Step]] = {}
+    _seq: int = 0
+    _order: list[Step] = []
+    _turn: int = 0
+    _skipped: set[str] = set()
+    _stale: bool = True
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        self._by_id = {}
+        self._seq = 0
+        self._order = []
+        self._skipped = set()
+        for step in self.current:
+            self._index(step)
+        self._heapify()
+
+    def _save_state(self) -> Any:
+        order: tuple[int, ...] = ()
+        if not self._stale:
+            pos = {id(step): ind for ind, step in enumerate(self.current)}
+            order = tuple(pos[id(step)] for step in self._order)
+        return (
+            self._seq,
+            tuple(step._seq for step in self.current),
+            order,
+            self._turn,
+            frozenset(self._skipped),
+            self._stale,
+                )
+
+    def _load_state(self, state: Any) -> None:
+        self._seq, seqs, order, self._turn, skipped, self._stale = state
+        self._order = [self.current[pos] for pos in order]
+        self._skipped = set(skipped)
+        self._by_id = {}
+        for pos, (step, seq) in enumerate(zip(self.current, seqs)):
+            step._seq = seq
+            step._pos = pos
+        for step in sorted(self.current, key=lambda step: step._seq):
+            self._by_id.setdefault(step.id, []).append(step)
+
+    def _index(self, step: Step) -> None:
+        """Add step to index and set its push order
+
+        Args:
+            step (Step): Step class instance
+        """
+        step._seq = self._seq
+        self._seq += 1
+        self._by_id.setdefault(step.id, []).append(step)
+
+    def _unindex(self, step: Step) -> None:
+        """Remove step from index
+
+        Args:
+            step (Step): Step class instance
+        """
+        steps = self._by_id[step.id]
+        for ind, item in enumerate(steps):
+            if item is step:
+                del steps[ind]
+                break
+        if not steps:
+            del self._by_id[step.id]
+        step._pos = -1
+
+    def _sift_up(self, pos: int) -> None:
+        """Move step at given position to the root of heap
+        while its priority is less than parent one.
+
+        Args:
+            pos (int): position of step
+        """
+        heap = self.current
+        step = heap[pos]
+        key = (step.priority, step._seq)
+        while pos > 0:
+            parent_pos = (pos - 1) >> 1
+            parent = heap[parent_pos]
+            if key >= (parent.priority, parent._seq):
+                break
+            heap[pos] = parent
+            parent._pos = pos
+            pos = parent_pos
+        heap[pos] = step
+        step._pos = pos
+
+    def _sift_down(self, pos: int) -> None:
+        """Move step at given position to the leafs of heap
+        while its priority is greater than child one.
+
+        Args:
+            pos (int): position of step
+        """
+        heap = self.current
+        size = len(heap)
+        step = heap[pos]
+        key = (step.priority, step._seq)
+        while True:
+            child_pos = 2 * pos + 1
+            if child_pos >= size:
+                break
+            child = heap[child_pos]
+            child_key = (child.priority, child._seq)
+            right_pos = child_pos + 1
+            if right_pos < size:
+                right = heap[right_pos]
+                right_key = (right.priority, right._seq)
+                if right_key < child_key:
+                    child_pos, child, child_key = right_pos, right, right_key
+            if key <= child_key:
+                break
+            heap[pos] = child
+            child._pos = pos
+            pos = child_pos
+        heap[pos] = step
+        step._pos = pos
+
+    def _heapify(self) -> None:
+        """Transform current into heap in O(n)
+        """
+        for pos, step in enumerate(self.current):
+            step._pos = pos
+        for pos in reversed(range(len(self.current) // 2)):
+            self._sift_down(pos)
+
+    def _take(self, pos: int) -> Step:
+        """Remove step from given position of heap
+
+        Args:
+            pos (int): position of step
+
+        Returns:
+            Step
+        """
+        self._stale = True
+        heap = self.current
+        step = heap[pos]
+        last = heap.pop()
+        if last is not step:
+            heap[pos] = last
+            last._pos = pos
+            self._sift_down(pos)
+            self._sift_up(last._pos)
+        self._unindex(step)
+        return step
+
+    def _first(self, id: str) -> Step:
+        """Get first pushed step with given id. If not found,
+        raises a ValueError.
+
+        Args:
+            id (str): step id
+
+        Returns:
+            Step
+        """
+        try:
+            return self._by_id[id][0]
+        except KeyError:
+            raise ValueError(f'Step {id} is not in current')
+
+    def deal(
+        self,
+        components: Components[Step],
+        items: Optional[list[str]] = None
+            ) -> 'Steps':
+        """Clear current order and create new current order.
+        The heap is build in O(n).
+
+        Args:
+            components (Components): game components
+            items (Optional[list[str]]): list of stuff ids
+
+        Returns:
+            Steps
+        """
+        self.clear()
+
+        if not items:
+            for stuff in components.values():
+                if issubclass(stuff.__class__, Step):
+                    self.current.append(self._item_replace(stuff))
+        else:
+            for id in items:
+                if id in components.ids:
+                    comp = components.by_id(id)
+                    if issubclass(comp.__class__, Step):
+                        self.current.append(self._item_replace(comp))
+
+        for step in self.current:
+            self._index(step)
+        self._heapify()
+        self._stale = True
+
+        self._logger.debug(f'Is deal current: {self.current_ids}')
+        return self
+
+    def clear(self) -> None:
+        """Clear the current and last
+        """
+        super().clear()
+        self._by_id.clear()
+        self._order.clear()
+        self._skipped.clear()
+        self._turn = 0
+        self._stale = True
+        self.round = 0
+
+    def push(self, item: Step) -> None:
+        """Push Step object to current
+
+        Args:
+            item (Step): Step class instance
+        """
+        replaced = self._item_replace(item)
+        self._index(replaced)
+        self.current.append(replaced)
+        self._sift_up(len(self.current) - 1)
+        self._stale = True
+
+    def pop(self) -> Step:
+        """Remove and return the last step of heap.
+        If no steps are present, raises an IndexError.
+
+        Returns:
+            Step
+        """
+        self.last = self._take(len(self.current) - 1)
+        self._logger.debug(f'{self.last.id} is poped from current')
+        return self.last
+
+    def pops(self) -> Step:
+        """Pop Step object from current with smallest priority
+
+        Returns:
+            Step
+        """
+        if not self.current:
+            raise IndexError('pop from empty heap: index out of range')
+        self.last = self._take(0)
+        self._logger.debug(f'{self.last.id} is poped from current')
+        return self.last
+
+    def peek(self) -> Step:
+        """Get Step object with smallest priority without pop.
+        If no steps are present, raises an IndexError.
+
+        Returns:
+            Step
+        """
+        return self.current[0]
+
+    def reprioritize(self, id: str, priority: int) -> None:
+        """Change priority of first pushed step with given id.
+        If not found, raises a ValueError.
+
+        Args:
+            id (str): step id
+            priority (int): new priority
+        """
+        step = self._first(id)
+        old = step.priority
+        step.priority = priority
+        self._stale = True
+        if priority < old:
+            self._sift_up(step._pos)
+        else:
+            self._sift_down(step._pos)
+        self._logger.debug(f'Priority of {id} is changed to {priority}')
+
+    def remove(self, id: str) -> None:
+        """Remove first pushed step with given id.
+        If not found, raises a ValueError.
+
+        Args:
+            id (str): step id
+        """
+        self._take(self._first(id)._pos)
+        self._logger.debug(f'Is removed from current {id}')
+
+    def _cycle_order(self) -> list[Step]:
+        """Get turn order of cycle. If steps was changed, order is
+        recomputed and next turn is kept after the last turn.
+
+        Returns:
+            list[Step]: steps in turn order
+        """
+        if self._stale:
+            order = self._order
+            last = order[self._turn - 1] \
+                if 0 < self._turn <= len(order) else None
+            order[:] = self.current
+            order.sort(key=lambda step: (step.priority, step._seq))
+            if last is not None:
+                self._turn = bisect_right(
+                    [(step.priority, step._seq) for step in order],
+                    (last.priority, last._seq)
+                        )
+            self._stale = False
+        return self._order
+
+    def next(self) -> Step:
+        """Get step of next turn in cycle. After the last step
+        of order cycle wraps around and new round is started.
+        Skipped steps are passed. If no steps to cycle,
+        raises an IndexError.
+
+        Returns:
+            Step
+        """
+        order = self._cycle_order()
+        size = len(order)
+        for _ in range(size):
+            if self._turn >= size:
+                self._turn = 0
+                self.round += 1
+                self._logger.debug(f'Is started round {self.round}')
+            step = order[self._turn]
+            self._turn += 1
+            if step.id not in self._skipped:
+                self.last = step
+                return step
+        raise IndexError('No steps to cycle')
+
+    def skip(self, id: str) -> None:
+        """Skip steps with given id in cycle until reinsert.
+        If not found, raises a ValueError.
+
+        Args:
+            id (str): step id
+        """
+        self._first(id)
+        self._skipped.add(id)
+        self._logger.debug(f'Is skipped in cycle {id}')
+
+    def reinsert(self, id: str) -> None:
+        """Reinsert skipped steps with given id to cycle.
+        If not found, raises a ValueError.
+
+        Args:
+            id (str): step id
+        """
+        self._first(id)
+        self._skipped.discard(id)
+        self._logger.debug(f'Is reinserted to cycle {id}')
+
+
+class Board(BaseTool[BaseItem]):
+    """Board object
+
+    ..
+        Board is a grid of cells. Cell contents are stored as numpy
+        array of integer codes: 0 is an empty cell, code of item is
+        its index in current plus 1. Items with the same id are the
+        same kind of item, so the current keeps one item per kind.
+        Queries return numpy arrays of the board shape, so moves
+        can be generated and checked without loops by cells.
+
+        Attr:
+
+            width (int): count of columns
+
+            height (int): count of rows
+
+            cells (np.ndarray): codes of board cells
+
+            current (list[BaseItem]): kinds of items, placed on board
+
+            last (BaseItem), optional: last item, removed from board.
+
+            _codes (dict[str, int]): codes of items by id
+    """
+    width: PositiveInt
+    height: PositiveInt
+    cells: np.ndarray = None  # type: ignore[assignment]
+    current: list[BaseItem] = []
+    last: Optional[BaseItem] = None
+    _codes: dict[str, int] = {}
+
+    class Config:
+        arbitrary_types_allowed = True
+        json_encoders = {np.ndarray: lambda cells: cells.tolist()}
+
+    @validator('cells', pre=True, always=True)
+    def _check_cells(
+        cls,
+        value: Optional[ArrayLike],
+        values: dict[str, Any]
+            ) -> np.ndarray:
+        """Make cells array of board shape. Empty cells are made
+        if cells aren't given. Cells aren't checked if width or height
+        is invalid, because errors of its fields are raised.
+        """
+        shape = values.get('height'), values.get('width')
+        if None in shape:
+            return value  # type: ignore[return-value]
+        if value is None:
+            return np.zeros(shape, dtype=np.int32)
+        cells = np.array(value, dtype=np.int32)
+        if cells.shape != shape:
+            raise ValueError('Shape of cells must be (height, width)')
+        return cells
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        self._codes = {
+            item.id: code for code, item in enumerate(self.current, 1)
+                }
+
+    def _load_state(self, state: Any) -> None:
+        """Rebuild codes of items after restore of current. State
+        isn't used, because codes are indices of current.
+
+        Args:
+            state (Any): ignored
+        """
+        self._codes = {
+            item.id: code for code, item in enumerate(self.current, 1)
+                }
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Get shape of board
+
+        Returns:
+            tuple[int, int]: count of rows and columns
+        """
+        return self.height, self.width
+
+    def code(self, item_id: Optional[str]) -> int:
+        """Get code of item kind. None is a code of empty cell.
+
+        Args:
+            item_id (str, optional): item id
+
+        Returns:
+            int: code or -1 if item isn't placed on board
+        """
+        if item_id is None:
+            return 0
+        return self._codes.get(item_id, -1)
+
+    def _intern(self, item: BaseItem) -> int:
+        """Get code of item kind, add kind to current if needed
+
+        Args:
+            item (BaseItem): an item object
+
+        Returns:
+            int: code of item kind
+        """
+        code = self._codes.get(item.id)
+        if code is None:
+            self.current.append(self._item_replace(item))
+            code = self._codes[item.id] = len(self.current)
+        return code
+
+    def deal(
+        self,
+        components: Components[BaseItem],
+        items: Optional[list[str]] = None
+            ) -> 'Board':
+        """Deal kinds of items to board. The board is cleared
+        before deal.
+
+        Args:
+            components (Components): game components
+            items (Optional[list[str]]): list of items ids
+
+        Returns:
+            Board
+        """
+        self.clear()
+
+        if not items:
+            for stuff in components.values():
+                self._intern(stuff)
+        else:
+            for id in items:
+                comp = components.by_id(id)
+                if comp is not None:
+                    self._intern(comp)
+
+        self._logger.debug(f'Is deal current: {self.current_ids}')
+        return self
+
+    def clear(self) -> None:
+        """Clear cells, current and last
+        """
+        super().clear()
+        self._codes.clear()
+        self.cells.fill(0)
+
+    def clone(self) -> 'Board':
+        """Get copy of board for search. Cells are copied,
+        kinds of items are shared.
+
+        Returns:
+            Board
+        """
+        board = self.copy(update={'current': list(self.current)})
+        board.cells = self.cells.copy()
+        board._codes = dict(self._codes)
+        return board
+
+    def place(
+        self,
+        item: BaseItem,
+        row: ArrayLike,
+        col: ArrayLike
+            ) -> None:
+        """Place item to cells. Rows and columns can be
+        arrays of indices.
+
+        Args:
+            item (BaseItem): an item object
+            row (ArrayLike): row or rows of cells
+            col (ArrayLike): column or columns of cells
+        """
+        self.cells[row, col] = self._intern(item)
+        self._logger.debug(f'Is placed {item.id}')
+
+    def pop(self) -> BaseItem:
+        """Remove and return the last kind of items from the current.
+        Cells with this kind are cleared. If no items are present,
+        raises an IndexError.
+
+        Returns:
+            BaseItem: an item object
+        """
+        code = len(self.current)
+        item = super().pop()
+        del self._codes[item.id]
+        self.cells[self.cells == code] = 0
+        return item
+
+    def remove(self, row: ArrayLike, col: ArrayLike) -> None:
+        """Remove items from cells. Rows and columns can be
+        arrays of indices.
+
+        Args:
+            row (ArrayLike): row or rows of cells
+            col (ArrayLike): column or columns of cells
+        """
+        codes = np.unique(self.cells[row, col])
+        codes = codes[codes > 0]
+        if len(codes):
+            self.last = self.current[int(codes[-1]) - 1]
+        self.cells[row, col] = 0
+        self._logger.debug(f'Is removed items from {row=}, {col=}')
+
+    def get(self, row: int, col: int) -> Optional[BaseItem]:
+        """Get item from cell
+
+        Args:
+            row (int): row of cell
+            col (int): column of cell
+
+        Returns:
+            BaseItem, optional: item object or None if cell is empty
+        """
+        code = int(self.cells[row, col])
+        return self.current[code - 1] if code else None
+
+    def mask(self, item_id: Optional[str]) -> np.ndarray:
+        """Get mask of cells with item. None is used for empty cells.
+
+        Args:
+            item_id (str, optional): item id
+
+        Returns:
+            np.ndarray: boolean mask of board shape
+        """
+        mask: np.ndarray = self.cells == self.code(item_id)
+        return mask
+
+    def positions(self, item_id: Optional[str]) -> np.ndarray:
+        """Get positions of cells with item
+
+        Args:
+            item_id (str, optional): item id
+
+        Returns:
+            np.ndarray: array of rows and columns pairs
+        """
+        positions: np.ndarray = np.argwhere(self.mask(item_id))
+        return positions
+
+    def count(self, item_id: str) -> int:
+        """Count the number of cells with item
+
+        Args:
+            item_id (str): an item id
+
+        Returns:
+            int: count of cells
+        """
+        return int(np.count_nonzero(self.mask(item_id)))
+
+    @staticmethod
+    def _directions(diagonal: bool) -> list[tuple[int, int]]:
+        dirs = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+        if diagonal:
+            dirs += [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+        return dirs
+
+    @staticmethod
+    def _shift(array: np.ndarray, dr: int, dc: int) -> np.ndarray:
+        """Shift array by rows and columns, fill empty values by zeros
+
+        Args:
+            array (np.ndarray): array of board shape
+            dr (int): shift by rows
+            dc (int): shift by columns
+
+        Returns:
+            np.ndarray: shifted array
+        """
+        result: np.ndarray = np.zeros_like(array)
+        h, w = np.shape(array)
+        result[max(dr, 0):h + min(dr, 0), max(dc, 0):w + min(dc, 0)] = \
+            array[max(-dr, 0):h - max(dr, 0), max(-dc, 0):w - max(dc, 0)]
+        return result
+
+    def neighbours(
+        self,
+        mask: ArrayLike,
+        diagonal: bool = False
+            ) -> np.ndarray:
+        """Get mask of cells, adjacent to any cell of mask and not
+        in mask.
+
+        Args:
+            mask (ArrayLike): boolean mask of board shape
+            diagonal (bool, optional): count diagonal cells as
+                                       adjacent. Default to False.
+
+        Returns:
+            np.ndarray: boolean mask of board shape
+        """
+        mask = np.asarray(mask, dtype=bool)
+        result = np.zeros_like(mask)
+        for dr, dc in self._directions(diagonal):
+            result |= self._shift(mask, dr, dc)
+        return result & ~mask
+
+    def neighbour_counts(
+        self,
+        item_id: Optional[str],
+        diagonal: bool = False
+            ) -> np.ndarray:
+        """Count for every cell adjacent cells with item.
+        None is used for empty cells.
+
+        Args:
+            item_id (str, optional): item id
+            diagonal (bool, optional): count diagonal cells as
+                                       adjacent. Default to False.
+
+        Returns:
+            np.ndarray: array of counts of board shape
+        """
+        mask = self.mask(item_id).astype(np.int8)
+        result = np.zeros(mask.shape, dtype=np.int8)
+        for dr, dc in self._directions(diagonal):
+            result += self._shift(mask, dr, dc)
+        return result
+
+    def line_of_sight(
+        self,
+        row: int,
+        col: int,
+        diagonal: bool = True
+            ) -> np.ndarray:
+        """Get mask of cells, visible from cell by straight lines.
+        Line is stopped by first not empty cell, that is visible.
+
+        Args:
+            row (int): row of cell
+            col (int): column of cell
+            diagonal (bool, optional): scan diagonal lines.
+                                       Default to True.
+
+        Returns:
+            np.ndarray: boolean mask of board shape
+        """
+        result = np.zeros(self.shape, dtype=bool)
+        steps = np.arange(1, max(self.shape))
+        for dr, dc in self._directions(diagonal):
+            rows, cols = row + dr * steps, col + dc * steps
+            inside = (rows >= 0) & (rows < self.height) \
+                & (cols >= 0) & (cols < self.width)
+            rows, cols = rows[inside], cols[inside]
+            stops = np.flatnonzero(self.cells[rows, cols])
+            end = int(stops[0]) + 1 if len(stops) else len(rows)
+            result[rows[:end], cols[:end]] = True
+        return result
+
+    def flood_fill(
+        self,
+        row: int,
+        col: int,
+        diagonal: bool = False
+            ) -> np.ndarray:
+        """Get mask of connected cells with the same content as
+        given cell.
+
+        Args:
+            row (int): row of cell
+            col (int): column of cell
+            diagonal (bool, optional): connect diagonal cells.
+                                       Default to False.
+
+        Returns:
+            np.ndarray: boolean mask of board shape
+        """
+        same = self.cells == self.cells[row, col]
+        result = np.zeros(self.shape, dtype=bool)
+        result[row, col] = True
+        while True:
+            grown = self.neighbours(result, diagonal) & same
+            if not grown.any():
+                return result
+            result |= grown
+
+    def match(self, pattern: list[list[Optional[str]]]) -> np.ndarray:
+        """Find pattern on board. Pattern is a grid of item ids,
+        None is an empty cell and '*' is any cell.
+
+        Args:
+            pattern (list[list[Optional[str]]]): grid of item ids
+
+        Returns:
+            np.ndarray: boolean mask of top left cells of matches
+        """
+        codes = np.array(
+            [[self.code(id) if id != '*' else -2 for id in line]
+                for line in pattern],
+            dtype=np.int32
+                )
+        result = np.zeros(self.shape, dtype=bool)
+        ph, pw = np.shape(codes)
+        if ph > self.height or pw > self.width:
+            return result
+        windows = np.lib.stride_tricks.sliding_window_view(
+            self.cells, codes.shape
+                )
+        result[:self.height - ph + 1, :self.width - pw + 1] = (
+            (windows == codes) | (codes == -2)
+                ).all(axis=(2, 3))
+        return result
+
+
+class Map(BaseTool[BaseItem]):
+    """Map object
+
+    ..
+        Map is a graph of regions, that hold items. Adjacency of
+        regions is stored in compressed sparse rows (CSR) arrays.
+        Distances and shortest paths from region are found by
+        breadth-first search, that is vectorized by frontiers, and
+        are cached by source and set of blocked regions. Regions
+        with items, which ids are given as blockers, can't be
+        entered, so a cached result becomes unused, when blocking
+        items move. Map can be made from edge list or from
+        axial coordinates of hexes.
+
+        Attr:
+
+            regions (list[str]): names of regions
+
+            edges (list[tuple[str, str]]): edges between regions
+
+            directed (bool): edges are directed. Default to False.
+
+            current (list[BaseItem]): items, placed on map
+
+            locations (list[str]): regions of current items
+
+            last (BaseItem), optional: last item, removed from map.
+
+            cache_size (int): max count of cached searches.
+                              Default to 1024.
+
+            _index (dict[str, int]): indices of regions
+
+            _indptr (np.ndarray): CSR row pointers
+
+            _indices (np.ndarray): CSR adjacent regions
+
+            _cache (OrderedDict): cached distances and predecessors
+    """
+    regions: list[str] = []
+    edges: list[tuple[str, str]] = []
+    directed: bool = False
+    current: list[BaseItem] = []
+    locations: list[str] = []
+    last: Optional[BaseItem] = None
+    cache_size: PositiveInt = 1024
+    _index: dict[str, int] = {}
+    _indptr: np.ndarray = np.zeros(1, dtype=np.int64)
+    _indices: np.ndarray = np.zeros(0, dtype=np.int32)
+    _cache: OrderedDict[
+        tuple[int, bytes], tuple[np.ndarray, np.ndarray]
+            ] = OrderedDict()
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        if len(self.locations) != len(self.current):
+            raise ValueError('Each current item must have a location')
+        for pair in self.edges:
+            for region in pair:
+                if region not in self.regions:
+                    self.regions.append(region)
+        self._index = {name: ind for ind, name in enumerate(self.regions)}
+        if len(self._index) != len(self.regions):
+            raise ValueError('Names of regions must be unique')
+        for region in self.locations:
+            self._region(region)
+
+        size = len(self.regions)
+        pairs = np.array(
+            [(self._index[a], self._index[b]) for a, b in self.edges],
+            dtype=np.int64
+                ).reshape(-1, 2)
+        if not self.directed:
+            pairs = np.concatenate([pairs, pairs[:, ::-1]])
+        pairs = np.unique(pairs, axis=0)
+        self._indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(pairs[:, 0], minlength=size), out=self._indptr[1:]
+                )
+        self._indices = pairs[:, 1].astype(np.int32)
+        self._cache = OrderedDict()
+
+    @classmethod
+    def from_hex(
+        cls,
+        id: str,
+        coords: Iterable[tuple[int, int]],
+        **data: Any
+            ) -> 'Map':
+        """Make map of hexes with axial coordinates. Names
+        of regions are 'q,r' strings.
+
+        Args:
+            id (str): map id
+            coords (Iterable[tuple[int, int]]): axial coordinates q and r
+
+        Returns:
+            Map
+        """
+        cells = {(int(q), int(r)) for q, r in coords}
+        edges = []
+        for q, r in sorted(cells):
+            for dq, dr in ((1, 0), (0, 1), (1, -1)):
+                if (q + dq, r + dr) in cells:
+                    edges.append((f'{q},{r}', f'{q + dq},{r + dr}'))
+        return cls(
+            id=id,
+            regions=[f'{q},{r}' for q, r in sorted(cells)],
+            edges=edges,
+            **data
+                )
+
+    def _region(self, region: str) -> int:
+        """Get index of region. If not found, raises a KeyError.
+
+        Args:
+            region (str): region name
+
+        Returns:
+            int: index of region
+        """
+        try:
+            return self._index[region]
+        except KeyError:
+            raise KeyError(f'Region {region} not found')
+
+    def neighbours(self, region: str) -> list[str]:
+        """Get adjacent regions
+
+        Args:
+            region (str): region name
+
+        Returns:
+            list[str]: names of regions
+        """
+        ind = self._region(region)
+        return [
+            self.regions[i] for i
+            in self._indices[self._indptr[ind]:self._indptr[ind + 1]]
+                ]
+
+    def deal(
+        self,
+        components: Components[BaseItem],
+        items: Optional[list[str]] = None
+            ) -> 'Map':
+        """Deal items to map. The map is cleared before deal.
+        Items are placed to regions, named as items ids.
+
+        Args:
+            components (Components): game components
+            items (Optional[list[str]]): list of items ids
+
+        Returns:
+            Map
+        """
+        self.clear()
+
+        stuff = components.values() if not items \
+            else (components.by_id(id) for id in items)
+        for item in stuff:
+            if item is not None and item.id in self._index:
+                self.place(item, item.id)
+
+        self._logger.debug(f'Is deal current: {self.current_ids}')
+        return self
+
+    def clear(self) -> None:
+        """Clear the current, locations and last
+        """
+        super().clear()
+        self.locations.clear()
+
+    def place(self, item: BaseItem, region: str) -> None:
+        """Place copy of item to region
+
+        Args:
+            item (BaseItem): an item object
+            region (str): region name
+        """
+        self._region(region)
+        self.current.append(self._item_replace(item))
+        self.locations.append(region)
+        self._logger.debug(f'Is placed {item.id} to {region}')
+
+    def move(self, ind: int, region: str) -> None:
+        """Move item to region
+
+        Args:
+            ind (int): index of item in current
+            region (str): region name
+        """
+        self._region(region)
+        self.locations[ind] = region
+        self._logger.debug(
+            f'Is moved {self.current[ind].id} to {region}'
+                )
+
+    def remove(self, ind: int) -> BaseItem:
+        """Remove and return item from map
+
+        Args:
+            ind (int): index of item in current
+
+        Returns:
+            BaseItem: an item object
+        """
+        self.last = self.current.pop(ind)
+        del self.locations[ind]
+        self._logger.debug(f'{self.last.id} is removed from map')
+        return self.last
+
+    def pop(self) -> BaseItem:
+        """Remove and return last item from map.
+        If no items are present, raises an IndexError.
+
+        Returns:
+            BaseItem: an item object
+        """
+        return self.remove(-1)
+
+    def items_in(self, region: str) -> list[BaseItem]:
+        """Get items in region
+
+        Args:
+            region (str): region name
+
+        Returns:
+            list[BaseItem]: items
+        """
+        return [
+            item for item, location in zip(self.current, self.locations)
+            if location == region
+                ]
+
+    def _blocked(self, blockers: Optional[Iterable[str]]) -> np.ndarray:
+        """Get mask of regions with blocking items
+
+        Args:
+            blockers (Iterable[str], optional): ids of blocking items
+
+        Returns:
+            np.ndarray: boolean mask of regions
+        """
+        blocked: np.ndarray = np.zeros(len(self.regions), dtype=bool)
+        if blockers:
+            ids = set(blockers)
+            blocked[[
+                self._index[location] for item, location
+                in zip(self.current, self.locations) if item.id in ids
+                    ]] = True
+        return blocked
+
+    def _search(
+        self,
+        source: int,
+        blocked: np.ndarray
+            ) -> tuple[np.ndarray, np.ndarray]:
+        """Get distances and predecessors from source region
+        from cache or by breadth-first search.
+
+        Args:
+            source (int): index of region
+            blocked (np.ndarray): mask of blocked regions
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: distances and predecessors,
+                -1 for unreachable regions
+        """
+        blocked = np.array(blocked)
+        blocked[source] = False
+        key = source, np.packbits(blocked).tobytes()
+        try:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        except KeyError:
+            pass
+
+        dist = np.full(len(self.regions), -1, dtype=np.int32)
+        pred = np.full(len(self.regions), -1, dtype=np.int32)
+        dist[source] = 0
+        frontier = np.array([source], dtype=np.int64)
+        step = 0
+        while len(frontier):
+            starts = self._indptr[frontier]
+            counts = self._indptr[frontier + 1] - starts
+            offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) \
+                + np.arange(counts.sum())
+            found = self._indices[offsets]
+            parents = np.repeat(frontier, counts)
+            new = (dist[found] < 0) & ~blocked[found]
+            frontier, first = np.unique(found[new], return_index=True)
+            step += 1
+            dist[frontier] = step
+            pred[frontier] = parents[new][first]
+
+        dist.flags.writeable = pred.flags.writeable = False
+        self._cache[key] = dist, pred
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return dist, pred
+
+    def distances(
+        self,
+        region: str,
+        blockers: Optional[Iterable[str]] = None
+            ) -> np.ndarray:
+        """Get count of steps from region to every region.
+        Result is read-only cached array.
+
+        Args:
+            region (str): region name
+            blockers (Iterable[str], optional): ids of items, that
+                block regions. Default to None.
+
+        Returns:
+            np.ndarray: steps by regions, -1 for unreachable regions
+        """
+        return self._search(self._region(region), self._blocked(blockers))[0]
+
+    def distance(
+        self,
+        source: str,
+        target: str,
+        blockers: Optional[Iterable[str]] = None
+            ) -> int:
+        """Get count of steps between regions
+
+        Args:
+            source (str): region name
+            target (str): region name
+            blockers (Iterable[str], optional): ids of items, that
+                block regions. Default to None.
+
+        Returns:
+            int: count of steps or -1 if target is unreachable
+        """
+        return int(self.distances(source, blockers)[self._region(target)])
+
+    def path(
+        self,
+        source: str,
+        target: str,
+        blockers: Optional[Iterable[str]] = None
+            ) -> list[str]:
+        """Get shortest path between regions
+
+        Args:
+            source (str): region name
+            target (str): region name
+            blockers (Iterable[str], optional): ids of items, that
+                block regions. Default to None.
+
+        Returns:
+            list[str]: names of regions from source to target or empty
+                       list if target is unreachable
+        """
+        _, pred = self._search(
+            self._region(source), self._blocked(blockers)
+                )
+        ind = self._region(target)
+        result: list[str] = []
+        if ind != self._region(source) and pred[ind] < 0:
+            return result
+        while ind >= 0:
+            result.append(self.regions[ind])
+            ind = int(pred[ind])
+        return result[::-1]
+
+    def within(
+        self,
+        steps: int,
+        items: Optional[list[int]] = None,
+        blockers: Optional[Iterable[str]] = None
+            ) -> np.ndarray:
+        """Get regions within count of steps for many items.
+        Search is made once for every occupied region.
+
+        Args:
+            steps (int): max count of steps
+            items (list[int], optional): indices of items in current.
+                                         Default to None - all items.
+            blockers (Iterable[str], optional): ids of items, that
+                block regions. Default to None.
+
+        Returns:
+            np.ndarray: boolean matrix of items by regions
+        """
+        if items is None:
+            items = list(range(len(self.current)))
+        blocked = self._blocked(blockers)
+        result = np.zeros((len(items), len(self.regions)), dtype=bool)
+        for row, ind in enumerate(items):
+            dist = self._search(self._index[self.locations[ind]], blocked)[0]
+            result[row] = (dist >= 0) & (dist <= steps)
+        return result
+
+    def can_move(
+        self,
+        ind: int,
+        region: str,
+        steps: int,
+        blockers: Optional[Iterable[str]] = None
+            ) -> bool:
+        """Check that item can reach region by count of steps
+
+        Args:
+            ind (int): index of item in current
+            region (str): region name
+            steps (int): max count of steps
+            blockers (Iterable[str], optional): ids of items, that
+                block regions. Default to None.
+
+        Returns:
+            bool: region is reachable
+        """
+        dist = self.distance(self.locations[ind], region, blockers)
+        return 0 <= dist <= steps
+
+
+class Resources(Base):
+    """Resources pool
+
+    .. code-block::
+        :caption: Example:
+
+            wallet = Resources(id='wallet', amounts={'gold': 5})
+            wallet.pay({'gold': 3, 'wood': 1})  # False, nothing is changed
+            Resources.pay_many([p.wallet for p in players], {'gold': 1})
+
+    ..
+        Pool keeps amounts of resources by names. Amounts can't be
+        negative and can't exceed limits. Every transaction is
+        atomic: it is checked first and applied only if all
+        resources pass the check. Bulk methods apply the same
+        transaction to many pools and return result of all pools
+        as numpy array.
+
+        Attr:
+
+            amounts (dict[str, NonNegativeInt]): amounts of resources
+
+            limits (dict[str, NonNegativeInt]): max amounts of resources.
+                                                Resources without limit
+                                                are unbounded.
+    """
+    amounts: dict[str, NonNegativeInt] = {}
+    limits: dict[str, NonNegativeInt] = {}
+
+    @validator('limits')
+    def _check_limits(
+        cls,
+        value: dict[str, int],
+        values: dict[str, Any]
+            ) -> dict[str, int]:
+        amounts = values.get('amounts', {})
+        for name, limit in value.items():
+            if amounts.get(name, 0) > limit:
+                raise ValueError('Amounts of resources must not exceed limits')
+        return value
+
+    def __getitem__(self, name: str) -> int:
+        return self.amounts.get(name, 0)
+
+    def _check(self, changes: dict[str, int]) -> bool:
+        """Check that changes can be applied
+
+        Args:
+            changes (dict[str, int]): signed changes of resources
+
+        Returns:
+            bool: changes are valid
+        """
+        amounts, limits = self.amounts, self.limits
+        for name, value in changes.items():
+            result = amounts.get(name, 0) + value
+            if result < 0 or (name in limits and result > limits[name]):
+                return False
+        return True
+
+    def apply(self, changes: dict[str, int]) -> bool:
+        """Apply signed changes of resources in one transaction
+
+        Args:
+            changes (dict[str, int]): signed changes of resources
+
+        Returns:
+            bool: changes are applied
+        """
+        if not self._check(changes):
+            self._logger.debug(f'Transaction rejected: {changes}')
+            return False
+        self._add(changes)
+        return True
+
+    def _add(self, changes: dict[str, int]) -> None:
+        """Add checked changes to amounts
+
+        Args:
+            changes (dict[str, int]): signed changes of resources
+        """
+        amounts = self.amounts
+        for name, value in changes.items():
+            amounts[name] = amounts.get(name, 0) + value
+
+    @staticmethod
+    def _signed(values: dict[str, int], sign: int) -> dict[str, int]:
+        result = {}
+        for name, value in values.items():
+            if value < 0:
+                raise ValueError('Values of transaction must be non-negative')
+            result[name] = sign * value
+        return result
+
+    def can_pay(self, cost: dict[str, int]) -> bool:
+        """Check that cost can be paid
+
+        Args:
+            cost (dict[str, int]): amounts of resources
+
+        Returns:
+            bool: cost can be paid
+        """
+        return self._check(self._signed(cost, -1))
+
+    def pay(self, cost: dict[str, int]) -> bool:
+        """Pay cost. Nothing is changed, if any resource is not enough.
+
+        Args:
+            cost (dict[str, int]): amounts of resources
+
+        Returns:
+            bool: cost is paid
+        """
+        return self.apply(self._signed(cost, -1))
+
+    def gain(self, income: dict[str, int]) -> bool:
+        """Gain income. Nothing is changed, if any limit is exceeded.
+
+        Args:
+            income (dict[str, int]): amounts of resources
+
+        Returns:
+            bool: income is gained
+        """
+        return self.apply(self._signed(income, 1))
+
+    def exchange(
+        self,
+        cost: dict[str, int],
+        income: dict[str, int]
+            ) -> bool:
+        """Pay cost and gain income in one transaction
+
+        Args:
+            cost (dict[str, int]): amounts of paid resources
+            income (dict[str, int]): amounts of gained resources
+
+        Returns:
+            bool: transaction is applied
+        """
+        changes = self._signed(income, 1)
+        for name, value in self._signed(cost, -1).items():
+            changes[name] = changes.get(name, 0) + value
+        return self.apply(changes)
+
+    @classmethod
+    def apply_many(
+        cls,
+        pools: list['Resources'],
+        changes: dict[str, int]
+            ) -> np.ndarray:
+        """Apply the same signed changes to many pools. Each pool is
+        changed in its own transaction.
+
+        Args:
+            pools (list[Resources]): resources pools
+            changes (dict[str, int]): signed changes of resources
+
+        Returns:
+            np.ndarray: boolean mask of pools with applied changes
+        """
+        result = []
+        for pool in pools:
+            valid = pool._check(changes)
+            if valid:
+                pool._add(changes)
+            result.append(valid)
+        return np.array(result, dtype=bool)
+
+    @classmethod
+    def pay_many(
+        cls,
+        pools: list['Resources'],
+        cost: dict[str, int]
+            ) -> np.ndarray:
+        """Pay the same cost by many pools
+
+        Args:
+            pools (list[Resources]): resources pools
+            cost (dict[str, int]): amounts of resources
+
+        Returns:
+            np.ndarray: boolean mask of pools, that paid cost
+        """
+        return cls.apply_many(pools, cls._signed(cost, -1))
+
+    @classmethod
+    def gain_many(
+        cls,
+        pools: list['Resources'],
+        income: dict[str, int]
+            ) -> np.ndarray:
+        """Gain the same income by many pools
+
+        Args:
+            pools (list[Resources]): resources pools
+            income (dict[str, int]): amounts of resources
+
+        Returns:
+            np.ndarray: boolean mask of pools, that gained income
+        """
+        return cls.apply_many(pools, cls._signed(income, 1))
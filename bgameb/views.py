@@ -0,0 +1,239 @@
+"""Read-only views of game for players
+"""
+import json
+import numpy as np
+from types import MappingProxyType
+from collections import deque
+from collections.abc import Mapping
+from typing import Optional, Iterator, Any
+from pydantic import BaseModel
+from pydantic.json import pydantic_encoder
+from bgameb.base import Base, BasePlayer, BaseTool
+
+
+def _encoder(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return pydantic_encoder(value)
+
+
+def is_visible(
+    item: Base,
+    visibility: str,
+    viewer: Optional[str],
+    owner: Optional[str]
+        ) -> bool:
+    """Check that item of tool is visible for player
+
+    Args:
+        item (Base): an item object
+        visibility (str): visibility of tool
+        viewer (str, optional): id of player, that views game
+        owner (str, optional): id of player, that owns tool
+
+    Returns:
+        bool: item is visible
+    """
+    if visibility == 'public':
+        return True
+    if visibility == 'hidden':
+        return False
+    if visibility == 'owner' and viewer is not None and viewer == owner:
+        return True
+    return bool(getattr(item, 'is_revealed', True))
+
+
+class View:
+    """Read-only view of game, player or item for player
+
+    .. code-block::
+        :caption: Example:
+
+            view = View(game, viewer='Me')
+            view.opp.deck.current_ids  # [None, None, 'revealed card']
+            view.json()
+
+    ..
+        View doesn't copy the viewed object: attributes are read
+        from object on access. Tools are viewed by ToolView, that
+        redacts items, hidden for viewer, to None. Tools of player
+        are owned by this player.
+
+        Attr:
+
+            _obj (BaseModel): viewed object
+
+            _viewer (str, optional): id of player, that views object
+
+            _owner (str, optional): id of player, that owns object
+    """
+    __slots__ = ('_obj', '_viewer', '_owner')
+
+    def __init__(
+        self,
+        obj: BaseModel,
+        viewer: Optional[str] = None,
+        owner: Optional[str] = None
+            ) -> None:
+        object.__setattr__(self, '_obj', obj)
+        object.__setattr__(self, '_viewer', viewer)
+        object.__setattr__(self, '_owner', owner)
+
+    def _wrap(self, value: Any) -> Any:
+        """Get read-only view of value
+
+        Args:
+            value (Any): attribute value
+
+        Returns:
+            Any: view of value
+        """
+        if isinstance(value, BaseTool):
+            return ToolView(value, self._viewer, self._owner)
+        if isinstance(value, BasePlayer):
+            return View(value, self._viewer, value.id)
+        if isinstance(value, Base):
+            return View(value, self._viewer, self._owner)
+        if isinstance(value, np.ndarray):
+            view: np.ndarray = value.view()
+            view.flags.writeable = False
+            return view
+        if isinstance(value, (list, tuple, set, deque)):
+            return tuple(self._wrap(v) for v in value)
+        if isinstance(value, Mapping):
+            if any(isinstance(v, BaseModel) for v in value.values()):
+                return MappingProxyType(
+                    {k: self._wrap(v) for k, v in value.items()}
+                        )
+            return MappingProxyType(value)
+        if isinstance(value, BaseModel):
+            return View(value, self._viewer, self._owner)
+        return value
+
+    def _export(self, value: Any) -> Any:
+        """Export value to python types
+
+        Args:
+            value (Any): attribute value
+
+        Returns:
+            Any: exported value
+        """
+        if isinstance(value, Base):
+            return self._wrap(value).dict()
+        if isinstance(value, (list, tuple, set, deque)):
+            return [self._export(v) for v in value]
+        if isinstance(value, Mapping):
+            return {k: self._export(v) for k, v in value.items()}
+        if isinstance(value, BaseModel):
+            return self._wrap(value).dict()
+        return value
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        value = getattr(self._obj, attr)
+        if callable(value):
+            raise AttributeError(f'{attr} is not available in view')
+        return self._wrap(value)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        raise AttributeError(f"Can't set {attr}: view is read-only")
+
+    def __delattr__(self, attr: str) -> None:
+        raise AttributeError(f"Can't delete {attr}: view is read-only")
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self._obj.__class__.__name__}' \
+            + f'(id={getattr(self._obj, "id", None)!r}), ' \
+            + f'viewer={self._viewer!r})'
+
+    def dict(self) -> dict[str, Any]:
+        """Export fields of viewed object, redacted for viewer
+
+        Returns:
+            dict[str, Any]: exported fields
+        """
+        obj = self._obj
+        return {
+            name: self._export(getattr(obj, name))
+            for name in obj.__fields__
+                }
+
+    def json(self, **dumps_kwargs: Any) -> str:
+        """Export fields of viewed object to json, redacted for viewer
+
+        Returns:
+            str: json string
+        """
+        return json.dumps(self.dict(), default=_encoder, **dumps_kwargs)
+
+
+class ToolView(View):
+    """Read-only view of tool for player
+
+    ..
+        Items of current and last item, that aren't visible for
+        viewer by visibility of tool, are replaced by None.
+    """
+    __slots__ = ()
+
+    def _visible(self, item: Base) -> bool:
+        return is_visible(
+            item, self._obj.visibility, self._viewer, self._owner
+                )
+
+    def _item(self, item: Optional[Base]) -> Optional[View]:
+        if item is None or not self._visible(item):
+            return None
+        return View(item, self._viewer, self._owner)
+
+    def __len__(self) -> int:
+        return len(self._obj.current)
+
+    def __iter__(self) -> Iterator[Optional[View]]:
+        for item in self._obj.current:
+            yield self._item(item)
+
+    def __getitem__(self, ind: int) -> Optional[View]:
+        return self._item(self._obj.current[ind])
+
+    @property
+    def current(self) -> tuple[Optional[View], ...]:
+        """Get current items, hidden items are None
+
+        Returns:
+            tuple[Optional[View], ...]: views of items
+        """
+        return tuple(self)
+
+    @property
+    def current_ids(self) -> list[Optional[str]]:
+        """Get ids of current items, ids of hidden items are None
+
+        Returns:
+            list[Optional[str]]: ids of items
+        """
+        return [
+            item.id if self._visible(item) else None
+            for item in self._obj.current
+                ]
+
+    @property
+    def last(self) -> Optional[View]:
+        """Get last item, if visible
+
+        Returns:
+            Optional[View]: view of item
+        """
+        return self._item(self._obj.last)
+
+    def _export(self, value: Any) -> Any:
+        if value is self._obj.current:
+            return [
+                self._export(item) if self._visible(item) else None
+                for item in value
+                    ]
+        if value is self._obj.last and value is not None:
+            return self._export(value) if self._visible(value) else None
+        return super()._export(value)
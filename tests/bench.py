@@ -0,0 +1,102 @@
+import random
+import timeit
+import numpy as np
+from typing import Callable
+from bgameb import Game, Components, Deck, Shaker, Dice, Card
+from bgameb.rng import NumpyRandom, SystemRandom
+
+
+BACKENDS: dict[str, Callable[[], random.Random]] = {
+    'random': lambda: random.Random(42),
+    'numpy-pcg64': lambda: NumpyRandom(42),
+    'numpy-philox': lambda: NumpyRandom(42, bit_generator=np.random.Philox),
+    'system': SystemRandom,
+        }
+
+
+class BenchGame(Game):
+    deck: Deck
+    shaker: Shaker
+
+
+def make_game(rng: random.Random) -> BenchGame:
+    """Make game with deck of 52 cards and shaker of 10 dices
+
+    Args:
+        rng (random.Random): random generator of game
+
+    Returns:
+        BenchGame
+    """
+    comp = Components[Dice]()
+    comp.update(Dice(id='dice', sides=6, count=10))
+    cards = Components[Card]()
+    for ind in range(52):
+        cards.update(Card(id=f'card{ind}'))
+    G = BenchGame(
+        id='bench', rng=rng, deck=Deck(id='deck'), shaker=Shaker(id='shaker')
+            )
+    G.deck.deal(cards)
+    G.shaker.deal(comp)
+    return G
+
+
+def throughput(rng: random.Random, number: int = 2000) -> dict[str, float]:
+    """Measure draws per second of shuffle, roll and sample
+
+    Args:
+        rng (random.Random): random generator
+        number (int, optional): count of calls. Default to 2000.
+
+    Returns:
+        dict[str, float]: draws per second by operations
+    """
+    G = make_game(rng)
+    return {
+        'shuffle': 52 * number / timeit.timeit(G.deck.shuffle, number=number),
+        'roll': 10 * number / timeit.timeit(G.shaker.roll, number=number),
+        'sample': 5 * number / timeit.timeit(
+            lambda: G.deck.get_random(5, remove=False), number=number
+                ),
+            }
+
+
+def quality(rng: random.Random, n: int = 20000) -> dict[str, float]:
+    """Get chi-square statistics of rolls of dices and of top card
+    of shuffled deck against uniform distribution. Values are
+    compared with critical values 20.5 for 5 and 89.3 for 51
+    degrees of freedom by significance level 0.001.
+
+    Args:
+        rng (random.Random): random generator
+        n (int, optional): count of trials. Default to 20000.
+
+    Returns:
+        dict[str, float]: statistics by operations
+    """
+    G = make_game(rng)
+    G.shaker.history_size = n
+    top = np.zeros(52)
+    for _ in range(n):
+        G.shaker.roll()
+        G.deck.shuffle()
+        top[int(G.deck.current[0].id[4:])] += 1
+    history = G.shaker.history
+    assert history is not None
+    return {
+        'roll': history['dice']['chi_square'],
+        'shuffle': float(((top - n / 52) ** 2 / (n / 52)).sum()),
+            }
+
+
+if __name__ == '__main__':
+    print(f'{"backend":<14}{"shuffle/s":>14}{"roll/s":>14}{"sample/s":>14}'
+          f'{"roll chi2":>12}{"shuffle chi2":>14}')
+    for name, backend in BACKENDS.items():
+        speed = throughput(backend())
+        stats = quality(backend(), n=5000)
+        print(
+            f'{name:<14}{speed["shuffle"]:>14,.0f}{speed["roll"]:>14,.0f}'
+            f'{speed["sample"]:>14,.0f}{stats["roll"]:>12.1f}'
+            f'{stats["shuffle"]:>14.1f}'
+                )
@@ -0,0 +1,141 @@
+import pytest
+from collections.abc import Sequence
+from bgameb.base import Components
+from bgameb.items import Card, Dice
+from bgameb.tools import Deck
+from bgameb.catalog import (
+    write_catalog,
+    iter_items,
+    load_components,
+    Catalog,
+    CatalogComponents,
+        )
+from bgameb.errors import ComponentNameError, ComponentReadOnlyError
+
+
+class TestCatalog:
+    """Test catalog file and CatalogComponents class
+    """
+
+    @pytest.fixture
+    def path(self, tmp_path) -> str:
+        comp: Components = Components()
+        for n in range(5):
+            comp.update(Card(id=f'card {n}', count=n + 1))
+        comp.update(Dice(id='dice', sides=6))
+        path = str(tmp_path / 'items.cat')
+        assert write_catalog(path, comp) == 6, 'wrong count'
+        return path
+
+    def test_write_catalog(self, path: str, tmp_path) -> None:
+        """Test catalog file is written and opened
+        """
+        catalog = Catalog(path)
+        assert len(catalog) == 6, 'wrong len'
+        assert list(catalog.names)[-1] == 'dice', 'names not sorted'
+        assert 'card 3' in catalog.ids, 'id not found'
+        assert catalog.id_of(catalog.by_id('card 3')) == 'card 3', \
+            'wrong position'
+        assert catalog.by_id('unknown') == -1, 'wrong missing'
+        assert isinstance(catalog.load(catalog.by_id('dice')), Dice), \
+            'wrong class'
+        with pytest.raises(
+            ComponentNameError,
+            match='is exist'
+                ):
+            write_catalog(
+                str(tmp_path / 'bad.cat'),
+                [Card(id='card'), Card(id='card')]
+                    )
+
+    def test_catalog_components(self, path: str) -> None:
+        """Test CatalogComponents access and cache
+        """
+        comp = CatalogComponents[Card](path, maxsize=2)
+        assert len(comp) == 6, 'wrong len'
+        assert 'card_1' in comp, 'name not found'
+        assert comp.card_1.count == 2, 'wrong item'
+        assert comp['card_1'] is comp.card_1, 'item not cached'
+        comp['card_2'], comp['card_3']
+        assert len(comp._cache) == 2, 'cache not bounded'
+        assert comp.by_id('dice').sides == 6, 'wrong by_id'
+        assert list(comp.keys())[0] == 'card_0', 'wrong keys'
+        assert isinstance(comp.ids, Sequence), 'ids is not a sequence'
+        assert 'dice' in comp.ids and len(comp.ids) == 6, 'wrong ids'
+        with pytest.raises(AttributeError):
+            comp.card_9
+        with pytest.raises(ComponentReadOnlyError):
+            comp.update(Card(id='new'))
+        with pytest.raises(ComponentReadOnlyError):
+            del comp['card_1']
+
+    def test_deal_from_catalog(self, path: str) -> None:
+        """Test deal of deck from catalog
+        """
+        comp = CatalogComponents[Card](path)
+        deck = Deck(id='deck')
+        deck.deal(comp, ['card 1', 'card 2', 'dice'])
+        assert deck.current_ids == ['card 1', 'card 2'], 'wrong deal'
+        assert deck.current[0] is not comp.card_1, 'card not copied'
+
+    def test_close_catalog(self, path: str) -> None:
+        """Test mapping of catalog file is closed
+        """
+        with Catalog(path) as catalog:
+            assert catalog.id_of(0) == 'card 0', 'wrong id'
+        assert catalog._mmap.closed, 'mapping not closed'
+        catalog.close()
+        with CatalogComponents[Card](path) as comp:
+            assert comp.card_0.count == 1, 'wrong item'
+        assert comp.catalog._mmap.closed, 'mapping not closed'
+        assert not comp._cache, 'cache not cleared'
+
+
+class TestLoader:
+    """Test loading of items from JSON Lines and CSV files
+    """
+
+    def test_load_jsonl(self, tmp_path) -> None:
+        """Test load_components() from JSON Lines with broken records
+        """
+        path = tmp_path / 'items.jsonl'
+        path.write_text(
+            '{"kind": "card", "id": "card 1", "count": 2}\n'
+            '\n'
+            '{"kind": "dice", "id": "dice", "sides": 6}\n'
+            '{"kind": "dice", "id": "bad", "sides": "many"}\n'
+            '{"kind": "coin", "id": "coin"}\n'
+            'not json\n'
+            '{"kind": "card", "id": "card_1"}\n'
+            '{"kind": "dice", "id": "part", "sides": 2, "mapping": {"1": 1}}\n'
+                )
+        comp, errors = load_components(
+            str(path), {'card': Card, 'dice': Dice}, batch_size=2
+                )
+        assert list(comp) == ['card_1', 'dice'], 'wrong components'
+        assert comp.card_1.count == 2, 'wrong item'
+        assert isinstance(comp.dice, Dice), 'wrong class'
+        assert [error.line for error in errors] == [4, 5, 6, 7, 8], \
+            'wrong errors'
+        assert errors[0].id == 'bad', 'wrong id of error'
+        assert 'Unknown kind' in errors[1].message, 'wrong message'
+        assert errors[4].id == 'part', 'wrong id of bad mapping'
+
+    def test_load_csv(self, tmp_path) -> None:
+        """Test iter_items() from CSV to catalog
+        """
+        path = tmp_path / 'items.csv'
+        path.write_text(
+            'id,sides,mapping\n'
+            'd6,6,\n'
+            'coin,2,"{""1"": ""head"", ""2"": ""tail""}"\n'
+            'bad,0,\n'
+                )
+        errors: list = []
+        items = iter_items(str(path), Dice, errors=errors)
+        assert write_catalog(str(tmp_path / 'dices.cat'), items) == 2, \
+            'wrong count'
+        comp = CatalogComponents[Dice](str(tmp_path / 'dices.cat'))
+        assert comp.d6.sides == 6, 'wrong sides'
+        assert comp.coin.mapping == {1: 'head', 2: 'tail'}, 'wrong mapping'
+        assert len(errors) == 1 and errors[0].line == 4, 'wrong errors'
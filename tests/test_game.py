@@ -1,5 +1,13 @@
+import os
+import gc
+import random
+from typing import Union
 import pytest
-from bgameb import Game, Components
+from bgameb import (
+    Game, Components, Player, Shaker, Deck, CompactDeck, Steps, Dice, Card,
+    Step, MemmapCardCodes
+        )
+from bgameb.stores import SavedCodes
 
 
 class TestGame:
@@ -22,3 +30,169 @@ class TestGame:
         G = MyGame(id='this', c=Components())
         assert G.id == 'this', 'wrong game'
         assert isinstance(G.c, Components), 'wrong components'
+
+    def test_game_random(self) -> None:
+        """Test seeded games are reproducible and independent
+        """
+        class MyPlayer(Player):
+            deck: Deck
+
+        class MyGame(Game):
+            shaker: Shaker
+            me: MyPlayer
+
+        comp = Components[Union[Dice, Card]]()
+        comp.update(Dice(id='dice', sides=6, count=5))
+        comp.update(Card(id='card', count=10))
+        comp.update(Card(id='other', count=10))
+
+        def play(seed: int) -> tuple[MyGame, list]:
+            G = MyGame(
+                id='game',
+                seed=seed,
+                shaker=Shaker(id='shaker'),
+                me=MyPlayer(id='me', deck=Deck(id='deck'))
+                    )
+            G.shaker.deal(comp)
+            G.me.deck.deal(comp).shuffle()
+            return G, [
+                G.shaker.roll(),
+                G.me.deck.current_ids,
+                [card.id for card in G.me.deck.get_random(3)],
+                    ]
+
+        G, result = play(1)
+        assert play(1)[1] == result, 'not reproducible'
+        assert play(2)[1] != result, 'not independent'
+        state = G.get_random_state()
+        rolls = G.shaker.roll()
+        G.set_random_state(state)
+        assert G.shaker.roll() == rolls, 'state is not restored'
+        G.me.deck = Deck(id='new')
+        assert G.me.deck._rng() is G._rng(), 'tool is not bound'
+        assert Deck(id='free')._rng() is random, 'wrong global generator'
+        assert G.seed(1) is G and G._rng() is not random, \
+            'wrong seed'
+        generator = G._np_rng()
+        assert G.me.deck._np_rng() is generator, 'numpy is not shared'
+        rolls = G.shaker.roll_many(5)
+        state = G.get_random_state()
+        histogram = G.shaker.roll_histogram()['dice']
+        G.seed(1)
+        assert G._np_rng() is generator, 'numpy is not reseeded in place'
+        assert (G.shaker.roll_many(5)['dice'] == rolls['dice']).all(), \
+            'numpy is not seeded'
+        G.set_random_state(state)
+        assert (G.shaker.roll_histogram()['dice'] == histogram).all(), \
+            'numpy state is not restored'
+
+    def test_game_snapshot(self) -> None:
+        """Test snapshot and restore of game
+        """
+        class MyPlayer(Player):
+            deck: Deck
+
+        class MyGame(Game):
+            shaker: Shaker
+            steps: Steps
+            me: MyPlayer
+
+        comp = Components[Union[Dice, Card, Step]]()
+        comp.update(Dice(id='dice', sides=6, count=5))
+        comp.update(Card(id='card', count=50))
+        comp.update(Step(id='first', priority=1))
+        comp.update(Step(id='second', priority=2))
+        G = MyGame(
+            id='game',
+            seed=1,
+            shaker=Shaker(id='shaker'),
+            steps=Steps(id='steps'),
+            me=MyPlayer(id='me', deck=Deck(id='deck'))
+                )
+        G.shaker.deal(comp)
+        G.steps.deal(comp)
+        G.me.deck.deal(comp)
+        snapshot = G.snapshot()
+        assert G.snapshot() is snapshot, 'unchanged game is copied'
+        data = G.dict()
+        rolls = G.shaker.roll()
+        order = [G.steps.next().id for _ in range(3)]
+
+        G.restore(snapshot)
+        G.me.deck.shuffle()
+        G.me.deck.open([0, 1])
+        G.me.deck.current[2].tap(side='left')
+        G.me.deck.pop()
+        G.steps.pops()
+        G.steps.push(Step(id='third'))
+        G.shaker.roll()
+        changed = G.snapshot()
+        assert changed.frame.values['shaker'] \
+            is not snapshot.frame.values['shaker'], 'changes are lost'
+        cards = [
+            saved.frame.values['me'].values['deck'].values['current'].content
+            for saved in (snapshot, changed)
+                ]
+        assert sum(frame in cards[0] for frame in cards[1]) == 46, \
+            'unchanged cards are copied'
+
+        G.restore(snapshot)
+        assert G.dict() == data, 'wrong restore'
+        assert G.me.deck.revealed_mask().sum() == 0, 'flags are not restored'
+        assert len(G.me.deck.remaining) == 50, 'counts are not restored'
+        assert len(G.me.deck._states) == 50, 'cards are not bound'
+        assert G.shaker.roll() == rolls, 'random state is not restored'
+        assert [G.steps.next().id for _ in range(3)] == order, \
+            'steps are not restored'
+        G.restore(changed)
+        assert len(G.me.deck.current) == 49, 'wrong restore'
+        assert G.me.deck.revealed_mask().sum() == 2, 'flags are not restored'
+        assert len(G.me.deck.remaining) == 47, 'counts are not restored'
+        assert G.steps.current_ids[0] == 'third', 'steps are not restored'
+        with pytest.raises(ValueError, match='other game'):
+            MyGame(
+                id='game',
+                shaker=Shaker(id='shaker'),
+                steps=Steps(id='steps'),
+                me=MyPlayer(id='me', deck=Deck(id='deck'))
+                    ).restore(snapshot)
+
+    def test_game_snapshot_memmap(self, tmp_path) -> None:
+        """Test snapshot of memory-mapped compact deck is saved to file
+        """
+        class MyGame(Game):
+            pile: CompactDeck
+
+        comp = Components[Card]()
+        comp.update(Card(id='card', count=10))
+        comp.update(Card(id='other', count=10))
+        G = MyGame(
+            id='game',
+            seed=1,
+            pile=CompactDeck(
+                id='pile',
+                current=MemmapCardCodes(path=str(tmp_path / 'pile'), chunk=3)
+                    )
+                )
+        G.pile.deal(comp)
+        ids = G.pile.current_ids
+        snapshot = G.snapshot()
+        saved = snapshot.frame.values['pile'].values['current'].content
+        assert isinstance(saved, SavedCodes), 'codes are copied to memory'
+        assert os.path.getsize(saved.path) == 20 * 2, 'wrong saved file'
+        G.pile.shuffle()
+        G.pile.pop()
+        changed = G.snapshot()
+        shuffled = G.pile.current_ids
+        content = changed.frame.values['pile'].values['current'].content
+        assert content is not saved, 'changes are lost'
+        G.restore(snapshot)
+        assert G.pile.current_ids == ids, 'wrong restore'
+        assert G.snapshot() is snapshot, 'unchanged codes are saved again'
+        G.restore(changed)
+        assert G.pile.current_ids == shuffled, 'wrong restore'
+        path = saved.path
+        del snapshot, saved
+        G._snapshot = None
+        gc.collect()
+        assert not os.path.exists(path), 'saved file is not removed'
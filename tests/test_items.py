@@ -1,5 +1,6 @@
 import json
 import pytest
+import numpy as np
 from pydantic import BaseModel
 from pydantic.error_wrappers import ValidationError
 from bgameb.items import Dice, Card, Step, BaseItem
@@ -132,6 +133,148 @@ class TestDices:
         assert isinstance(result, list), 'roll returns not list'
         assert len(result) == 0, 'wrong count of rolls'
 
+    def test_dice_roll_many(self) -> None:
+        """Test roll_many() and roll_mapped_many()
+        """
+        obj_ = Dice(id='dice', count=3, sides=6)
+        with FixedSeed(42):
+            result = obj_.roll_many(1000)
+        assert result.shape == (1000, 3), 'wrong shape'
+        assert result.min() == 1 and result.max() == 6, 'wrong range'
+        assert obj_.last_roll == result[-1].tolist(), 'wrong last'
+        with FixedSeed(42):
+            assert (obj_.roll_many(1000) == result).all(), 'not seeded'
+        assert obj_.roll_many(0).shape == (0, 3), 'wrong empty'
+        assert obj_.roll_mapped_many(2).shape == (2, 0), 'wrong unmapped'
+        obj_.mapping = {n: str(n) for n in obj_._range}
+        mapped = obj_.roll_mapped_many(10)
+        assert mapped.shape == (10, 3), 'wrong shape'
+        assert obj_.last_roll_mapped == mapped[-1].tolist(), 'wrong last'
+        assert obj_.last_roll == [int(v) for v in mapped[-1]], \
+            'wrong last roll'
+
+    def test_dice_roll_histogram(self) -> None:
+        """Test roll_histogram() and successes()
+        """
+        obj_ = Dice(id='dice', count=10000, sides=6)
+        histogram = obj_.roll_histogram()
+        assert histogram.shape == (6, ), 'wrong shape'
+        assert histogram.sum() == 10000, 'wrong count'
+        assert obj_.last_histogram == histogram.tolist(), 'wrong last'
+        assert obj_.successes(5) == histogram[4:].sum(), 'wrong successes'
+        assert obj_.successes(1) == 10000, 'wrong successes'
+        histograms = obj_.roll_histogram_many(50)
+        assert histograms.shape == (50, 6), 'wrong shape'
+        assert (histograms.sum(axis=1) == 10000).all(), 'wrong count'
+        assert obj_.successes(7, histograms).tolist() == [0] * 50, \
+            'wrong successes'
+
+    def test_dice_weights(self) -> None:
+        """Test weighted dice
+        """
+        with pytest.raises(
+            StuffDefineError,
+            match='Weights must define values for each side.'
+                ):
+            Dice(id='base', sides=3, weights={1: 1, 2: 1})
+        with pytest.raises(
+            StuffDefineError,
+            match='Weights must have positive sum.'
+                ):
+            Dice(id='base', weights={1: 0, 2: 0})
+        obj_ = Dice(id='dice', sides=3, count=4, weights={1: 0, 2: 1, 3: 3})
+        with FixedSeed(42):
+            result = obj_.roll()
+        assert len(result) == 4 and 1 not in result, 'wrong roll'
+        rolls = obj_.roll_many(20000)
+        assert 1 not in rolls, 'wrong roll_many'
+        assert (rolls == 3).mean() == pytest.approx(0.75, abs=0.02), \
+            'wrong weights'
+        assert obj_.sum_distribution()[12] == pytest.approx(0.75 ** 4), \
+            'wrong distribution'
+        assert obj_.roll_histogram()[0] == 0, 'wrong histogram'
+        obj_.weights = {1: 1, 2: 0, 3: 0}
+        assert obj_.roll() == [1, 1, 1, 1], 'table not rebuilt'
+
+    def test_dice_modifiers(self) -> None:
+        """Test reroll, explode and keep modifiers
+        """
+        with pytest.raises(
+            StuffDefineError,
+            match='Modifiers must be in range of sides.'
+                ):
+            Dice(id='dice', sides=6, reroll={7})
+        with pytest.raises(StuffDefineError, match='Keep only'):
+            Dice(id='dice', keep_highest=1, keep_lowest=1)
+        obj_ = Dice(id='dice', sides=6, count=4, keep_highest=3, success=5)
+        rolls = obj_.roll_many(1000)
+        assert rolls.shape == (1000, 3), 'wrong shape'
+        assert (np.diff(rolls, axis=1) >= 0).all(), 'not sorted'
+        assert obj_.count_successes(rolls).shape == (1000, ), \
+            'wrong successes'
+        assert len(obj_.roll()) == 3, 'wrong roll'
+        assert obj_.count_successes() == sum(
+            r >= 5 for r in obj_.last_roll
+                ), 'wrong successes'
+        obj_ = Dice(id='dice', sides=6, reroll={1, 2, 3, 4, 5, 6})
+        assert obj_.modify([[1, 2], [3, 4]]).shape == (2, 2), 'wrong modify'
+        obj_ = Dice(id='dice', sides=2, explode=2, explode_limit=3)
+        rolls = obj_.roll_many(1000)
+        assert rolls.max() <= 8 and (rolls == 1).any(), 'wrong explode'
+        obj_.mapping = {1: 'one', 2: 'two'}
+        mapped = obj_.roll_mapped_many(100)
+        assert set(mapped.ravel()) <= {'one', None}, 'wrong mapped'
+        assert obj_.modify([[1, 2]], np.random.default_rng(0))[0, 0] == 1, \
+            'wrong modify'
+
+    def test_dice_modifiers_not_modeled(self) -> None:
+        """Test histograms and distributions of dice with modifiers
+        """
+        obj_ = Dice(id='dice', sides=6, count=4, keep_highest=3)
+        with pytest.raises(StuffDefineError, match='not modeled'):
+            obj_.sum_distribution()
+        with pytest.raises(StuffDefineError, match='not modeled'):
+            obj_.max_distribution()
+        with pytest.raises(StuffDefineError, match='not modeled'):
+            obj_.count_distribution([6])
+        with pytest.raises(StuffDefineError, match='not modeled'):
+            obj_.roll_histogram()
+        obj_ = Dice(id='dice', sides=6, explode=6)
+        with pytest.raises(StuffDefineError, match='not modeled'):
+            obj_.roll_histogram_many(10)
+        obj_.explode = None
+        assert len(obj_.sum_distribution()) == 7, 'wrong distribution'
+
+    def test_dice_history(self) -> None:
+        """Test bounded history of rolls
+        """
+        obj_ = Dice(id='dice', sides=6, count=2)
+        obj_.roll()
+        assert obj_.history is None, 'history is kept'
+        obj_.history_size = 10
+        obj_.roll_many(100)
+        obj_.roll()
+        history = obj_.history
+        assert history is not None, 'history is not kept'
+        assert len(history['rolls']) == 10, 'history is unbounded'
+        assert history['rolls'][-1] == obj_.last_roll, 'wrong last roll'
+        assert sum(history['counts'].values()) == 20, 'wrong counts'
+        assert obj_.dict()['history'] == history, 'history is not exported'
+        obj_.reroll = {1}
+        obj_.roll_many(5)
+        history = obj_.history
+        assert history is not None, 'history of modified dice is lost'
+        assert history['rolls'][-1] == obj_.last_roll, 'rolls are not added'
+        assert history['chi_square'] is None, 'chi-square of modified dice'
+        assert history['mean'] is not None, 'no mean of modified dice'
+        obj_ = Dice(
+            id='dice', sides=6, history_size=10000,
+            weights={1: 5, 2: 1, 3: 1, 4: 1, 5: 1, 6: 1}
+                )
+        obj_.roll_many(10000)
+        assert obj_.history['chi_square'] < 20.5, \
+            'chi-square is not counted against weights'
+
 
 class TestCard:
     """Test Card classes"""
@@ -0,0 +1,120 @@
+import itertools
+import pytest
+import numpy as np
+from collections import Counter
+from bgameb import odds
+from bgameb.items import Dice
+
+
+class TestOdds:
+    """Test exact distributions of dices
+    """
+
+    @pytest.fixture
+    def pool(self) -> odds.PoolKey:
+        return odds.pool_key([
+            Dice(id='d4', sides=4)._key(),
+            Dice(id='d6', sides=6, count=2)._key(),
+                ])
+
+    @pytest.fixture
+    def rolls(self) -> list[tuple[int, ...]]:
+        return list(itertools.product(range(1, 5), range(1, 7), range(1, 7)))
+
+    def test_sum_and_max_distribution(
+        self,
+        pool: odds.PoolKey,
+        rolls: list[tuple[int, ...]]
+            ) -> None:
+        """Test sum_distribution() and max_distribution()
+        """
+        sums = np.bincount([sum(roll) for roll in rolls]) / len(rolls)
+        maxs = np.bincount([max(roll) for roll in rolls]) / len(rolls)
+        assert np.allclose(odds.sum_distribution(pool), sums), 'wrong sum'
+        assert np.allclose(odds.max_distribution(pool), maxs), 'wrong max'
+        assert odds.sum_distribution(pool) is odds.sum_distribution(pool), \
+            'not memoized'
+        with pytest.raises(ValueError):
+            odds.sum_distribution(pool)[0] = 1
+
+    def test_count_distribution(
+        self,
+        pool: odds.PoolKey,
+        rolls: list[tuple[int, ...]]
+            ) -> None:
+        """Test count_distribution()
+        """
+        counts = np.bincount(
+            [sum(face >= 4 for face in roll) for roll in rolls]
+                ) / len(rolls)
+        result = odds.count_distribution(pool, frozenset([4, 5, 6]))
+        assert np.allclose(result, counts), 'wrong counts'
+        assert odds.at_least(result, 2) == pytest.approx(counts[2:].sum()), \
+            'wrong at_least'
+        assert odds.at_most(result, 0) == pytest.approx(counts[0]), \
+            'wrong at_most'
+
+    def test_big_pool(self) -> None:
+        """Test distribution of sum of big pool is normalized
+        """
+        dice = Dice(id='dice', count=5000, sides=6)
+        result = dice.sum_distribution()
+        assert result.sum() == pytest.approx(1.0), 'not normalized'
+        assert int(np.argmax(result)) in (17499, 17500), 'wrong mode'
+
+    def test_dice_mapped_distribution(self) -> None:
+        """Test mapped_distribution() of dice
+        """
+        dice = Dice(
+            id='dice', count=2, sides=3, mapping={1: 'a', 2: 'b', 3: 'a'}
+                )
+        assert np.allclose(
+            dice.mapped_distribution('a'), [1 / 9, 4 / 9, 4 / 9]
+                ), 'wrong mapped'
+
+
+class TestCardCounter:
+    """Test exact draw odds of cards
+    """
+
+    @pytest.fixture
+    def deck(self) -> list[str]:
+        return ['x'] * 3 + ['y'] * 2 + ['z'] * 5
+
+    @staticmethod
+    def brute(deck: list[str], draws: int, wanted: dict[str, int]) -> float:
+        hands = list(itertools.combinations(deck, draws))
+        return sum(
+            all(hand.count(id) >= need for id, need in wanted.items())
+            for hand in hands
+                ) / len(hands)
+
+    def test_draw_odds(self, deck: list[str]) -> None:
+        """Test hypergeometric queries are equal to enumeration
+        """
+        counter = odds.CardCounter(Counter(deck))
+        for draws in range(len(deck) + 1):
+            assert counter.at_least('x', draws, 2) == pytest.approx(
+                self.brute(deck, draws, {'x': 2})
+                    ), 'wrong at least'
+            assert counter.at_least_all({'x': 1, 'y': 2}, draws) == \
+                pytest.approx(self.brute(deck, draws, {'x': 1, 'y': 2})), \
+                'wrong at least all'
+            assert counter.distribution('y', draws).sum() == \
+                pytest.approx(1.0), 'not normalized'
+        assert counter.expected('x', 5) == pytest.approx(1.5), \
+            'wrong expected'
+        assert counter.at_least('w', 5) == 0.0, 'wrong absent card'
+
+    def test_seen_and_add(self, deck: list[str]) -> None:
+        """Test counts are updated by seen cards
+        """
+        counter = odds.CardCounter(Counter(deck))
+        counter.seen('x', 3)
+        assert len(counter) == 7 and 'x' not in counter.counts, \
+            'wrong seen'
+        assert counter.at_least('x', 5) == 0.0, 'wrong odds'
+        with pytest.raises(ValueError, match='Only 0 cards x remain'):
+            counter.seen('x')
+        counter.add('x')
+        assert counter.expected('x') == 1.0, 'wrong add'
@@ -0,0 +1,69 @@
+import pickle
+import random
+import pytest
+import numpy as np
+from bgameb import Game, Shaker, Dice
+from bgameb.rng import NumpyRandom, SystemRandom
+from tests.bench import BACKENDS, quality
+
+
+class TestNumpyRandom:
+    """Test NumpyRandom class
+    """
+
+    def test_reproducible(self) -> None:
+        """Test generator is reproducible by seed and state
+        """
+        rng, other = NumpyRandom(42), NumpyRandom(42)
+        assert [rng.randrange(100) for _ in range(3000)] == [
+            other.randrange(100) for _ in range(3000)
+                ], 'not reproducible'
+        state = rng.getstate()
+        values = [rng.random() for _ in range(3000)]
+        rng.setstate(state)
+        assert [rng.random() for _ in range(3000)] == values, \
+            'state is not restored'
+        copy = pickle.loads(pickle.dumps(rng))
+        assert copy.getrandbits(100) == rng.getrandbits(100), \
+            'not pickled'
+        assert NumpyRandom('seed').random() == NumpyRandom('seed').random(), \
+            'wrong string seed'
+
+    def test_bits_and_substreams(self) -> None:
+        """Test range of random bits and independence of substreams
+        """
+        rng = NumpyRandom(1, bit_generator=np.random.Philox)
+        for k in (0, 1, 31, 32, 33, 64, 100):
+            assert all(0 <= rng.getrandbits(k) < 2 ** k for _ in range(50)), \
+                f'wrong {k} bits'
+        with pytest.raises(ValueError):
+            rng.getrandbits(-1)
+        streams = rng.spawn(3)
+        assert len({stream.random() for stream in streams}) == 3, \
+            'substreams are not independent'
+
+    def test_game_backend(self) -> None:
+        """Test game uses given random generator
+        """
+        class MyGame(Game):
+            shaker: Shaker
+
+        def roll(rng: random.Random) -> dict:
+            G = MyGame(id='game', rng=rng, seed=7, shaker=Shaker(id='s'))
+            G.shaker.current.append(Dice(id='dice', sides=6, count=5))
+            return dict(G.shaker.roll())
+
+        assert roll(NumpyRandom()) == roll(NumpyRandom()), 'not seeded'
+        G = Game(id='game', rng=SystemRandom())
+        assert isinstance(G._rng(), SystemRandom), 'wrong backend'
+        G.set_random(NumpyRandom(1))
+        assert G._np_rng() is G._rng().generator, 'numpy is not shared'
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize('name', list(BACKENDS))
+    def test_backends_quality(self, name: str) -> None:
+        """Test chi-square of rolls and shuffles of backends
+        """
+        stats = quality(BACKENDS[name]())
+        assert stats['roll'] < 20.5, 'rolls are not uniform'
+        assert stats['shuffle'] < 89.3, 'shuffles are not uniform'
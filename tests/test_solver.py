@@ -0,0 +1,51 @@
+import pytest
+from bgameb.items import Dice
+from bgameb.tools import Shaker
+from bgameb.solver import RerollSolver
+from bgameb.errors import StuffDefineError
+
+
+class TestRerollSolver:
+    """Test RerollSolver class
+    """
+
+    @pytest.fixture
+    def shaker(self) -> Shaker:
+        shaker = Shaker(id='shaker')
+        shaker.append(Dice(id='dice', sides=6, count=3))
+        return shaker
+
+    def test_solver_sum(self, shaker: Shaker) -> None:
+        """Test expected values and decisions for sum of dices
+        """
+        solver = RerollSolver(shaker, lambda rolls: sum(rolls['dice']))
+        assert solver.expected(0) == pytest.approx(10.5), 'wrong ev'
+        assert solver.expected(1) == pytest.approx(12.75), 'wrong ev'
+        keep, ev = solver.best({'dice': [6, 1, 4]}, 1)
+        assert keep == {'dice': (4, 6)}, 'wrong keep'
+        assert ev == pytest.approx(13.5), 'wrong ev'
+        assert solver.value({'dice': [6, 6, 6]}, 2) == 18, 'wrong value'
+        with pytest.raises(ValueError, match='all dices'):
+            solver.best({'dice': [6]}, 1)
+        shaker.append(Dice(id='mod', sides=6, reroll={1}))
+        with pytest.raises(StuffDefineError):
+            RerollSolver(shaker, lambda rolls: 0.0)
+
+    def test_solver_save_and_load(self, shaker: Shaker, tmp_path) -> None:
+        """Test table is saved and reloaded
+        """
+        def score(rolls):
+            return 1.0 if len(set(rolls['dice'])) == 1 else 0.0
+
+        solver = RerollSolver(shaker, score)
+        ev = solver.expected(2)
+        path = str(tmp_path / 'table.json')
+        solver.save(path)
+        loaded = RerollSolver(shaker, score, path)
+        assert loaded.table == solver.table, 'wrong table'
+        assert loaded.best({'dice': [1, 1, 2]}, 2)[0] == {'dice': (1, 1)}, \
+            'wrong keep'
+        assert ev == pytest.approx(solver.expected(2)), 'wrong ev'
+        shaker.current[0].weights = {side: side for side in range(1, 7)}
+        with pytest.raises(ValueError, match='other dices'):
+            RerollSolver(shaker, score, path)
@@ -0,0 +1,171 @@
+import os
+import pytest
+import numpy as np
+from bgameb.items import Card
+from bgameb.stores import (
+    CardStates,
+    CardCodes,
+    MemmapCardCodes,
+    RollHistory,
+        )
+
+
+class TestCardStates:
+    """Test CardStates class
+    """
+
+    def test_bind_and_release(self) -> None:
+        """Test bind() and release() of cards
+        """
+        states = CardStates()
+        cards = [Card(id=str(n), is_revealed=bool(n % 2)) for n in range(10)]
+        slots = states.slots(cards)
+        assert slots.tolist() == list(range(10)), 'wrong slots'
+        assert len(states) == 10, 'wrong len'
+        assert states.revealed[:10].tolist() == [False, True] * 5, \
+            'wrong flags'
+        states.release(cards[3])
+        assert cards[3]._states is None, 'not released'
+        assert len(states) == 9, 'wrong len'
+        card = Card(id='new')
+        assert states.bind(card) == 3, 'slot not reused'
+        states.clear()
+        assert card._states is None, 'not cleared'
+        assert len(states) == 0, 'wrong len'
+
+    def test_batch_writes_only_changed(self) -> None:
+        """Test batch operations change store and cards
+        """
+        states = CardStates()
+        cards = [Card(id=str(n)) for n in range(4)]
+        slots = states.slots(cards)
+        assert states.reveal(slots[:2]) == 2, 'wrong changed count'
+        assert states.reveal(slots) == 2, 'wrong changed count'
+        assert all(card.is_revealed for card in cards), 'not opened'
+        assert states.tap(np.array([1, 2]), 'left') == 2, 'wrong count'
+        assert cards[1].side == 'left', 'wrong side'
+        assert states.tap(slots, None, True) == 2, 'wrong count'
+        assert cards[2].is_active and cards[2].side is None, 'not untapped'
+        cards[0].tap()
+        assert not states.active[0], 'card change not stored'
+        assert states.sides[states.side[0]] == 'right', 'wrong side code'
+
+
+class TestCardCodes:
+    """Test CardCodes and MemmapCardCodes classes
+    """
+
+    @pytest.fixture
+    def cards(self) -> list[Card]:
+        return [Card(id=f'card{n}') for n in range(5)]
+
+    @pytest.fixture(params=['memory', 'memmap'])
+    def codes(self, request, tmp_path) -> CardCodes:
+        if request.param == 'memory':
+            return CardCodes()
+        return MemmapCardCodes(path=str(tmp_path / 'deck.codes'), chunk=3)
+
+    def test_codes_deque_methods(
+        self,
+        codes: CardCodes,
+        cards: list[Card]
+            ) -> None:
+        """Test deque-like methods of codes
+        """
+        codes.extend(cards)
+        codes.fill(cards[0], 10)
+        codes.appendleft(cards[4])
+        codes.extendleft(cards[:2])
+        assert len(codes) == 18, 'wrong len'
+        assert len(codes.types) == 5, 'wrong types'
+        ids = codes.ids()
+        assert ids[:4] == ['card1', 'card0', 'card4', 'card0'], \
+            'wrong order'
+        assert codes.count('card0') == 12, 'wrong count'
+        assert codes.find('card0', 3).tolist() == [1, 3, 8], 'wrong find'
+        codes.rotate(4)
+        assert codes.ids() == ids[-4:] + ids[:-4], 'wrong rotation'
+        codes.reverse()
+        ids = (ids[-4:] + ids[:-4])[::-1]
+        assert codes.ids() == ids, 'not reversed'
+        assert codes.pop().id == ids[-1], 'wrong pop'
+        assert codes.popleft().id == ids[0], 'wrong popleft'
+        assert [card.id for card in codes] == ids[1:-1], 'wrong iteration'
+
+    def test_codes_take_and_shuffle(
+        self,
+        codes: CardCodes,
+        cards: list[Card]
+            ) -> None:
+        """Test take() and shuffle() of codes
+        """
+        codes.extend(cards * 3)
+        taken = codes.take(np.array([0, 6, 14]), remove=True)
+        assert [card.id for card in taken] == ['card0', 'card1', 'card4'], \
+            'wrong take'
+        assert len(codes) == 12, 'not removed'
+        assert codes.ids()[:6] == \
+            ['card1', 'card2', 'card3', 'card4', 'card0', 'card2'], \
+            'wrong removing'
+        ids = codes.ids()
+        codes.shuffle(np.random.default_rng(42))
+        assert codes.ids() != ids, 'not shuffled'
+        assert sorted(codes.ids()) == sorted(ids), 'cards lost'
+
+    def test_codes_widen(self, codes: CardCodes) -> None:
+        """Test dtype of codes is widen for many types
+        """
+        codes.fill(Card(id='first'), 5)
+        codes.types.extend([Card(id='x')] * (1 << 16))
+        codes.append(Card(id='last'))
+        assert codes.codes.dtype == np.uint32, 'not widen'
+        assert codes.ids() == ['first'] * 5 + ['last'], 'codes lost'
+
+    def test_memmap_temporary_file(self, cards: list[Card]) -> None:
+        """Test temporary file of memmap codes is removed with object
+        """
+        codes = MemmapCardCodes(cards)
+        path = codes.path
+        assert os.path.exists(path), 'file not created'
+        assert codes.ids() == [card.id for card in cards], 'wrong codes'
+        del codes
+        assert not os.path.exists(path), 'file not removed'
+
+
+class TestRollHistory:
+    """Test RollHistory class
+    """
+
+    def test_running_statistics(self) -> None:
+        """Test statistics are equal to statistics of kept rolls
+        """
+        history = RollHistory(size=50, sides=6)
+        assert history.mean is None and history.chi_square is None, \
+            'wrong empty history'
+        rolls = np.random.default_rng(0).integers(1, 7, size=(200, 3))
+        history.extend(rolls.tolist())
+        assert len(history) == 50, 'history is unbounded'
+        values = rolls[-50:].ravel()
+        counts = np.bincount(values, minlength=7)[1:]
+        assert dict(history.counts) == dict(enumerate(counts, 1)), \
+            'wrong counts'
+        assert history.mean == pytest.approx(values.mean()), 'wrong mean'
+        assert history.variance == pytest.approx(values.var()), \
+            'wrong variance'
+        expected = len(values) / 6
+        assert history.chi_square == pytest.approx(
+            ((counts - expected) ** 2 / expected).sum()
+                ), 'wrong chi-square'
+        stats = history.stats()
+        assert stats['rolls'][-1] == rolls[-1].tolist(), 'wrong rolls'
+        probs = (0.5, 0.1, 0.1, 0.1, 0.1, 0.1)
+        history.probs = probs
+        expected = len(values) * np.array(probs)
+        assert history.chi_square == pytest.approx(
+            ((counts - expected) ** 2 / expected).sum()
+                ), 'wrong chi-square against probabilities'
+        history.modeled = False
+        assert history.chi_square is None, 'chi-square of unknown dice'
+        history.clear()
+        assert not history.counts and history.variance is None, \
+            'history is not cleared'
@@ -0,0 +1,187 @@
+import pytest
+import numpy as np
+from typing import Union
+from bgameb import (
+    Game, Player, Components, Shaker, Deck, CompactDeck, Bag, Dice, Card
+        )
+from bgameb.tape import Tape
+from bgameb.errors import TapeError
+
+
+class TestTape:
+    """Test Tape class
+    """
+
+    def test_put_and_take(self, tmp_path) -> None:
+        """Test outcomes are replayed in order
+        """
+        tape = Tape()
+        tape.put(Tape.ROLL, [1, 6])
+        tape.put(Tape.SHUFFLE, [])
+        tape.put(Tape.SAMPLE, [3])
+        path = str(tmp_path / 'game.tape')
+        tape.save(path)
+        tape = Tape.load(path)
+        assert tape.take(Tape.ROLL) == [1, 6], 'wrong roll'
+        assert tape.take(Tape.SHUFFLE) == [], 'wrong shuffle'
+        with pytest.raises(TapeError, match='Expected roll'):
+            tape.take(Tape.ROLL)
+        assert tape.take(Tape.SAMPLE) == [3], 'wrong sample'
+        with pytest.raises(TapeError, match='Tape is ended'):
+            tape.take(Tape.ROLL)
+        assert tape.rewind().take(Tape.ROLL) == [1, 6], 'not rewound'
+        tape = Tape()
+        tape.put_array(np.arange(6).reshape(2, 3))
+        tape.put_seed(1 << 63 | 5)
+        assert tape.take_array().tolist() == [[0, 1, 2], [3, 4, 5]], \
+            'wrong array'
+        assert tape.take_seed() == 1 << 63 | 5, 'wrong seed'
+        tape.rewind()
+        with pytest.raises(TapeError, match='not a tape'):
+            Tape.from_bytes(b'random bytes')
+        with pytest.raises(TapeError, match='truncated'):
+            Tape.from_bytes(tape.to_bytes()[:-1])
+
+    def test_put_out_of_range(self) -> None:
+        """Test values out of range aren't recorded
+        """
+        tape = Tape()
+        tape.put(Tape.ROLL, [2**32 - 1])
+        with pytest.raises(TapeError, match='roll must be in range'):
+            tape.put(Tape.ROLL, [1, -1])
+        with pytest.raises(TapeError, match='sample must be in range'):
+            tape.put(Tape.SAMPLE, [2**32])
+        with pytest.raises(TapeError, match='array must be in range'):
+            tape.put_array(np.array([[0, -1]]))
+        assert len(tape) == 3, 'outcome is half-written'
+        assert tape.take(Tape.ROLL) == [2**32 - 1], 'wrong roll'
+
+
+class TestGameTape:
+    """Test record and replay of game
+    """
+
+    @pytest.fixture
+    def comp(self) -> Components[Union[Dice, Card]]:
+        comp = Components[Union[Dice, Card]]()
+        comp.update(Dice(id='dice', sides=6, count=5))
+        comp.update(Dice(id='stats', sides=6, count=4, keep_highest=3))
+        comp.update(Card(id='card', count=10))
+        comp.update(Card(id='other', count=10))
+        return comp
+
+    def make(self, comp: Components, seed: int) -> Game:
+        class MyPlayer(Player):
+            deck: Deck
+
+        class MyGame(Game):
+            shaker: Shaker
+            me: MyPlayer
+
+        G = MyGame(
+            id='game',
+            seed=seed,
+            shaker=Shaker(id='shaker'),
+            me=MyPlayer(id='me', deck=Deck(id='deck'))
+                )
+        G.shaker.deal(comp)
+        G.me.deck.deal(comp)
+        return G
+
+    @staticmethod
+    def play(G: Game) -> list:
+        result = []
+        for _ in range(5):
+            G.me.deck.shuffle()
+            result.append(dict(G.shaker.roll()))
+            result.append(G.me.deck.current_ids)
+            result.append(G.me.deck.get_random(3, remove=False))
+        result.append(G.me.deck.get_random(4))
+        return [
+            [card.id for card in value] if isinstance(value, list)
+            and value and isinstance(value[0], Card) else value
+            for value in result
+                ]
+
+    def test_record_and_replay(self, comp: Components) -> None:
+        """Test replay gives recorded outcomes without seed
+        """
+        G = self.make(comp, seed=1)
+        tape = G.record()
+        result = self.play(G)
+        assert G.stop_tape() is tape and G.me.deck._tape is None, \
+            'tape is not stopped'
+        G = self.make(comp, seed=2)
+        G.shaker.buffered = True
+        G.replay(Tape.from_bytes(tape.to_bytes()))
+        assert self.play(G) == result, 'wrong replay'
+
+    def test_replay_other_game(self, comp: Components) -> None:
+        """Test replay fails, if tape doesn't match game
+        """
+        G = self.make(comp, seed=1)
+        tape = G.record()
+        G.me.deck.shuffle()
+        G = self.make(comp, seed=1)
+        G.me.deck.popleft()
+        G.replay(tape)
+        with pytest.raises(TapeError, match='Shuffle of 20 cards'):
+            G.me.deck.shuffle()
+        with pytest.raises(TapeError, match='Tape is ended'):
+            G.shaker.roll()
+
+    def test_replay_vectorized(self, comp: Components) -> None:
+        """Test replay of vectorized rolls, histograms, draws
+        from bag and shuffles of compact deck mixed with rolls
+        """
+        class MyGame(Game):
+            shaker: Shaker
+            plain: Shaker
+            bag: Bag
+            pile: CompactDeck
+
+        def make(seed: int) -> MyGame:
+            G = MyGame(
+                id='game',
+                seed=seed,
+                shaker=Shaker(id='shaker'),
+                plain=Shaker(id='plain'),
+                bag=Bag(id='bag'),
+                pile=CompactDeck(id='pile')
+                    )
+            G.shaker.deal(comp)
+            G.plain.deal(comp, ['dice'])
+            G.bag.deal(comp)
+            G.pile.deal(comp)
+            return G
+
+        def play(G: MyGame) -> list:
+            result: list = [dict(G.shaker.roll())]
+            result.append({
+                id: rolls.tolist()
+                for id, rolls in G.shaker.roll_many(3).items()
+                    })
+            result.append(G.plain.roll_histogram()['dice'].tolist())
+            G.pile.shuffle()
+            result.append(G.pile.current_ids)
+            for count, remove in ((2, False), (3, True)):
+                result.append(G.pile.get_random(count, remove))
+                result.append(G.bag.draw(count, remove))
+            result.append(G.bag.draw())
+            result.append(dict(G.shaker.roll()))
+            return [
+                [card.id for card in value] if isinstance(value, list)
+                and value and isinstance(value[0], Card) else value
+                for value in result
+                    ]
+
+        G = make(seed=1)
+        tape = G.record()
+        result = play(G)
+        G = make(seed=2)
+        assert play(G) != result, 'seed is not used'
+        G = make(seed=2)
+        G.replay(Tape.from_bytes(tape.to_bytes()))
+        assert play(G) == result, 'wrong replay'
+        with pytest.raises(TapeError, match='Tape is ended'):
+            G.bag.draw()
@@ -1,8 +1,19 @@
+import json
 import pytest
-from collections import deque
+from collections import deque, Counter
 from bgameb.base import Components
+from bgameb.stores import CardCodes, MemmapCardCodes, RollBuffer
 from bgameb.items import Dice, Card, Step
-from bgameb.tools import Shaker, Deck, Steps
+from bgameb.tools import (
+    Shaker,
+    Deck,
+    CompactDeck,
+    Bag,
+    Steps,
+    Board,
+    Map,
+    Resources,
+        )
 from bgameb.errors import ArrangeIndexError
 from tests.conftest import FixedSeed
 
@@ -117,6 +128,115 @@ class TestShaker:
         roll = obj_.roll_mapped()
         assert roll == {}, 'wrong roll result'
 
+    def test_roll_many_shaker(
+        self,
+        obj_: Shaker,
+        comp: Components[Dice]
+            ) -> None:
+        """Test roll_many() and roll_mapped_many() of shaker
+        """
+        comp.dice.mapping = {n: str(n) for n in comp.dice._range}
+        obj_.deal(comp)
+        roll = obj_.roll_many(100)
+        assert roll['dice'].shape == (100, 5), 'wrong shape'
+        assert obj_.last_roll['dice'] == roll['dice'][-1].tolist(), \
+            'wrong last'
+        roll = obj_.roll_mapped_many(10)
+        assert roll['dice_nice'].shape == (10, 0), 'wrong unmapped'
+        assert obj_.last_roll_mapped['dice'] == roll['dice'][-1].tolist(), \
+            'wrong last mapped'
+
+    def test_roll_histogram_shaker(self, dealt_obj_: Shaker) -> None:
+        """Test roll_histogram() and successes() of shaker
+        """
+        roll = dealt_obj_.roll_histogram()
+        assert roll['dice'].sum() == 5, 'wrong histogram'
+        assert dealt_obj_.last_histogram['dice'] == roll['dice'].tolist(), \
+            'wrong last'
+        assert dealt_obj_.successes(2) == {
+            'dice': roll['dice'][1], 'dice_nice': roll['dice_nice'][1]
+                }, 'wrong successes'
+
+    def test_distributions_shaker(self, dealt_obj_: Shaker) -> None:
+        """Test exact distributions of shaker
+        """
+        sums = dealt_obj_.sum_distribution()
+        assert len(sums) == 21 and sums[10] == pytest.approx(1 / 1024), \
+            'wrong sum distribution'
+        assert dealt_obj_.max_distribution()[1] == pytest.approx(1 / 1024), \
+            'wrong max distribution'
+        assert dealt_obj_.count_distribution([2])[10] == \
+            pytest.approx(1 / 1024), 'wrong count distribution'
+        assert dealt_obj_.mapped_distribution('x').tolist() == [1.0], \
+            'wrong unmapped'
+
+    def test_count_successes_shaker(self, dealt_obj_: Shaker) -> None:
+        """Test count_successes() of shaker
+        """
+        dealt_obj_.current[0].success = 2
+        dealt_obj_.roll()
+        assert list(dealt_obj_.count_successes()) == ['dice'], \
+            'wrong dices'
+        assert dealt_obj_.count_successes(1) == {
+            'dice': 5, 'dice_nice': 5
+                }, 'wrong successes'
+
+    def test_roll_buffered_shaker(self, dealt_obj_: Shaker) -> None:
+        """Test roll of shaker to preallocated buffer
+        """
+        dealt_obj_.buffered = True
+        dealt_obj_.current.append(
+            Dice(id='kept', sides=6, count=4, keep_highest=3)
+                )
+        result = dealt_obj_.roll()
+        assert isinstance(result, RollBuffer), 'wrong type of result'
+        assert dealt_obj_.last_roll is result, 'wrong last roll'
+        data = result.data
+        assert len(data) == 13, 'wrong layout'
+        assert list(result) == ['dice', 'dice_nice', 'kept'], 'wrong ids'
+        assert len(result['kept']) == 3, 'wrong modified dice'
+        assert all(1 <= v <= 2 for v in result['dice']), 'wrong results'
+        assert dealt_obj_.current[0].last_roll == [], 'dice is updated'
+        assert dealt_obj_.roll() is result, 'buffer is allocated again'
+        assert result.data is data, 'data is allocated again'
+        assert result.array('dice').base is data, 'array is copied'
+        exported = dealt_obj_.dict()['last_roll']
+        assert exported == result.to_dict(), 'wrong dict'
+        assert json.loads(dealt_obj_.json())['last_roll'] == exported, \
+            'wrong json'
+        dealt_obj_.current.pop()
+        assert dealt_obj_.roll() is not result, 'buffer is not allocated'
+        assert dealt_obj_.count_successes(1) == {
+            'dice': 5, 'dice_nice': 5
+                }, 'wrong successes'
+
+    def test_shaker_history(self, dealt_obj_: Shaker) -> None:
+        """Test bounded history of rolls of shaker
+        """
+        assert dealt_obj_.history is None, 'history is kept'
+        dealt_obj_.history_size = 5
+        dealt_obj_.roll_many(20)
+        dealt_obj_.buffered = True
+        dealt_obj_.roll()
+        history = dealt_obj_.history
+        assert history is not None, 'history is not kept'
+        assert list(history) == ['dice', 'dice_nice'], 'wrong ids'
+        assert len(history['dice']['rolls']) == 5, 'history is unbounded'
+        assert history['dice']['rolls'][-1] == \
+            dealt_obj_.last_roll['dice'], 'wrong last roll'
+        assert dealt_obj_.current[0].history is None, 'dice history is kept'
+        assert dealt_obj_.dict()['history'] == history, \
+            'history is not exported'
+        dealt_obj_.current[1].explode = 2
+        dealt_obj_.roll_many(5)
+        history = dealt_obj_.history
+        assert history['dice_nice']['rolls'][-1] == \
+            dealt_obj_.last_roll['dice_nice'], 'rolls are not added'
+        assert history['dice_nice']['chi_square'] is None, \
+            'chi-square of modified dice'
+        assert history['dice']['chi_square'] is not None, \
+            'no chi-square of plain dice'
+
 
 class TestDeck:
     """Test Deck class
@@ -439,6 +559,317 @@ class TestDeck:
             assert len(result) == 4, 'wrong result'
             assert len(obj_.current) == 0, 'wrong result'
 
+    def test_batch_open_hide_and_flip(self, dealt_obj_: Deck) -> None:
+        """Test batch open(), hide() and flip() by mask
+        """
+        mask = [True, False] * 5
+        assert isinstance(dealt_obj_.open(mask), Deck), 'wrong return'
+        assert dealt_obj_.current[0].is_revealed, 'not opened'
+        assert not dealt_obj_.current[1].is_revealed, 'wrong opened'
+        assert dealt_obj_.revealed_mask().tolist() == mask, 'wrong states'
+        dealt_obj_.flip()
+        assert not dealt_obj_.current[0].is_revealed, 'not flipped'
+        assert dealt_obj_.current[1].is_revealed, 'not flipped'
+        dealt_obj_.hide([1, 3])
+        assert not dealt_obj_.current[1].is_revealed, 'not hidden'
+        assert dealt_obj_.current[5].is_revealed, 'wrong hidden'
+        dealt_obj_.open()
+        assert dealt_obj_.revealed_mask().all(), 'not opened all'
+
+    def test_batch_tap_and_untap_all(self, dealt_obj_: Deck) -> None:
+        """Test batch tap() and untap_all()
+        """
+        dealt_obj_.tap([0, 2], side='left')
+        assert dealt_obj_.current[0].is_active is False, 'not tapped'
+        assert dealt_obj_.current[0].side == 'left', 'wrong side'
+        assert dealt_obj_.current[1].is_active is True, 'wrong tapped'
+        assert dealt_obj_.active_mask().sum() == 8, 'wrong states'
+        dealt_obj_.untap_all()
+        assert dealt_obj_.current[0].is_active is True, 'not untapped'
+        assert dealt_obj_.current[0].side is None, 'wrong side'
+        assert dealt_obj_.active_mask().all(), 'wrong states'
+
+    def test_batch_states_follow_cards(self, dealt_obj_: Deck) -> None:
+        """Test states of deck are consistent with per-card changes
+        """
+        dealt_obj_.shuffle()
+        dealt_obj_.current[4].tap()
+        dealt_obj_.current[2].open()
+        assert not dealt_obj_.active_mask()[4], 'not synced tap'
+        assert dealt_obj_.revealed_mask()[2], 'not synced open'
+        card = dealt_obj_.popleft()
+        card.is_active = False
+        dealt_obj_.untap_all()
+        assert card.is_active is False, 'changed card out of deck'
+        assert dealt_obj_.active_mask().all(), 'not untapped'
+        assert len(dealt_obj_._states) == 9, 'slot not released'
+        dealt_obj_.get_random(2)
+        dealt_obj_.search({'card': 1})
+        dealt_obj_.remove('Card_nice')
+        assert len(dealt_obj_._states) == 5, 'slots not released'
+        dealt_obj_.clear()
+        assert len(dealt_obj_._states) == 0, 'states not cleared'
+
+    def test_batch_states_of_changed_current(self, dealt_obj_: Deck) -> None:
+        """Test batch operations on current, changed directly
+        """
+        dealt_obj_.tap()
+        card = dealt_obj_.current.pop()
+        new = Card(id='new', is_active=False)
+        dealt_obj_.current.append(new)
+        dealt_obj_.untap_all()
+        assert card.is_active is False, 'changed card out of deck'
+        assert new.is_active is True, 'appended card not untapped'
+        assert dealt_obj_.active_mask().all(), 'not untapped'
+        assert len(dealt_obj_._states) == 10, 'slots not synced'
+
+    def test_deck_remaining(self, dealt_obj_: Deck) -> None:
+        """Test counter of remaining cards is kept by deck
+        and excludes revealed cards
+        """
+        counter = dealt_obj_.remaining
+        assert counter.counts == {'card': 5, 'Card_nice': 5}, 'wrong counts'
+        dealt_obj_.open([0, 1])
+        revealed = dealt_obj_.current_ids[:2]
+        assert dealt_obj_.remaining is counter, 'counter is not kept'
+        assert len(counter) == 8, 'revealed cards are counted'
+        assert counter.counts['card'] == 5 - revealed.count('card'), \
+            'wrong counts'
+        assert counter.at_least('card', draws=8) == pytest.approx(
+            float(counter.counts['card'] > 0)
+                ), 'wrong probability'
+        dealt_obj_.flip()
+        assert len(counter) == 2, 'wrong flip'
+        dealt_obj_.hide()
+        dealt_obj_.current[0].open()
+        dealt_obj_.pop()
+        dealt_obj_.popleft()
+        assert len(counter) == 8, 'wrong pop'
+        dealt_obj_.current[0].open()
+        dealt_obj_.remove(dealt_obj_.current_ids[0])
+        dealt_obj_.append(Card(id='new'))
+        dealt_obj_.extendleft([Card(id='new', is_revealed=True)])
+        dealt_obj_.get_random(2)
+        dealt_obj_.search({'new': 2})
+        counts = Counter(
+            card.id for card in dealt_obj_.current if not card.is_revealed
+                )
+        assert dealt_obj_.remaining.counts == counts, 'wrong counts'
+        dealt_obj_.clear()
+        assert len(dealt_obj_.remaining) == 0, 'not cleared'
+
+
+class TestCompactDeck:
+    """Test CompactDeck class
+    """
+
+    @pytest.fixture
+    def obj_(self) -> CompactDeck:
+        return CompactDeck(id='deck')
+
+    @pytest.fixture
+    def comp(self) -> Components[Card]:
+        return Components[Card](
+            card=Card(id='card', count=5),
+            card_nice=Card(id='Card_nice', count=5)
+                )
+
+    @pytest.fixture
+    def dealt_obj_(self, obj_: CompactDeck, comp: Components[Card]) -> Deck:
+        obj_.deal(comp)
+        return obj_
+
+    def test_compact_deck_deal(
+        self,
+        obj_: CompactDeck,
+        comp: Components[Card]
+            ) -> None:
+        """Test deal() stores cards as codes
+        """
+        obj_.deal(comp)
+        assert isinstance(obj_.current, CardCodes), 'wrong current type'
+        assert len(obj_.current) == 10, 'wrong current len'
+        assert obj_.current.codes.nbytes == 20, 'wrong size of codes'
+        assert len(obj_.current.types) == 2, 'wrong count of types'
+        assert obj_.current_ids == ['card'] * 5 + ['Card_nice'] * 5, \
+            'wrong order'
+        obj_.deal(comp, ['card', 'Card_nice', 'wrong'])
+        assert obj_.current_ids == ['card', 'Card_nice'], 'wrong deal'
+
+    def test_compact_deck_deque_methods(self, dealt_obj_: CompactDeck) -> None:
+        """Test append, extend, pop and rotate of compact deck
+        """
+        dealt_obj_.appendleft(Card(id='first'))
+        dealt_obj_.append(Card(id='last'))
+        dealt_obj_.extendleft([Card(id='a'), Card(id='b')])
+        dealt_obj_.extend([Card(id='c')])
+        assert dealt_obj_.current_ids[:3] == ['b', 'a', 'first'], \
+            'wrong extendleft'
+        assert dealt_obj_.current_ids[-2:] == ['last', 'c'], 'wrong extend'
+        card = dealt_obj_.popleft()
+        assert isinstance(card, Card), 'not materialized'
+        assert card.id == 'b' and dealt_obj_.last_id == 'b', 'wrong pop'
+        assert dealt_obj_.pop().id == 'c', 'wrong pop'
+        dealt_obj_.rotate(1)
+        assert dealt_obj_.current_ids[0] == 'last', 'wrong rotation'
+        dealt_obj_.reverse()
+        assert dealt_obj_.current_ids[-1] == 'last', 'not reversed'
+        dealt_obj_.clear()
+        with pytest.raises(IndexError):
+            dealt_obj_.pop()
+
+    def test_compact_deck_materialized_copies(
+        self,
+        dealt_obj_: CompactDeck
+            ) -> None:
+        """Test cards from compact deck are independent objects
+        """
+        card = dealt_obj_.pop()
+        card.open()
+        assert not dealt_obj_.pop().is_revealed, 'card not copied'
+        dealt_obj_.append(card)
+        assert dealt_obj_.pop().is_revealed, 'state of card not kept'
+        assert len(dealt_obj_.current.types) == 3, 'wrong count of types'
+
+    def test_compact_deck_shuffle_and_count(
+        self,
+        dealt_obj_: CompactDeck
+            ) -> None:
+        """Test shuffle() and count()
+        """
+        with FixedSeed(42):
+            current = dealt_obj_.current_ids
+            dealt_obj_.shuffle()
+            assert dealt_obj_.current_ids != current, 'not shuffled'
+        assert sorted(dealt_obj_.current_ids) == sorted(current), \
+            'cards lost'
+        assert dealt_obj_.count('card') == 5, 'wrong count'
+        assert dealt_obj_.count('nothing') == 0, 'wrong count'
+        assert len(dealt_obj_.by_id('card')) == 5, 'wrong by_id'
+
+    def test_compact_deck_search(self, dealt_obj_: CompactDeck) -> None:
+        """Test search() with and without removing
+        """
+        search = dealt_obj_.search({'Card_nice': 2, 'card': 1}, remove=False)
+        assert [card.id for card in search] == \
+            ['card', 'Card_nice', 'Card_nice'], 'wrong search'
+        assert len(dealt_obj_.current) == 10, 'removed'
+        search = dealt_obj_.search({'card': 50})
+        assert len(search) == 5, 'wrong search len'
+        assert dealt_obj_.current_ids == ['Card_nice'] * 5, 'not removed'
+        assert dealt_obj_.search({'wrong': 1}) == [], 'wrong search'
+
+    def test_compact_deck_get_random(self, dealt_obj_: CompactDeck) -> None:
+        """Test get_random() with and without removing
+        """
+        with FixedSeed(42):
+            result = dealt_obj_.get_random(20, remove=False)
+            assert len(result) == 20, 'wrong result'
+            assert len(dealt_obj_.current) == 10, 'removed'
+            result = dealt_obj_.get_random(4)
+            assert len(result) == 4, 'wrong result'
+            assert len(dealt_obj_.current) == 6, 'not removed'
+            assert len(dealt_obj_.get_random(12)) == 6, 'wrong result'
+            assert dealt_obj_.get_random() == [], 'wrong result'
+
+    def test_compact_deck_in_memmap(
+        self,
+        comp: Components[Card],
+        tmp_path
+            ) -> None:
+        """Test compact deck with codes in memory-mapped file
+        """
+        current = MemmapCardCodes(path=str(tmp_path / 'deck'), chunk=2)
+        obj_ = CompactDeck(id='deck', current=current)
+        assert obj_.current is current, 'storage replaced'
+        obj_.deal(comp).shuffle()
+        assert obj_.count('card') == 5, 'wrong count'
+        assert len(obj_.search({'card': 2})) == 2, 'wrong search'
+        assert len(obj_.get_random(3)) == 3, 'wrong random'
+        assert len(obj_.current) == 5, 'wrong current len'
+
+    def test_compact_deck_export(self, obj_: CompactDeck) -> None:
+        """Test export of compact deck
+        """
+        obj_.append(Card(id='card'))
+        assert obj_.dict()['current'][0]['id'] == 'card', 'wrong dict'
+        j = json.loads(obj_.json())
+        assert j['current'][0]['id'] == 'card', 'wrong json'
+
+
+class TestBag:
+    """Test Bag class
+    """
+
+    @pytest.fixture
+    def obj_(self) -> Bag:
+        return Bag(id='bag')
+
+    @pytest.fixture
+    def comp(self) -> Components:
+        return Components(
+            chit=Card(id='chit', count=5),
+            dice=Dice(id='dice', count=2),
+            step=Step(id='step')
+                )
+
+    @pytest.fixture
+    def dealt_obj_(self, obj_: Bag, comp: Components) -> Bag:
+        obj_.deal(comp)
+        return obj_
+
+    def test_bag_deal(self, dealt_obj_: Bag, comp: Components) -> None:
+        """Test bag deal()
+        """
+        assert len(dealt_obj_.current) == 8, 'wrong current len'
+        assert dealt_obj_.counts() == {'chit': 5, 'dice': 2, 'step': 1}, \
+            'wrong counts'
+        assert dealt_obj_.current[0].count == 1, 'wrong count of copy'
+        dealt_obj_.deal(comp, ['dice', 'step', 'nothing'])
+        assert dealt_obj_.current_ids == ['dice', 'step'], 'wrong deal'
+        assert dealt_obj_.count('chit') == 0, 'counts not cleared'
+
+    def test_bag_draw_and_put(self, dealt_obj_: Bag) -> None:
+        """Test draw() and put() back
+        """
+        with FixedSeed(42):
+            item = dealt_obj_.draw()[0]
+            assert dealt_obj_.last is item, 'wrong last'
+            assert len(dealt_obj_.current) == 7, 'not removed'
+            assert all(i is not item for i in dealt_obj_.current), \
+                'not removed'
+            assert dealt_obj_.count(item.id) == \
+                dealt_obj_.current_ids.count(item.id), 'wrong count'
+            dealt_obj_.put(item)
+            assert len(dealt_obj_.current) == 8, 'not returned'
+            assert dealt_obj_.current[-1] is item, 'copy returned'
+
+    def test_bag_draw_many(self, dealt_obj_: Bag) -> None:
+        """Test draw() of many items with and without removing
+        """
+        with FixedSeed(42):
+            result = dealt_obj_.draw(20, remove=False)
+            assert len(result) == 20, 'wrong result'
+            assert len(dealt_obj_.current) == 8, 'removed'
+            result = dealt_obj_.draw(5)
+            assert len(result) == 5, 'wrong result'
+            assert len(dealt_obj_.current) == 3, 'not removed'
+            ids = [item.id for item in result] + dealt_obj_.current_ids
+            assert sorted(ids) == ['chit'] * 5 + ['dice'] * 2 + ['step'], \
+                'items lost'
+            assert sum(dealt_obj_.counts().values()) == 3, 'wrong counts'
+            assert len(dealt_obj_.draw(10)) == 3, 'wrong result'
+            assert dealt_obj_.draw() == [], 'drawn from empty bag'
+
+    def test_bag_pop_and_clear(self, dealt_obj_: Bag) -> None:
+        """Test pop() and clear() change counts
+        """
+        item = dealt_obj_.pop()
+        assert dealt_obj_.count(item.id) == \
+            dealt_obj_.current_ids.count(item.id), 'wrong count'
+        dealt_obj_.clear()
+        assert dealt_obj_.counts() == {}, 'not cleared'
+
 
 class TestSteps:
     """Test Steps class
@@ -546,3 +977,289 @@ class TestSteps:
         obj_.pops()
         assert len(result) == 2, 'wrong current len'
         assert obj_.current_ids[0] == 'asteP', 'wrong current names'
+
+    def test_steps_fifo_for_equal_priority(self, obj_: Steps) -> None:
+        """Test steps with equal priority are poped in order of push
+        """
+        for name in ['a', 'b', 'c', 'd']:
+            obj_.push(Step(id=name, priority=1))
+        obj_.push(Step(id='first', priority=0))
+        assert obj_.peek().id == 'first', 'wrong peek'
+        assert len(obj_.current) == 5, 'peek removes step'
+        result = [obj_.pops().id for _ in range(5)]
+        assert result == ['first', 'a', 'b', 'c', 'd'], 'wrong order'
+        with pytest.raises(IndexError):
+            obj_.peek()
+
+    def test_steps_reprioritize(self, dealt_obj_: Steps) -> None:
+        """Test change priority of step
+        """
+        dealt_obj_.reprioritize('asteP', 0)
+        assert dealt_obj_.peek().id == 'asteP', 'not reprioritized'
+        assert dealt_obj_.peek().priority == 0, 'wrong priority'
+        dealt_obj_.reprioritize('asteP', 5)
+        assert dealt_obj_.pops().id == 'step1', 'not reprioritized'
+        with pytest.raises(ValueError):
+            dealt_obj_.reprioritize('step1', 1)
+
+    def test_steps_remove(self, obj_: Steps, comp: Components[Step]) -> None:
+        """Test remove step from steps
+        """
+        obj_.deal(comp, ['step1', 'asteP', 'step1', 'asteP'])
+        obj_.remove('step1')
+        assert obj_.current_ids.count('step1') == 1, 'not removed'
+        obj_.remove('step1')
+        assert obj_.current_ids == ['asteP', 'asteP'], 'not removed'
+        with pytest.raises(ValueError):
+            obj_.remove('step1')
+        assert obj_.pops().id == 'asteP', 'wrong pops'
+
+    def test_steps_next_cycle(self, dealt_obj_: Steps) -> None:
+        """Test round-robin cycle of steps
+        """
+        result = [dealt_obj_.next().id for _ in range(5)]
+        assert result == ['step1', 'asteP'] * 2 + ['step1'], 'wrong cycle'
+        assert dealt_obj_.round == 2, 'wrong round'
+        assert dealt_obj_.last.id == 'step1', 'wrong last'
+        assert len(dealt_obj_.current) == 2, 'current changed'
+        dealt_obj_.clear()
+        assert dealt_obj_.round == 0, 'round not cleared'
+        with pytest.raises(IndexError, match='No steps'):
+            dealt_obj_.next()
+
+    def test_steps_skip_and_reinsert(self, obj_: Steps) -> None:
+        """Test skip and reinsert steps in cycle
+        """
+        for n in range(4):
+            obj_.push(Step(id=f'p{n}', priority=n))
+        assert obj_.next().id == 'p0', 'wrong next'
+        obj_.skip('p1')
+        obj_.skip('p3')
+        assert obj_.next().id == 'p2', 'not skipped'
+        assert obj_.next().id == 'p0', 'not skipped'
+        assert obj_.round == 1, 'wrong round'
+        obj_.reinsert('p3')
+        assert obj_.next().id == 'p2', 'wrong next'
+        assert obj_.next().id == 'p3', 'not reinserted'
+        with pytest.raises(ValueError):
+            obj_.skip('unknown')
+        for n in range(4):
+            obj_.skip(f'p{n}')
+        with pytest.raises(IndexError, match='No steps'):
+            obj_.next()
+
+    def test_steps_cycle_follows_changes(self, obj_: Steps) -> None:
+        """Test cycle order is kept after changes of steps
+        """
+        for n in range(4):
+            obj_.push(Step(id=f'p{n}', priority=n))
+        assert [obj_.next().id for _ in range(2)] == ['p0', 'p1'], \
+            'wrong next'
+        obj_.reprioritize('p0', 10)
+        obj_.remove('p2')
+        obj_.push(Step(id='new', priority=1))
+        result = [obj_.next().id for _ in range(4)]
+        assert result == ['new', 'p3', 'p0', 'p1'], 'wrong order'
+
+
+class TestBoard:
+    """Test Board class
+    """
+
+    @pytest.fixture
+    def obj_(self) -> Board:
+        board = Board(id='board', width=5, height=4)
+        black, white = Card(id='black'), Card(id='white')
+        board.place(black, [1, 1, 2], [1, 2, 1])
+        board.place(white, 0, 4)
+        return board
+
+    def test_board_place_and_remove(self, obj_: Board) -> None:
+        """Test place(), remove() and get() of cells
+        """
+        assert obj_.shape == (4, 5), 'wrong shape'
+        assert obj_.current_ids == ['black', 'white'], 'wrong kinds'
+        assert obj_.count('black') == 3, 'wrong count'
+        assert obj_.get(0, 4).id == 'white', 'wrong item'
+        assert obj_.get(0, 0) is None, 'wrong empty cell'
+        assert obj_.positions('black').tolist() == [[1, 1], [1, 2], [2, 1]], \
+            'wrong positions'
+        obj_.remove(1, slice(None))
+        assert obj_.count('black') == 1, 'not removed'
+        assert obj_.last.id == 'black', 'wrong last'
+        with pytest.raises(ValueError):
+            Board(id='board', width=2, height=2, cells=[[0, 0]])
+        with pytest.raises(ValueError, match='width'):
+            Board(id='board', height=2)
+
+    def test_board_pop(self, obj_: Board) -> None:
+        """Test pop() clears cells of popped kind
+        """
+        assert obj_.pop().id == 'white', 'wrong popped'
+        assert obj_.get(0, 4) is None, 'cells not cleared'
+        assert obj_.code('white') == -1, 'code not removed'
+        assert obj_.count('black') == 3, 'wrong other kind'
+        obj_.place(Card(id='red'), 0, 0)
+        assert obj_.code('red') == 2, 'wrong new code'
+        assert obj_.get(0, 0).id == 'red', 'wrong new item'
+
+    def test_board_queries(self, obj_: Board) -> None:
+        """Test neighbours(), flood_fill() and line_of_sight()
+        """
+        group = obj_.flood_fill(1, 1)
+        assert group.sum() == 3, 'wrong group'
+        liberties = obj_.neighbours(group) & obj_.mask(None)
+        assert liberties.sum() == 7, 'wrong liberties'
+        counts = obj_.neighbour_counts('black')
+        assert counts[1, 1] == 2 and counts[2, 2] == 2, 'wrong counts'
+        assert obj_.flood_fill(0, 0).sum() == 16, 'wrong empty area'
+        sight = obj_.line_of_sight(0, 1)
+        assert sight[0, 0] and sight[0, 3] and sight[1, 1], 'not visible'
+        assert not sight[2, 1] and not sight[0, 1], 'wrong visible'
+        assert sight[0, 4] and sight[1, 2], 'blocker not visible'
+
+    def test_board_match(self, obj_: Board) -> None:
+        """Test match() of patterns
+        """
+        found = obj_.match([['black', 'black'], ['black', None]])
+        assert found.nonzero() == ([1], [1]), 'wrong match'
+        assert obj_.match([['*', 'white']]).sum() == 1, 'wrong wildcard'
+        assert not obj_.match([['red']]).any(), 'wrong unknown'
+        assert not obj_.match([[None] * 6]).any(), 'wrong big pattern'
+
+    def test_board_clone_and_export(self, obj_: Board) -> None:
+        """Test clone(), deal() and dict() of board
+        """
+        clone = obj_.clone()
+        clone.place(Card(id='red'), 3, 3)
+        assert obj_.get(3, 3) is None, 'cells are shared'
+        assert obj_.current_ids == ['black', 'white'], 'kinds are shared'
+        data = json.loads(obj_.json())
+        assert data['cells'][1] == [0, 1, 1, 0, 0], 'wrong export'
+        restored = Board(**obj_.dict())
+        assert restored.count('black') == 3, 'wrong restore'
+        obj_.deal(Components(red=Card(id='red')))
+        assert obj_.current_ids == ['red'], 'wrong deal'
+        assert not obj_.cells.any(), 'not cleared'
+
+
+class TestMap:
+    """Test Map class
+    """
+
+    @pytest.fixture
+    def obj_(self) -> Map:
+        mp = Map(
+            id='map',
+            regions=['lake'],
+            edges=[('a', 'b'), ('b', 'c'), ('c', 'd'), ('a', 'e'), ('e', 'd')]
+                )
+        mp.place(Card(id='army'), 'a')
+        mp.place(Card(id='enemy'), 'e')
+        return mp
+
+    def test_map_init(self, obj_: Map) -> None:
+        """Test map regions and adjacency
+        """
+        assert obj_.regions == ['lake', 'a', 'b', 'c', 'd', 'e'], \
+            'wrong regions'
+        assert obj_.neighbours('a') == ['b', 'e'], 'wrong neighbours'
+        assert obj_.neighbours('lake') == [], 'wrong neighbours'
+        with pytest.raises(KeyError, match='not found'):
+            obj_.place(Card(id='army'), 'sea')
+        directed = Map(id='map', edges=[('a', 'b')], directed=True)
+        assert directed.neighbours('b') == [], 'wrong directed'
+        hexes = Map.from_hex('hexes', [(0, 0), (1, 0), (0, 1), (2, 2)])
+        assert sorted(hexes.neighbours('0,0')) == ['0,1', '1,0'], \
+            'wrong hex neighbours'
+        assert hexes.neighbours('1,0') == ['0,0', '0,1'], \
+            'wrong hex neighbours'
+
+    def test_map_paths(self, obj_: Map) -> None:
+        """Test distances, path and cache invalidation by blockers
+        """
+        assert obj_.distances('a').tolist() == [-1, 0, 1, 2, 2, 1], \
+            'wrong distances'
+        assert obj_.path('a', 'd') == ['a', 'e', 'd'], 'wrong path'
+        assert obj_.path('a', 'd', ['enemy']) == ['a', 'b', 'c', 'd'], \
+            'wrong path with blockers'
+        assert obj_.path('a', 'lake') == [], 'wrong unreachable'
+        assert obj_.path('a', 'a') == ['a'], 'wrong path to itself'
+        assert obj_.distance('a', 'e', ['enemy']) == -1, 'wrong blocked'
+        cached = len(obj_._cache)
+        obj_.distance('a', 'd', ['enemy'])
+        assert len(obj_._cache) == cached, 'not cached'
+        obj_.move(1, 'c')
+        assert obj_.items_in('c')[0].id == 'enemy', 'not moved'
+        assert obj_.distance('a', 'd', ['enemy']) == 2, 'cache not updated'
+
+    def test_map_within(self, obj_: Map) -> None:
+        """Test within() and can_move()
+        """
+        reach = obj_.within(1, blockers=['enemy', 'army'])
+        assert reach.shape == (2, 6), 'wrong shape'
+        assert reach[0].tolist() == [False, True, True] + [False] * 3, \
+            'wrong reach'
+        assert reach[1].tolist() == [False, False, False, False, True, True], \
+            'wrong reach'
+        assert obj_.can_move(0, 'c', 2) and not obj_.can_move(0, 'c', 1), \
+            'wrong can_move'
+
+    def test_map_deal_and_remove(self, obj_: Map) -> None:
+        """Test deal(), remove() and restore from dict
+        """
+        restored = Map(**json.loads(obj_.json()))
+        assert restored.locations == ['a', 'e'], 'wrong restore'
+        assert obj_.remove(0).id == 'army', 'wrong removed'
+        assert obj_.locations == ['e'], 'wrong locations'
+        obj_.deal(Components(c=Card(id='c'), x=Card(id='x')))
+        assert obj_.current_ids == ['c'] and obj_.locations == ['c'], \
+            'wrong deal'
+
+
+class TestResources:
+    """Test Resources class
+    """
+
+    @pytest.fixture
+    def obj_(self) -> Resources:
+        return Resources(
+            id='wallet', amounts={'gold': 5, 'wood': 1}, limits={'gold': 8}
+                )
+
+    def test_resources_transactions(self, obj_: Resources) -> None:
+        """Test atomic pay(), gain() and exchange()
+        """
+        assert obj_.pay({'gold': 3, 'wood': 1}), 'not paid'
+        assert obj_.amounts == {'gold': 2, 'wood': 0}, 'wrong amounts'
+        assert not obj_.pay({'gold': 1, 'wood': 1}), 'wrong paid'
+        assert obj_['gold'] == 2, 'changed by rejected transaction'
+        assert not obj_.gain({'gold': 7, 'stone': 1}), 'limit exceeded'
+        assert obj_['stone'] == 0, 'changed by rejected transaction'
+        assert obj_.exchange({'gold': 2}, {'stone': 3}), 'not exchanged'
+        assert obj_.amounts == {'gold': 0, 'wood': 0, 'stone': 3}, \
+            'wrong amounts'
+        assert obj_.can_pay({'stone': 3}) and not obj_.can_pay({'gold': 1}), \
+            'wrong can_pay'
+        with pytest.raises(ValueError, match='non-negative'):
+            obj_.pay({'gold': -1})
+        assert obj_.dict()['amounts']['stone'] == 3, 'wrong export'
+        with pytest.raises(ValueError):
+            Resources(id='wallet', amounts={'gold': -1})
+        with pytest.raises(ValueError, match='exceed limits'):
+            Resources(id='wallet', amounts={'gold': 9}, limits={'gold': 8})
+
+    def test_resources_many(self, obj_: Resources) -> None:
+        """Test bulk pay_many() and gain_many()
+        """
+        pools = [obj_, Resources(id='empty'), Resources(id='rich')]
+        pools[2].gain({'gold': 10, 'wood': 10})
+        paid = Resources.pay_many(pools, {'gold': 4, 'wood': 1})
+        assert paid.tolist() == [True, False, True], 'wrong paid'
+        assert obj_.amounts == {'gold': 1, 'wood': 0}, 'wrong amounts'
+        assert pools[1].amounts == {}, 'changed by rejected transaction'
+        gained = Resources.gain_many(pools, {'gold': 7})
+        assert gained.tolist() == [True, True, True], 'wrong gained'
+        assert not Resources.gain_many(pools, {'gold': 1})[0], \
+            'limit exceeded'
+        assert not Resources.pay_many([], {'gold': 1}).size, 'wrong empty'
@@ -0,0 +1,94 @@
+import json
+import pytest
+from bgameb import Game, Player, Deck, Card, Shaker, Dice, Components
+from bgameb.views import View, ToolView, is_visible
+
+
+class MyPlayer(Player):
+    hand: Deck
+
+
+class MyGame(Game):
+    pile: Deck
+    shaker: Shaker
+    players: list[MyPlayer]
+
+
+class TestViews:
+    """Test View and ToolView classes
+    """
+
+    @pytest.fixture
+    def game(self) -> MyGame:
+        comp: Components = Components()
+        for n in range(3):
+            comp.update(Card(id=f'card{n}'))
+        game = MyGame(
+            id='game',
+            pile=Deck(id='pile'),
+            shaker=Shaker(id='shaker'),
+            players=[
+                MyPlayer(id='me', hand=Deck(id='hand')),
+                MyPlayer(id='opp', hand=Deck(id='hand', visibility='public')),
+                    ],
+                )
+        game.pile.deal(comp)
+        game.pile.current[2].is_revealed = True
+        game.shaker.append(Dice(id='dice'))
+        for player in game.players:
+            player.hand.deal(comp, ['card0', 'card1'])
+        return game
+
+    def test_is_visible(self) -> None:
+        """Test rules of visibility
+        """
+        card = Card(id='card')
+        assert is_visible(card, 'public', None, None), 'not visible'
+        assert not is_visible(card, 'hidden', 'me', 'me'), 'visible'
+        assert is_visible(card, 'owner', 'me', 'me'), 'not visible'
+        assert not is_visible(card, 'owner', 'opp', 'me'), 'visible'
+        card.is_revealed = True
+        assert is_visible(card, 'revealed', None, None), 'not visible'
+
+    def test_view_redacts_items(self, game: MyGame) -> None:
+        """Test attributes of view are redacted for viewer
+        """
+        view = game.view('me')
+        assert isinstance(view.pile, ToolView), 'wrong view of tool'
+        assert view.pile.current_ids == [None, None, 'card2'], \
+            'wrong pile'
+        assert view.players[0].hand.current_ids == ['card0', 'card1'], \
+            'wrong own hand'
+        assert view.players[1].hand.current_ids == ['card0', 'card1'], \
+            'wrong public hand'
+        assert game.view('opp').players[0].hand[0] is None, \
+            'wrong hidden item'
+        assert view.shaker.current[0].sides == 2, 'wrong public tool'
+        assert len(view.pile) == 3, 'wrong len'
+
+    def test_view_is_read_only(self, game: MyGame) -> None:
+        """Test view can't change game
+        """
+        view = View(game, 'me')
+        with pytest.raises(AttributeError, match='read-only'):
+            view.id = 'other'
+        with pytest.raises(AttributeError, match='not available'):
+            view.pile.pop
+        with pytest.raises(AttributeError):
+            view._counter
+        assert isinstance(view.players, tuple), 'wrong list view'
+
+    def test_view_export(self, game: MyGame) -> None:
+        """Test dict() and json() of view
+        """
+        data = json.loads(game.view('opp').json())
+        assert data['pile']['current'][:2] == [None, None], \
+            'pile not redacted'
+        assert data['pile']['current'][2]['id'] == 'card2', 'wrong pile'
+        assert data['players'][0]['hand']['current'] == [None, None], \
+            'hand not redacted'
+        assert data['players'][1]['hand']['current'][0]['id'] == 'card0', \
+            'wrong own hand'
+        assert game.view().dict()['shaker']['current'][0]['id'] == 'dice', \
+            'wrong public tool'
+        assert game.pile.current[0].id == 'card0', 'game changed'